@@ -1,3 +1,4 @@
+import time
 from prototype import *
 
 
@@ -29,7 +30,7 @@ def get_data():
 
 
 
-def main():
+def main(max_iterations=None, time_limit=None):
     # SAMPLE
     # supply = [158, 184, 179]
     # demand = [174, 204, 143]
@@ -42,56 +43,68 @@ def main():
 
     supply, demand, costs = get_data()
 
-    data = north_west_corner(supply=supply, demand=demand)
-    full_data = complete_data(data)
+    table = Table(costs, north_west_corner(supply=supply, demand=demand))
 
 
     print("\nInitial Table:")
-    print_2d_array(full_data)
+    print_2d_array(table.values)
     print()
 
 
-    def try_optimizing(full_data, count=1):
-        coords = list_coordinates(full_data)
-        miscoords = list_missing_coordinates(full_data)
-
+    # Iterate instead of recursing so big tables cannot hit the recursion limit.
+    # After a run of degenerate pivots, fall back to Bland's rule.
+    started = time.perf_counter()
+    status = "optimal"
+    stalled = 0
+    count = 1
+    while True:
+        if max_iterations is not None and count > max_iterations:
+            status = "iteration_limit"
+            break
+        if time_limit is not None and time.perf_counter() - started >= time_limit:
+            status = "time_limit"
+            break
 
         # print('COMPUTATION FOR VACANT CELLS')
-        improv = compute_for_improvement(coords, miscoords, costs)
+        improv = table.get_improvements()
 
 
-        most_neg = get_most_negative(improv)
+        if stalled >= len(supply) + len(demand):
+            most_neg = get_first_negative(improv)
+        else:
+            most_neg = get_most_negative(improv)
         if most_neg is None:
+            break
 
-            print("\n\n\n  ~ ~ ~ FINAL ~ ~ ~  ")
-            print("  ▼ ▼ ▼ TABLE ▼ ▼ ▼  \n")
-            print_2d_array(full_data)
-            print()
-            print()
-            print("Decision:")
-            print_decision(full_data)
-            min_cost = compute_running_cost(full_data, costs)
-            print(f"\nMinimum Cost: ₱{min_cost}\n")
-            return 
 
-
-        most_nega_loop = get_loop(coords, most_neg)
-        optimized_data = optimize_table(most_nega_loop, full_data)
+        print(f"Entering cell {explain_improvement(table.basis, most_neg, costs)}")
+        most_nega_loop = table.get_loop(most_neg)
+        stalled = stalled + 1 if table.pivot(most_nega_loop) == 0 else 0
 
 
         print(f"Table {count+1} (optimizing):")
-        print_2d_array(optimized_data)
+        print_2d_array(table.values)
         print()
-    
+        count += 1
+
 
 
         # input('press [ENTER] to continue\n')
         # cls()
-        try_optimizing(optimized_data, count+1)
 
 
-    try_optimizing(full_data)
+    print("\n\n\n  ~ ~ ~ FINAL ~ ~ ~  ")
+    print("  ▼ ▼ ▼ TABLE ▼ ▼ ▼  \n")
+    print_2d_array(table.values)
+    print()
+    if status != "optimal":
+        print(f"Stopped early ({status}), best table so far")
+    print()
+    print("Decision:")
+    print_decision(table.values)
+    min_cost = table.get_running_cost()
+    print(f"\nMinimum Cost: ₱{min_cost}\n")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
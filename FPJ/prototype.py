@@ -1,3 +1,5 @@
+import numpy as np
+from collections import deque
 from os import system
 
 
@@ -35,39 +37,137 @@ def get_possible_next_nodes(loop, not_visited):
             return nodes_in_column
         return nodes_in_row
 
-def get_loop(bv_positions, ev_position):
-    def inner(loop):
-        if len(loop) > 3:
-            can_be_closed = len(
-                get_possible_next_nodes(loop, [ev_position])) == 1
-            if can_be_closed:
-                return loop
-
-        not_visited = list(set(bv_positions) - set(loop))
-        possible_next_nodes = get_possible_next_nodes(loop, not_visited)
-        for next_node in possible_next_nodes:
-            new_loop = inner(loop + [next_node])
-            if new_loop:
-                return new_loop
+def get_tree_pointers(bv_positions, rows, columns):
+    adjacency = [[] for _ in range(rows + columns)]
+    for x, y in bv_positions:
+        adjacency[x].append(rows + y)
+        adjacency[rows + y].append(x)
+    parent = [-1] * (rows + columns)
+    depth = [None] * (rows + columns)
+    for root in range(rows + columns):
+        if depth[root] is not None:
+            continue
+        depth[root] = 0
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for next_node in adjacency[node]:
+                if depth[next_node] is None:
+                    parent[next_node] = node
+                    depth[next_node] = depth[node] + 1
+                    queue.append(next_node)
+    return parent, depth
 
-    return inner([ev_position])
+def get_loop(bv_positions, ev_position):
+    tree_positions = [p for p in bv_positions if p != ev_position]
+    rows = max(p[0] for p in tree_positions + [ev_position]) + 1
+    columns = max(p[1] for p in tree_positions + [ev_position]) + 1
+    parent, depth = get_tree_pointers(tree_positions, rows, columns)
+
+    def get_cell(node, parent_node):
+        if node < rows:
+            return node, parent_node - rows
+        return parent_node, node - rows
+
+    row_node = ev_position[0]
+    column_node = rows + ev_position[1]
+    row_path = []
+    column_path = []
+    while row_node != column_node:
+        if depth[row_node] >= depth[column_node]:
+            if parent[row_node] == -1:
+                return None
+            row_path.append(get_cell(row_node, parent[row_node]))
+            row_node = parent[row_node]
+        else:
+            if parent[column_node] == -1:
+                return None
+            column_path.append(get_cell(column_node, parent[column_node]))
+            column_node = parent[column_node]
+
+    return [ev_position] + row_path + column_path[::-1]
+
+
+def get_potentials(bv_positions, costs, rows, columns):
+    # u[x] + v[y] = cost for every basic cell, walking the tree from each root.
+    # A degenerate table can leave a forest; root tells the trees apart.
+    parent, depth = get_tree_pointers(bv_positions, rows, columns)
+    potential = [0] * (rows + columns)
+    root = list(range(rows + columns))
+    for node in sorted(range(rows + columns), key=depth.__getitem__):
+        parent_node = parent[node]
+        if parent_node == -1:
+            continue
+        root[node] = root[parent_node]
+        if node < rows:
+            potential[node] = costs[node][parent_node - rows] - potential[parent_node]
+        else:
+            potential[node] = costs[parent_node][node - rows] - potential[parent_node]
+    return potential[:rows], potential[rows:], root
 
 
 def cls():
     system('cls || clear')
 
 
-def print_2d_array(data):
-    max_x = max(coord[0] for coord in data)
-    max_y = max(coord[1] for coord in data)
-
-    array_2d = [[0] * (max_y + 1) for _ in range(max_x + 1)]
-
-    for coord, value in data.items():
-        x, y = coord
-        array_2d[x][y] = value
-
-    for row in array_2d:
+class Table:
+    # Shipments as a NumPy array next to the basis, the basic cells in a list,
+    # a mask and a dict from cell to list index, all updated in place by every
+    # pivot, so the leaving cell is swapped out without scanning the list.
+    def __init__(self, costs, bfs):
+        self.costs = np.asarray(costs)
+        self.values = np.zeros(self.costs.shape, dtype=np.asarray([v for _, v in bfs]).dtype)
+        self.is_basic = np.zeros(self.costs.shape, dtype=bool)
+        self.basis = []
+        self.basis_index = {}
+        for (x, y), value in bfs:
+            self.values[x, y] = value
+            self.is_basic[x, y] = True
+            self.basis_index[(x, y)] = len(self.basis)
+            self.basis.append((x, y))
+
+    def get_running_cost(self):
+        return (self.values * self.costs).sum()
+
+    def get_improvements(self, stepping_stone=False):
+        # The improvement index of a cell is the signed cost around its loop,
+        # which equals cost - u - v, so one potentials pass prices every cell.
+        # stepping_stone=True walks every loop instead, as done by hand.
+        # Basic cells and cells without a loop get 0 and never enter.
+        rows, columns = self.costs.shape
+        if stepping_stone:
+            improvements = np.zeros(self.costs.shape, dtype=self.costs.dtype)
+            for x, y in zip(*np.nonzero(~self.is_basic)):
+                loop = get_loop(self.basis, (x, y))
+                if loop is not None:
+                    improvements[x, y] = sum(self.costs[p] * (1 if i % 2 == 0 else -1) for i, p in enumerate(loop))
+            return improvements
+        u, v, root = get_potentials(self.basis, self.costs, rows, columns)
+        improvements = self.costs - np.asarray(u)[:, None] - np.asarray(v)[None, :]
+        root = np.asarray(root)
+        improvements[self.is_basic | (root[:rows, None] != root[None, rows:])] = 0
+        return improvements
+
+    def get_loop(self, ev_position):
+        return get_loop(self.basis, ev_position)
+
+    def pivot(self, loop):
+        # Moves flow around the loop, touching only its cells.
+        # Returns the amount moved, 0 for a degenerate pivot.
+        leaving = min(loop[1::2], key=self.values.__getitem__)
+        transfer = self.values[leaving]
+        for i, coord in enumerate(loop):
+            self.values[coord] += transfer if i % 2 == 0 else -transfer
+        self.is_basic[leaving] = False
+        self.is_basic[loop[0]] = True
+        index = self.basis_index.pop(leaving)
+        self.basis[index] = loop[0]
+        self.basis_index[loop[0]] = index
+        return transfer
+
+
+def print_2d_array(values):
+    for row in values:
         print(f'[ {", ".join("{:4}".format(value) for value in row)} ]')
         
 
@@ -81,103 +181,47 @@ def print_coordinate_val(data):
         print(f"({x+1},{letter_y}) = {value}")
 
 
-def list_coordinates(data):
-    return [coord for coord, value in data.items() if value != 0]
-
-
-def list_missing_coordinates(data):
-    return [coord for coord, value in data.items() if value == 0]
-
-
-def compute_running_cost(data, costs):
+def explain_improvement(coords, coord, costs):
+    loop = get_loop(coords, coord)
+    solution = ""
     total = 0
-    non_zero_data = {coord: value for coord, value in data.items() if value != 0}
-    for coord, value in non_zero_data.items():
-        x, y = coord
-        product = value * costs[x][y]
-        total += product
-        # print(f"{x+1}-{numeric_to_letter(y)}    {value} × {costs[x][y]}") # PRINT_SOLUTION
-    # print(f"costs = {total}")
-    return total
-
-
-
-
-def compute_for_improvement(coords, miscoords, costs):
-    weight = {}
-    for coord in miscoords:
-        solution = ""
-        total = 0
-        loop = get_loop(coords, coord)
-        multiplier = 1  
-        for node in loop:
-            x, y = node
-            cost = costs[x][y] * multiplier
-            total += cost
-            if multiplier == 1:
-                solution += f"+{cost}"
-            else:
-                solution += f"{cost}"
-            multiplier *= -1  
-        solution = solution[1:]
-        solution = solution.replace('-', ' - ')
-        solution = solution.replace('+', ' + ')
-        # print(f"{coord[0]+1}-{numeric_to_letter(coord[1])}: {solution} = {total}") # PRINT_SOLUTION
-        weight[coord] = total
-    return weight
-
-def print_dictionary(vac_cell):
-    for coord, value in vac_cell.items():
-        print(f"   {coord}: {value}")
-
-
-def get_most_negative(vac_cell):
-    most_negative_key = min(vac_cell, key=vac_cell.get)
-    if vac_cell[most_negative_key] < 0:
-        return most_negative_key
+    multiplier = 1
+    for x, y in loop:
+        cost = costs[x][y] * multiplier
+        total += cost
+        if multiplier == 1:
+            solution += f"+{cost}"
+        else:
+            solution += f"{cost}"
+        multiplier *= -1
+    solution = solution[1:]
+    solution = solution.replace('-', ' - ')
+    solution = solution.replace('+', ' + ')
+    return f"({coord[0]+1},{numeric_to_letter(coord[1])}): {solution} = {total}"
+
+
+def get_most_negative(improvements):
+    x, y = np.unravel_index(np.argmin(improvements), improvements.shape)
+    if improvements[x, y] < 0:
+        return int(x), int(y)
     else:
         return None
 
 
-def complete_data(data):
-    max_x = max(coord[0] for coord, _ in data)
-    max_y = max(coord[1] for coord, _ in data)
-    complete_data = {coord: 0 for coord in [(x, y) for x in range(max_x + 1) for y in range(max_y + 1)]}
-    complete_data.update(dict(data))
-    return complete_data
-
-
-def is_zero(num):
-    return True if (num % 2 == 0) else False
-
-
-def is_one(num):
-    return True if (num % 2 == 1) else False
-        
+def get_first_negative(improvements):
+    negative = np.flatnonzero(improvements < 0)
+    if len(negative) == 0:
+        return None
+    x, y = np.unravel_index(negative[0], improvements.shape)
+    return int(x), int(y)
 
-def optimize_table(loop, full_data):
-    transfer = float('inf')
-    for i in range(len(loop)):
-        coord = loop[i]
-        if is_one(i):
-            if full_data[coord] < transfer:
-                transfer = full_data[coord]
-
-    for i in range(len(loop)):
-        coord = loop[i]
-        if is_zero(i):
-            full_data[coord] += transfer
-        elif is_one(i):
-            full_data[coord] -= transfer
-    return full_data
 
 def print_shipments(data):
     for coord, value in data.items():
         print(f"Plant {coord[0] + 1} to Project {numeric_to_letter(coord[1])}    ->    {value} truckloads")
 
-def print_decision(data):
-    non_zero_data = {coord: value for coord, value in data.items() if value != 0}
-    print_shipments(non_zero_data)
+def print_decision(values):
+    print_shipments({(int(x), int(y)): values[x, y] for x, y in zip(*np.nonzero(values))})
 
 
 if __name__ == "__main__":
@@ -1,6 +1,21 @@
-from typing import List, Tuple, Dict
+from collections import deque
+import os
+import sys
+import time
+import numpy as np
+from typing import Dict, Iterator, List, Tuple
+
+# Jams runs as a script; the repository root makes the shared tpp package importable.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+from tpp.cache import SolutionCache  # noqa: E402
+from tpp.logics import Basis  # noqa: E402
 
 class Logics:
+    # Records kept for replay; longer solves replay their final record only.
+    CACHED_RECORDS: int = 1000
+
     @staticmethod
     def get_balanced_tp(supply: list[int], demand: list[int], costs: list[list[int]], penalties: list[int] = None) -> tuple[list[int], list[int], list[list[int]]]:
         """
@@ -64,44 +79,205 @@ class Logics:
         return bfs
 
     @staticmethod
-    def get_vs_and_ws(bfs: list[tuple[tuple[int], int]], costs: list[list[int]]) -> tuple[list[int], list[int]]:
+    def least_cost(supply: list[int], demand: list[int], costs: list[list[int]]) -> list[tuple[tuple[int], int]]:
+        """
+        Finds the initial basic feasible solution using the Least Cost method.
+
+        Cells are visited once in increasing cost order. Every allocation
+        retires exactly one row or column (both only on the last one), so the
+        result always has len(supply) + len(demand) - 1 cells, some of them
+        zero when the problem is degenerate.
+
+        Args:
+            supply (list[int]): List of supply values.
+            demand (list[int]): List of demand values.
+            costs (list[list[int]]): Cost matrix.
+
+        Returns:
+            list[tuple[tuple[int], int]]: Initial basic feasible solution.
+        """
+        supply_copy = supply.copy()
+        demand_copy = demand.copy()
+        row_done = [False] * len(supply)
+        column_done = [False] * len(demand)
+        rows_left = len(supply)
+        bfs = []
+        for index in np.argsort(np.asarray(costs), axis=None, kind='stable'):
+            i, j = divmod(int(index), len(demand))
+            if row_done[i] or column_done[j]:
+                continue
+            v = min(supply_copy[i], demand_copy[j])
+            supply_copy[i] -= v
+            demand_copy[j] -= v
+            bfs.append(((i, j), v))
+            if len(bfs) == len(supply) + len(demand) - 1:
+                break
+            if supply_copy[i] == 0 and rows_left > 1:
+                row_done[i] = True
+                rows_left -= 1
+            else:
+                column_done[j] = True
+        return bfs
+
+    @staticmethod
+    def vogel_approximation(supply: list[int], demand: list[int], costs: list[list[int]]) -> list[tuple[tuple[int], int]]:
+        """
+        Finds the initial basic feasible solution using Vogel's Approximation Method.
+
+        The penalty of a row or column is the gap between its two cheapest open
+        cells, found with a NumPy partial sort. After an allocation only the
+        lines whose two cheapest cells included the retired line are partially
+        sorted again. A line with a single open cell gets an infinite penalty.
+
+        Args:
+            supply (list[int]): List of supply values.
+            demand (list[int]): List of demand values.
+            costs (list[list[int]]): Cost matrix.
+
+        Returns:
+            list[tuple[tuple[int], int]]: Initial basic feasible solution.
+        """
+        rows = len(supply)
+        columns = len(demand)
+        open_costs = np.full((rows + 1, columns + 1), np.inf)
+        open_costs[:rows, :columns] = costs
+
+        def get_penalties(lines: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            cheapest = np.argpartition(lines, 1, axis=1)[:, :2]
+            values = np.take_along_axis(lines, cheapest, axis=1)
+            return values[:, 1] - values[:, 0], cheapest[:, 0], cheapest[:, 1]
+
+        row_penalties, row_first, row_second = get_penalties(
+            open_costs[:rows])
+        column_penalties, column_first, column_second = get_penalties(
+            open_costs[:, :columns].T)
+
+        supply_copy = supply.copy()
+        demand_copy = demand.copy()
+        rows_left = rows
+        bfs = []
+        while True:
+            i = int(np.argmax(row_penalties))
+            j = int(np.argmax(column_penalties))
+            if row_penalties[i] >= column_penalties[j]:
+                j = int(row_first[i])
+            else:
+                i = int(column_first[j])
+            v = min(supply_copy[i], demand_copy[j])
+            supply_copy[i] -= v
+            demand_copy[j] -= v
+            bfs.append(((i, j), v))
+            if len(bfs) == rows + columns - 1:
+                break
+
+            if supply_copy[i] == 0 and rows_left > 1:
+                rows_left -= 1
+                open_costs[i, :columns] = np.inf
+                row_penalties[i] = -np.inf
+                stale = np.flatnonzero(((column_first == i) | (column_second == i)) & (column_penalties != -np.inf))
+                if stale.size:
+                    column_penalties[stale], column_first[stale], column_second[stale] = get_penalties(
+                        open_costs[:, stale].T)
+            else:
+                open_costs[:rows, j] = np.inf
+                column_penalties[j] = -np.inf
+                stale = np.flatnonzero(((row_first == j) | (row_second == j)) & (row_penalties != -np.inf))
+                if stale.size:
+                    row_penalties[stale], row_first[stale], row_second[stale] = get_penalties(
+                        open_costs[stale])
+        return bfs
+
+    @staticmethod
+    def get_initial_solution(supply: list[int], demand: list[int], costs: list[list[int]], initial_method: str = 'north_west_corner') -> list[tuple[tuple[int], int]]:
+        """
+        Finds the initial basic feasible solution with the chosen method.
+
+        Args:
+            supply (list[int]): List of supply values.
+            demand (list[int]): List of demand values.
+            costs (list[list[int]]): Cost matrix.
+            initial_method (str, optional): 'north_west_corner', 'least_cost' or 'vogel_approximation'. Defaults to 'north_west_corner'.
+
+        Raises:
+            Exception: When the initial method is unknown.
+
+        Returns:
+            list[tuple[tuple[int], int]]: Initial basic feasible solution.
+        """
+        if initial_method == 'north_west_corner':
+            return Logics.north_west_corner(supply, demand)
+        if initial_method == 'least_cost':
+            return Logics.least_cost(supply, demand, costs)
+        if initial_method == 'vogel_approximation':
+            return Logics.vogel_approximation(supply, demand, costs)
+        raise Exception(f'Unknown initial method: {initial_method}')
+
+    @staticmethod
+    def get_basis_tree(bfs: Basis | list[tuple[tuple[int], int]], rows: int, columns: int) -> tuple[list[list[int]], list[list[int]]]:
+        """
+        Builds the adjacency lists of the basis spanning tree.
+
+        Args:
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
+            rows (int): Number of rows (sources).
+            columns (int): Number of columns (destinations).
+
+        Returns:
+            tuple[list[list[int]], list[list[int]]]: Columns adjacent to each row and rows adjacent to each column.
+        """
+        row_adjacency = [[] for _ in range(rows)]
+        column_adjacency = [[] for _ in range(columns)]
+        for (i, j), _ in bfs:
+            row_adjacency[i].append(j)
+            column_adjacency[j].append(i)
+        return row_adjacency, column_adjacency
+
+    @staticmethod
+    def get_vs_and_ws(bfs: Basis | list[tuple[tuple[int], int]], costs: list[list[int]]) -> tuple[list[int], list[int]]:
         """
         Calculates the values of v and w in the Modified Distribution method.
 
+        The potentials are propagated with a single breadth-first traversal of
+        the basis tree, so the work is linear in the number of rows and columns.
+        Every component of a degenerate (disconnected) basis is rooted at its
+        first row with v = 0, and columns without basic cells get w = 0.
+
         Args:
-            bfs (list[tuple[tuple[int], int]]): Basic feasible solution.
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
             costs (list[list[int]]): Cost matrix.
 
         Returns:
             tuple[list[int], list[int]]: Values of v and w.
         """
+        row_adjacency, column_adjacency = Logics.get_basis_tree(
+            bfs, len(costs), len(costs[0]))
         vs = [None] * len(costs)
         ws = [None] * len(costs[0])
-        vs[0] = 0
-        bfs_copy = bfs.copy()
-        while len(bfs_copy) > 0:
-            for index, bv in enumerate(bfs_copy):
-                i, j = bv[0]
-                if vs[i] is None and ws[j] is None:
-                    continue
-
-                cost = costs[i][j]
-                if vs[i] is None:
-                    vs[i] = cost - ws[j]
-                else:
-                    ws[j] = cost - vs[i]
-                bfs_copy.pop(index)
-                break
-
-        return vs, ws
+        for root in range(len(costs)):
+            if vs[root] is not None:
+                continue
+            vs[root] = 0
+            queue = deque([root])
+            while queue:
+                i = queue.popleft()
+                for j in row_adjacency[i]:
+                    if ws[j] is not None:
+                        continue
+                    ws[j] = costs[i][j] - vs[i]
+                    for k in column_adjacency[j]:
+                        if vs[k] is None:
+                            vs[k] = costs[k][j] - ws[j]
+                            queue.append(k)
+
+        return vs, [0 if w is None else w for w in ws]
 
     @staticmethod
-    def get_cs(bfs: list[tuple[tuple[int], int]], costs: list[list[int]], vs: list[int], ws: list[int]) -> list[tuple[tuple[int], int]]:
+    def get_cs(bfs: Basis | list[tuple[tuple[int], int]], costs: list[list[int]], vs: list[int], ws: list[int]) -> list[tuple[tuple[int], int]]:
         """
         Calculates the costs of non-basic variables in the Modified Distribution method.
 
         Args:
-            bfs (list[tuple[tuple[int], int]]): Basic feasible solution.
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
             costs (list[list[int]]): Cost matrix.
             vs (list[int]): List of v values.
             ws (list[int]): List of w values.
@@ -109,11 +285,11 @@ class Logics:
         Returns:
             list[tuple[tuple[int], int]]: Costs of non-basic variables.
         """
+        basis = Basis.from_list(bfs)
         cs = []
         for i, row in enumerate(costs):
             for j, cost in enumerate(row):
-                non_basic = all([p[0] != i or p[1] != j for p, v in bfs])
-                if non_basic:
+                if (i, j) not in basis:
                     cs.append(((i, j), vs[i] + ws[j] - cost))
 
         return cs
@@ -149,6 +325,44 @@ class Logics:
         cs_copy.sort(key=lambda w: w[1])
         return cs_copy[-1][0]
 
+    @staticmethod
+    def get_tree_pointers(bv_positions: Basis | list[tuple[int, int]], rows: int, columns: int) -> tuple[list[int], list[int]]:
+        """
+        Roots the basis spanning tree and returns parent and depth pointers.
+
+        Rows are nodes 0 to rows - 1 and columns are nodes rows to rows + columns - 1.
+        Every component of a degenerate basis gets its own root with parent -1.
+
+        Args:
+            bv_positions (Basis | list[tuple[int, int]]): Basis or positions of basic variables.
+            rows (int): Number of rows (sources).
+            columns (int): Number of columns (destinations).
+
+        Returns:
+            tuple[list[int], list[int]]: Parent and depth of every node.
+        """
+        if isinstance(bv_positions, Basis):
+            bv_positions = bv_positions.positions()
+        adjacency = [[] for _ in range(rows + columns)]
+        for i, j in bv_positions:
+            adjacency[i].append(rows + j)
+            adjacency[rows + j].append(i)
+        parent = [-1] * (rows + columns)
+        depth = [None] * (rows + columns)
+        for root in range(rows + columns):
+            if depth[root] is not None:
+                continue
+            depth[root] = 0
+            queue = deque([root])
+            while queue:
+                node = queue.popleft()
+                for next_node in adjacency[node]:
+                    if depth[next_node] is None:
+                        parent[next_node] = node
+                        depth[next_node] = depth[node] + 1
+                        queue.append(next_node)
+        return parent, depth
+
     @staticmethod
     def get_possible_next_nodes(loop: list[tuple[int, int]], not_visited: list[tuple[int, int]]) -> list[tuple[int, int]]:
         """
@@ -173,33 +387,50 @@ class Logics:
                 return nodes_in_column
             return nodes_in_row
 
-    def get_loop(self, bv_positions: list[tuple[int, int]], ev_position: tuple[int, int]) -> list[tuple[int, int]]:
+    def get_loop(self, bv_positions: Basis | list[tuple[int, int]], ev_position: tuple[int, int]) -> list[tuple[int, int]]:
         """
         Finds a loop containing the entering variable position.
 
+        Both ends of the entering cell are walked up the basis tree to their
+        common ancestor, so the work is proportional to the loop length once
+        the tree pointers are built.
+
         Args:
-            bv_positions (list[tuple[int, int]]): Positions of basic variables.
+            bv_positions (Basis | list[tuple[int, int]]): Basis or positions of basic variables.
             ev_position (tuple[int, int]): Entering variable position.
 
         Returns:
             list[tuple[int, int]]: Loop containing the entering variable position.
         """
-        def inner(loop: list[tuple[int, int]]) -> list[tuple[int, int]]:
-            if len(loop) > 3:
-                can_be_closed = len(
-                    self.get_possible_next_nodes(loop, [ev_position])) == 1
-                if can_be_closed:
-                    return loop
-
-            not_visited = list(set(bv_positions) - set(loop))
-            possible_next_nodes = self.get_possible_next_nodes(
-                loop, not_visited)
-            for next_node in possible_next_nodes:
-                new_loop = inner(loop + [next_node])
-                if new_loop:
-                    return new_loop
-
-        return inner([ev_position])
+        if isinstance(bv_positions, Basis):
+            bv_positions = bv_positions.positions()
+        tree_positions = [p for p in bv_positions if p != ev_position]
+        rows = max(p[0] for p in tree_positions + [ev_position]) + 1
+        columns = max(p[1] for p in tree_positions + [ev_position]) + 1
+        parent, depth = self.get_tree_pointers(tree_positions, rows, columns)
+
+        def get_cell(node: int, parent_node: int) -> tuple[int, int]:
+            if node < rows:
+                return node, parent_node - rows
+            return parent_node, node - rows
+
+        row_node = ev_position[0]
+        column_node = rows + ev_position[1]
+        row_path = []
+        column_path = []
+        while row_node != column_node:
+            if depth[row_node] >= depth[column_node]:
+                if parent[row_node] == -1:
+                    return None
+                row_path.append(get_cell(row_node, parent[row_node]))
+                row_node = parent[row_node]
+            else:
+                if parent[column_node] == -1:
+                    return None
+                column_path.append(get_cell(column_node, parent[column_node]))
+                column_node = parent[column_node]
+
+        return [ev_position] + row_path + column_path[::-1]
 
     @staticmethod
     def get_total_cost(costs: list[list[int]], solution: list[list[int]]) -> int:
@@ -219,74 +450,125 @@ class Logics:
                 total_cost += cost * solution[i][j]
         return total_cost
     
-    def loop_pivoting(self, bfs: List[Tuple[int]], loop: list[tuple[int, int]]) -> List[Tuple[int]]:
-        even_cells = loop[0::2]
-        odd_cells = loop[1::2]
-        get_bv = lambda pos: next(v for p, v in bfs if p == pos)
-        leaving_position = sorted(odd_cells, key=get_bv)[0]
-        leaving_value = get_bv(leaving_position)
-        
-        new_bfs = []
-        for p, v in [bv for bv in bfs if bv[0] != leaving_position] + [(loop[0], 0)]:
-            if p in even_cells:
-                v += leaving_value
-            elif p in odd_cells:
-                v -= leaving_value
-            new_bfs.append((p, v))
-        
-        return new_bfs
-    
-    def transportation_simplex_method(self, supply: List[int], demand: List[int], costs: List[List[int]], penalties=None) -> List[Dict]:
-        improvement = []
+    @staticmethod
+    def get_leaving_variable(bfs: Basis | List[Tuple[int]], loop: list[tuple[int, int]], bland: bool = False) -> Tuple[tuple[int, int], int]:
+        basis = Basis.from_list(bfs)
+        leaving_position = min(loop[1::2], key=(lambda pos: (basis[pos], pos)) if bland else basis.__getitem__)
+        return leaving_position, basis[leaving_position]
+
+    @staticmethod
+    def apply_pivot(bfs: Basis | List[Tuple[int]], loop: list[tuple[int, int]], leaving_position: tuple[int, int], theta: int) -> Basis | List[Tuple[int]]:
+        # A Basis is updated in place in O(len(loop)); the list form is copied.
+        basis = Basis.from_list(bfs)
+        for index, p in enumerate(loop[1:], 1):
+            basis[p] += theta if index % 2 == 0 else -theta
+        basis.replace(leaving_position, loop[0], theta)
+
+        return basis if isinstance(bfs, Basis) else basis.to_list()
+
+    def loop_pivoting(self, bfs: Basis | List[Tuple[int]], loop: list[tuple[int, int]], bland: bool = False) -> Basis | List[Tuple[int]]:
+        leaving_position, leaving_value = self.get_leaving_variable(bfs, loop, bland)
+        return self.apply_pivot(bfs, loop, leaving_position, leaving_value)
+
+    @staticmethod
+    def get_solution_table(bfs: Basis | List[Tuple[int]], rows: int, columns: int) -> List[List[int]]:
+        # Cells outside rows x columns (a dummy row or column) are left out.
+        solution = [[0 for _ in range(columns)] for _ in range(rows)]
+        for (i, j), v in bfs:
+            if i < rows and j < columns:
+                solution[i][j] = v
+        return solution
+
+    def transportation_simplex_method(self, supply: List[int], demand: List[int], costs: List[List[int]], penalties=None, initial_method: str = 'north_west_corner', max_iterations: int = None, time_limit: float = None, cache: SolutionCache = None) -> Iterator[Dict]:
+        # Yields one record per pivot as it happens. Only the first record has
+        # the full basic feasible solution; later ones carry the pivot as a
+        # delta (entering and leaving variable, theta and the close loop), so
+        # memory stays flat. Use apply_pivot and get_solution_table to rebuild
+        # a table when it is needed. The final record repeats the full solution.
         balanced_supply, balanced_demand, balanced_costs = self.get_balanced_tp(
             supply, demand, costs
         )
 
-        def inner(bfs):
-            nonlocal improvement  # Access improvement variable from outer scope
+        # With a cache, the records of an optimal solve are kept and replayed
+        # for the same balanced problem and initial method. Past
+        # CACHED_RECORDS records only the final one, which repeats the full
+        # solution, is kept, so long solves do not grow the cache.
+        if cache is not None:
+            key = cache.get_key(balanced_supply, balanced_demand, balanced_costs, initial_method=initial_method)
+            records = cache.get(key)
+            if records is not None:
+                yield from records
+                return
+            records = []
+            for record in self.transportation_simplex_method(self, supply, demand, costs, penalties, initial_method, max_iterations, time_limit):
+                if records is not None:
+                    records.append(record)
+                    if len(records) > self.CACHED_RECORDS:
+                        records = None
+                yield record
+            if record["status"] == "optimal":
+                cache.put(key, [record] if records is None else records)
+            return
+
+        # Pivot in a plain loop so long solves cannot hit the recursion limit.
+        # After a run of degenerate pivots, switch to Bland's rule (lowest
+        # improving cell enters, lowest tied cell leaves) until flow moves again.
+        started = time.perf_counter()
+        stalled = 0
+        status = "optimal"
+        bfs = Basis(self.get_initial_solution(balanced_supply, balanced_demand, balanced_costs, initial_method))
+        cost = sum(balanced_costs[i][j] * v for (i, j), v in bfs)
+        iteration = 0
+        while True:
+            if max_iterations is not None and iteration >= max_iterations:
+                status = "iteration_limit"
+                break
+            if time_limit is not None and time.perf_counter() - started >= time_limit:
+                status = "time_limit"
+                break
+
             us, vs = self.get_vs_and_ws(bfs, balanced_costs)
             ws = self.get_cs(bfs, balanced_costs, us, vs)
-            if self.can_be_improved(ws):
+            if not self.can_be_improved(ws):
+                break
+
+            bland = stalled >= len(balanced_supply) + len(balanced_demand)
+            if bland:
+                ev_position = next(p for p, v in ws if v > 0)
+            else:
                 ev_position = self.get_entering_variable_position(ws)
-                loop = self.get_loop(self, [p for p, v in bfs], ev_position)
-
-                temp_basic_var = bfs
-                temp_solution = [[0 for _ in range(len(costs[0]))] for _ in costs]
-
-                for (i, j), v in temp_basic_var:
-                    temp_solution[i][j] = v
-
-                cost = self.get_total_cost(balanced_costs, temp_solution)
-
-                improvement.append({
-                    "basic feasible solution": bfs,
-                    "supply cost factors": us,
-                    "demand cost factors": vs,
-                    "entering variable": ev_position,
-                    "close loop": loop,
-                    "solution": temp_solution,
-                    "cost": cost
-                })
-
-                return inner(self.loop_pivoting(self, bfs, loop))
-            return bfs
-
-        basic_variables = inner(self.north_west_corner(balanced_supply, balanced_demand))
-
-        us, vs = self.get_vs_and_ws(basic_variables, balanced_costs)
-        solution = [[0 for _ in range(len(costs[0]))] for _ in costs]
-        for (i, j), v in basic_variables:
-            solution[i][j] = v
-        final_cost = self.get_total_cost(balanced_costs, solution)
-        improvement.append({
-            "basic feasible solution": basic_variables,
+            loop = self.get_loop(self, bfs, ev_position)
+            leaving_position, theta = self.get_leaving_variable(bfs, loop, bland)
+
+            record = {
+                "iteration": iteration,
+                "supply cost factors": us,
+                "demand cost factors": vs,
+                "entering variable": ev_position,
+                "leaving variable": leaving_position,
+                "theta": theta,
+                "close loop": loop,
+                "cost": cost
+            }
+            if iteration == 0:
+                record["basic feasible solution"] = bfs.to_list()
+            yield record
+
+            bfs = self.apply_pivot(bfs, loop, leaving_position, theta)
+            cost -= theta * (us[ev_position[0]] + vs[ev_position[1]] - balanced_costs[ev_position[0]][ev_position[1]])
+            stalled = stalled + 1 if theta == 0 else 0
+            iteration += 1
+
+        us, vs = self.get_vs_and_ws(bfs, balanced_costs)
+        yield {
+            "iteration": iteration,
             "supply cost factors": us,
             "demand cost factors": vs,
             "entering variable": None,  
+            "leaving variable": None,
+            "theta": None,
             "close loop": None,  
-            "solution": solution,
-            "cost": final_cost
-        })
-
-        return improvement
-
+            "cost": cost,
+            "status": status,
+            "basic feasible solution": bfs.to_list()
+        }
@@ -1,10 +1,13 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Tuple
 from tabulate import tabulate
 import ast
-from methods import Logics
+from methods import Basis, Logics, SolutionCache
 from typing import List
 
 class Modi_Matrix:
+    # Problems entered again in the same session are replayed from here.
+    CACHE: SolutionCache = SolutionCache()
+
     @staticmethod
     def get_data() -> Tuple[List[List[int]], List[int], List[int]]:
         
@@ -18,12 +21,12 @@ class Modi_Matrix:
         return cost, supply, demand
     
     @staticmethod
-    def get_result(cost: List[List[int]], supply: List[int], demand: List[int]) -> List[Dict]:
-        result = Logics.transportation_simplex_method(Logics, supply=supply, demand=demand, costs=cost)
+    def get_result(cost: List[List[int]], supply: List[int], demand: List[int]) -> Iterator[Dict]:
+        result = Logics.transportation_simplex_method(Logics, supply=supply, demand=demand, costs=cost, cache=Modi_Matrix.CACHE)
         return result
     
     
-    def tabulate_result(supply: List[int], demand: List[int], result:List[Dict]) -> None:
+    def tabulate_result(supply: List[int], demand: List[int], result:Iterator[Dict]) -> None:
         supply_header = [chr(96 + i + 1).upper() for i in range(len(demand))]
         for i in range(2):
             supply_header.insert(0, ' ')
@@ -32,6 +35,9 @@ class Modi_Matrix:
         supply_cf_header = [f'V{i + 1}' for i in range(len(supply_header))]
         demand_cf_row = [f'W{i + 1}' for i in range(len(demand_row))]
         
+        # Records arrive while the solver runs and only carry the pivot, so
+        # keep the current basis here and rebuild each table from it.
+        bfs = None
         for i, row in enumerate(result):
             print(f"Table {i + 1}\n")
             
@@ -39,7 +45,9 @@ class Modi_Matrix:
             print(vs)
             ws = [f"{demand_cf_row[i]} = {row["demand cost factors"][i]}" for i in range(len(row["demand cost factors"]))]
             print(ws)
-            cur_table = row["solution"].copy()
+            if "basic feasible solution" in row:
+                bfs = Basis(row["basic feasible solution"])
+            cur_table = Logics.get_solution_table(bfs, len(supply), len(demand))
             
             for i in range(len(cur_table)):
                 cur_table[i].insert(0, ws[i])  
@@ -63,5 +71,10 @@ class Modi_Matrix:
             print(f"Cost: {cost}\n")
             print(f"Entering variable: {entering_variable}\n")
             print(f"Close Loop: {close_loop}\n")
+            if "status" in row:
+                print(f"Status: {row['status']}\n")
             print()
+            
+            if row["entering variable"] is not None:
+                bfs = Logics.apply_pivot(bfs, row["close loop"], row["leaving variable"], row["theta"])
  
\ No newline at end of file
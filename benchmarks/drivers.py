@@ -0,0 +1,195 @@
+import os
+import sys
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Jams and FPJ are scripts that import their siblings by bare name.
+for directory in ['Jams', 'FPJ']:
+    if os.path.join(ROOT, directory) not in sys.path:
+        sys.path.insert(0, os.path.join(ROOT, directory))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import methods as jams  # noqa: E402
+import prototype as fpj  # noqa: E402
+from tpp.instrumentation import SolverStats  # noqa: E402
+from tpp.logics import Logics, SparseCosts  # noqa: E402
+from tpp.network_simplex import NetworkSimplex  # noqa: E402
+from tpp.result import SolverResult  # noqa: E402
+
+PHASES: list[str] = ['initial_solution', 'potentials', 'pricing', 'loop', 'pivoting']
+FORBIDDEN_COST: int = 10 ** 6
+
+
+class Timer:
+    """
+    Accumulates wall-clock time per phase.
+
+    Attributes:
+    phases (dict[str, float | None]): Seconds per phase, None for phases an implementation does not have.
+    """
+
+    def __init__(self, missing: list[str] = ()) -> None:
+        self.phases = {phase: None if phase in missing else 0.0 for phase in PHASES}
+        self.phase = None
+        self.started = None
+
+    def __call__(self, phase: str) -> 'Timer':
+        self.phase = phase
+        return self
+
+    def __enter__(self) -> 'Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.phases[self.phase] += time.perf_counter() - self.started
+
+
+def get_dense_problem(instance: dict) -> tuple[list[int], list[int], list[list[int]]]:
+    """
+    Returns the balanced dense problem, missing routes priced at FORBIDDEN_COST.
+
+    Args:
+    instance (dict): Instance from generate.
+
+    Returns:
+    tuple[list[int], list[int], list[list[int]]]: Balanced supply, demand and costs.
+    """
+    costs = instance['costs']
+    if instance['routes'] is not None:
+        costs = np.where(instance['routes'], costs, FORBIDDEN_COST)
+    supply, demand, costs = Logics.get_balanced_tp(instance['supply'], instance['demand'], costs, instance['penalties'])
+    return supply, demand, np.asarray(costs).tolist()
+
+
+def solve_tpp(instance: dict, initial_method: str, pricing: str, budget: float) -> dict:
+    """
+    Solves an instance with the tpp network simplex engine, timed by its SolverStats.
+
+    Args:
+    instance (dict): Instance from generate.
+    initial_method (str): Starting method.
+    pricing (str): Pricing rule.
+    budget (float): Seconds before the solve is stopped.
+
+    Returns:
+    dict: status, iterations, total_cost and phases.
+    """
+    stats = SolverStats()
+    if instance['routes'] is not None:
+        costs = SparseCosts.from_dense(np.where(instance['routes'], instance['costs'], -1), missing=-1)
+        supply, demand, costs = Logics.get_balanced_tp(instance['supply'], instance['demand'], costs, instance['penalties'])
+    else:
+        supply, demand, costs = Logics.get_balanced_tp(
+            instance['supply'], instance['demand'], instance['costs'], instance['penalties'])
+    started = time.perf_counter()
+    bfs = Logics.get_initial_solution(supply, demand, costs, initial_method)
+    stats.add_time('initial_solution', time.perf_counter() - started)
+    engine = NetworkSimplex(costs, bfs, pricing, stats)
+    engine.solve(time_limit=max(0.0, budget - (time.perf_counter() - started)))
+    status = 'optimal' if engine.status == SolverResult.OPTIMAL else 'timeout'
+    total_cost = sum(engine.get_cost(p) * v for p, v in engine.basis if v)
+    return {'status': status, 'iterations': engine.iterations, 'total_cost': int(total_cost), 'phases': stats.phases}
+
+
+def solve_jams(instance: dict, initial_method: str, pricing: str, budget: float) -> dict:
+    """
+    Solves an instance with the Jams MODI implementation, one phase at a time.
+
+    Args:
+    instance (dict): Instance from generate.
+    initial_method (str): Starting method.
+    pricing (str): Ignored, Jams always picks the largest violation.
+    budget (float): Seconds before the solve is stopped.
+
+    Returns:
+    dict: status, iterations, total_cost and phases.
+    """
+    timer = Timer()
+    supply, demand, costs = get_dense_problem(instance)
+    started = time.perf_counter()
+    with timer('initial_solution'):
+        bfs = jams.Basis(jams.Logics.get_initial_solution(supply, demand, costs, initial_method))
+    stalled = 0
+    iterations = 0
+    status = 'optimal'
+    while True:
+        if time.perf_counter() - started >= budget:
+            status = 'timeout'
+            break
+        with timer('potentials'):
+            us, vs = jams.Logics.get_vs_and_ws(bfs, costs)
+        bland = stalled >= len(supply) + len(demand)
+        with timer('pricing'):
+            ws = jams.Logics.get_cs(bfs, costs, us, vs)
+            if not jams.Logics.can_be_improved(ws):
+                break
+            if bland:
+                ev_position = next(p for p, v in ws if v > 0)
+            else:
+                ev_position = jams.Logics.get_entering_variable_position(ws)
+        with timer('loop'):
+            loop = jams.Logics.get_loop(jams.Logics, bfs, ev_position)
+        with timer('pivoting'):
+            leaving_position, theta = jams.Logics.get_leaving_variable(bfs, loop, bland)
+            bfs = jams.Logics.apply_pivot(bfs, loop, leaving_position, theta)
+        stalled = stalled + 1 if theta == 0 else 0
+        iterations += 1
+    total_cost = sum(costs[i][j] * v for (i, j), v in bfs)
+    return {'status': status, 'iterations': iterations, 'total_cost': int(total_cost), 'phases': timer.phases}
+
+
+def solve_fpj(instance: dict, initial_method: str, pricing: str, budget: float) -> dict:
+    """
+    Solves an instance with the FPJ stepping stone implementation, one phase at a time.
+
+    FPJ prices the vacant cells from potentials it builds inside
+    Table.get_improvements, so the pricing phase includes them and there is
+    no separate potentials phase. The loop phase is the search for the chosen
+    cell only.
+
+    Args:
+    instance (dict): Instance from generate.
+    initial_method (str): Ignored, FPJ always starts from the North-West Corner.
+    pricing (str): Ignored, FPJ always picks the most negative cell.
+    budget (float): Seconds before the solve is stopped.
+
+    Returns:
+    dict: status, iterations, total_cost and phases.
+    """
+    timer = Timer(missing=['potentials'])
+    supply, demand, costs = get_dense_problem(instance)
+    started = time.perf_counter()
+    with timer('initial_solution'):
+        table = fpj.Table(costs, fpj.north_west_corner(supply, demand))
+    stalled = 0
+    iterations = 0
+    status = 'optimal'
+    while True:
+        if time.perf_counter() - started >= budget:
+            status = 'timeout'
+            break
+        with timer('pricing'):
+            improvements = table.get_improvements()
+            if stalled >= len(supply) + len(demand):
+                most_negative = fpj.get_first_negative(improvements)
+            else:
+                most_negative = fpj.get_most_negative(improvements)
+        if most_negative is None:
+            break
+        with timer('loop'):
+            loop = table.get_loop(most_negative)
+        with timer('pivoting'):
+            stalled = stalled + 1 if table.pivot(loop) == 0 else 0
+        iterations += 1
+    return {'status': status, 'iterations': iterations,
+            'total_cost': int(table.get_running_cost()), 'phases': timer.phases}
+
+
+IMPLEMENTATIONS: dict = {
+    'tpp': solve_tpp,
+    'Jams': solve_jams,
+    'FPJ': solve_fpj,
+}
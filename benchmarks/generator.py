@@ -0,0 +1,74 @@
+import numpy as np
+
+KINDS: list[str] = ['balanced', 'unbalanced', 'degenerate', 'sparse', 'assignment']
+
+
+def generate(kind: str, size: int, seed: int = 0) -> dict:
+    """
+    Generates a seeded size x size transportation problem.
+
+    Kinds:
+    balanced: random supply, demand with the same total.
+    unbalanced: demand exceeds supply, a penalty per column covers the shortage.
+    degenerate: equal supplies and demands, so partial sums keep coinciding.
+    sparse: about 10% of the routes, always including a feasible North-West Corner path.
+    assignment: every supply and demand is 1.
+
+    Args:
+    kind (str): One of KINDS.
+    size (int): Number of rows and columns.
+    seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Raises:
+    Exception: When the kind is unknown.
+
+    Returns:
+    dict: name, kind, size, seed, supply, demand, costs (np.ndarray), penalties (list or None)
+    and routes (boolean matrix of the existing routes, None when every route exists).
+    """
+    rng = np.random.default_rng([seed, size, KINDS.index(kind) if kind in KINDS else -1])
+    costs = rng.integers(1, 100, (size, size))
+    penalties = None
+    routes = None
+    if kind == 'balanced':
+        supply = rng.integers(10, 100, size)
+        demand = rng.multinomial(supply.sum() - size, np.ones(size) / size) + 1
+    elif kind == 'unbalanced':
+        supply = rng.integers(10, 100, size)
+        demand = rng.multinomial(supply.sum() * 5 // 4, np.ones(size) / size)
+        penalties = rng.integers(100, 200, size).tolist()
+    elif kind == 'degenerate':
+        supply = np.full(size, 10)
+        demand = np.full(size, 10)
+    elif kind == 'sparse':
+        supply = rng.integers(10, 100, size)
+        demand = rng.multinomial(supply.sum() - size, np.ones(size) / size) + 1
+        routes = rng.random((size, size)) < 0.1
+        supply_left = supply.copy()
+        demand_left = demand.copy()
+        i = j = 0
+        while i < size and j < size:
+            routes[i, j] = True
+            v = min(supply_left[i], demand_left[j])
+            supply_left[i] -= v
+            demand_left[j] -= v
+            if supply_left[i] == 0:
+                i += 1
+            else:
+                j += 1
+    elif kind == 'assignment':
+        supply = np.ones(size, dtype=int)
+        demand = np.ones(size, dtype=int)
+    else:
+        raise Exception(f'Unknown instance kind: {kind}')
+    return {
+        'name': f'{kind}-{size}x{size}-{seed}',
+        'kind': kind,
+        'size': size,
+        'seed': seed,
+        'supply': supply.tolist(),
+        'demand': demand.tolist(),
+        'costs': costs,
+        'penalties': penalties,
+        'routes': routes,
+    }
@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from .drivers import IMPLEMENTATIONS
+from .generator import KINDS, generate
+
+PROFILES: dict[str, list[int]] = {
+    'quick': [10, 30, 100],
+    'full': [10, 30, 100, 300, 1000],
+}
+# Largest size each implementation is run at; the stepping stone and the
+# list-based MODI grow too slowly past these.
+MAX_SIZES: dict[str, int] = {'tpp': 1000, 'Jams': 100, 'FPJ': 100}
+BASELINE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def run(sizes: list[int], implementations: list[str], kinds: list[str], seed: int, initial_method: str, pricing: str, budget: float) -> list[dict]:
+    """
+    Runs every implementation on every instance.
+
+    Args:
+    sizes (list[int]): Instance sizes.
+    implementations (list[str]): Names from IMPLEMENTATIONS.
+    kinds (list[str]): Instance kinds.
+    seed (int): Seed of the instances.
+    initial_method (str): Starting method.
+    pricing (str): Pricing rule of tpp.
+    budget (float): Seconds per solve.
+
+    Returns:
+    list[dict]: One record per implementation and instance.
+    """
+    records = []
+    for size in sizes:
+        for kind in kinds:
+            instance = generate(kind, size, seed)
+            for implementation in implementations:
+                record = {'implementation': implementation, 'instance': instance['name'],
+                          'kind': kind, 'size': size, 'seed': seed}
+                if size > MAX_SIZES[implementation]:
+                    record['status'] = 'skipped'
+                    records.append(record)
+                    continue
+                started = time.perf_counter()
+                try:
+                    record.update(IMPLEMENTATIONS[implementation](instance, initial_method, pricing, budget))
+                except Exception as error:
+                    record['status'] = 'error'
+                    record['error'] = repr(error)
+                record['seconds'] = time.perf_counter() - started
+                records.append(record)
+                print(f"{implementation:5} {instance['name']:28} {record['status']:10} "
+                      f"{record['seconds']:9.4f}s {record.get('iterations', '')}", flush=True)
+    return records
+
+
+def compare(records: list[dict], baseline: list[dict], tolerance: float, noise: float) -> list[str]:
+    """
+    Compares a run with a baseline.
+
+    A record regresses when it is more than tolerance slower and more than
+    noise seconds slower than the baseline, when its status got worse, or
+    when it reached a different optimal cost.
+
+    Args:
+    records (list[dict]): Records of this run.
+    baseline (list[dict]): Records of the baseline run.
+    tolerance (float): Allowed relative slowdown.
+    noise (float): Slowdowns under this many seconds are ignored.
+
+    Returns:
+    list[str]: One message per regression.
+    """
+    previous = {(record['implementation'], record['instance']): record for record in baseline}
+    regressions = []
+    for record in records:
+        old = previous.get((record['implementation'], record['instance']))
+        if old is None or old['status'] == 'skipped' or record['status'] == 'skipped':
+            continue
+        name = f"{record['implementation']} {record['instance']}"
+        if old['status'] == 'optimal' and record['status'] != 'optimal':
+            regressions.append(f"{name}: status {old['status']} -> {record['status']}")
+        elif old['status'] == 'optimal' and record['total_cost'] != old['total_cost']:
+            regressions.append(f"{name}: total cost {old['total_cost']} -> {record['total_cost']}")
+        elif record['seconds'] > old['seconds'] * (1 + tolerance) and record['seconds'] - old['seconds'] > noise:
+            regressions.append(f"{name}: {old['seconds']:.4f}s -> {record['seconds']:.4f}s")
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Times the tpp, Jams and FPJ solvers phase by phase.')
+    parser.add_argument('--profile', choices=PROFILES, default='quick')
+    parser.add_argument('--sizes', type=int, nargs='+', help='overrides the sizes of the profile')
+    parser.add_argument('--implementations', nargs='+', choices=IMPLEMENTATIONS, default=list(IMPLEMENTATIONS))
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=KINDS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--initial-method', default='north_west_corner')
+    parser.add_argument('--pricing', default='dantzig')
+    parser.add_argument('--budget', type=float, default=60.0, help='seconds per solve')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--noise', type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    records = run(args.sizes or PROFILES[args.profile], args.implementations, args.kinds,
+                  args.seed, args.initial_method, args.pricing, args.budget)
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'options': {'initial_method': args.initial_method, 'pricing': args.pricing, 'budget': args.budget},
+        'records': records,
+    }
+    with open(args.baseline if args.save_baseline else args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline['options'] != report['options']:
+        print('Baseline was run with other options, not comparing')
+        return 0
+    regressions = compare(records, baseline['records'], args.tolerance, args.noise)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,6 @@
-from .app import Application
+import sys
+from .cli import main
 
 
 if __name__ == '__main__':
-    Application().run()
+    sys.exit(main())
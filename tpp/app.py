@@ -1,8 +1,18 @@
 import os
+import time
 import numpy as np
 import pprint
-from .logics import Logics
-from typing import List, Optional, Tuple
+from .assignment import get_assignment_bfs, is_assignment
+from .cache import SolutionCache
+from .instrumentation import SolverStats
+from .logics import Logics, SparseCosts
+from .multilevel import get_multilevel_bfs
+from .network_simplex import NetworkSimplex
+from .presolve import Presolve
+from .pricing import get_pricing_rule
+from .result import SolverResult
+from .shortest_path import SuccessiveShortestPath
+from typing import Callable, List, Optional
 
 
 class Application:
@@ -11,10 +21,14 @@ class Application:
 
     Attributes:
     LOGIC_HANDLER (Logics): An instance of the Logics class for handling transportation problem logic.
+    cache (Optional[SolutionCache]): Cache of optimal results, None to always solve.
     """
 
     LOGIC_HANDLER: Logics = Logics()
 
+    def __init__(self, cache: Optional[SolutionCache] = None) -> None:
+        self.cache = cache
+
     def run(self) -> None:
         """
         Runs the application to solve a transportation problem.
@@ -26,12 +40,14 @@ class Application:
         demand: List[int] = self.get_input("Enter demands: ")
         costs: List[List[int]] = self.get_matrix_input("Enter costs: ")
 
-        solution: np.ndarray = self.transportation_simplex_method(
+        result: SolverResult = self.transportation_simplex_method(
             supply, demand, costs)
 
-        print(solution)
+        print(result.solution)
+        if result.status != SolverResult.OPTIMAL:
+            print(f"Stopped early ({result.status}), best solution so far")
         print(
-            f"Total Cost: {self.LOGIC_HANDLER.get_total_cost(costs, solution)}")
+            f"Total Cost: {self.LOGIC_HANDLER.get_total_cost(costs, result.solution)}")
 
     def clear_console(self) -> None:
         """
@@ -65,38 +81,236 @@ class Application:
         rows: str = input(message)
         return [list(map(int, row.strip().split(','))) for row in rows.split(';')]
 
-    def transportation_simplex_method(self, supply: List[int], demand: List[int], costs: List[List[int]], penalties: Optional[List[int]] = None) -> np.ndarray:
+    def transportation_simplex_method(self, supply: List[int], demand: List[int], costs: List[List[int]] | np.ndarray | SparseCosts, penalties: Optional[List[int]] = None, initial_method: str = 'north_west_corner', pricing: str = 'dantzig', max_iterations: Optional[int] = None, time_limit: Optional[float] = None, stats: Optional[SolverStats] = None, callback: Optional[Callable] = None, engine: str = 'network_simplex', presolve: bool = False, workers: Optional[int] = 1) -> SolverResult:
         """
         Solves a transportation problem using the simplex method.
 
+        Assignment problems (square dense costs, every supply and demand 1)
+        are solved by the Hungarian method instead of the initial method,
+        whose start would be badly degenerate, and the simplex engine only
+        confirms the optimal basis it returns.
+
+        The 'successive_shortest_path' engine ships the supply along shortest
+        paths instead and hands its flows to the simplex engine as the
+        starting basis, so the result has the same form and its basis can be
+        used by resolve. Its augmentations count as iterations and as the
+        initial_solution phase, and the callback only sees the few simplex
+        pivots done after them. The limits are shared by both steps.
+
+        With presolve, empty rows and columns are dropped, forced shipments
+        fixed and rows or columns with identical costs merged first (see
+        Presolve). The solution, costs and dummy flows of the result are
+        those of the original problem, while its basis, potentials and
+        balanced problem are those of the reduced one.
+
+        Sparse routes that split into independent regions are solved one
+        region at a time on workers processes (see batch.solve_components),
+        each region with its own limits, and the bases are stitched into one.
+        With stats or a callback the whole problem goes to one engine, so they
+        see every pivot.
+
+        With a cache, optimal results are stored under the balanced problem,
+        the cost matrix shape, the engine, the initial method and the pricing
+        rule's class and parameters (see PricingRule.get_key). The
+        limits are not part of the key: a result that reached optimality did
+        not depend on them, and results stopped by a limit are not stored.
+        A cache hit skips the solve, so stats and callback are left untouched.
+
         Args:
         supply (List[int]): List of supply values.
         demand (List[int]): List of demand values.
-        costs (List[List[int]]): Cost matrix.
+        costs (List[List[int]] | np.ndarray | SparseCosts): Cost matrix, possibly a numpy.memmap, or the routes when most pairs cannot ship.
+        penalties (Optional[List[int]], optional): List of penalties. Defaults to None.
+        initial_method (str, optional): 'north_west_corner', 'least_cost', 'vogel_approximation' or 'multilevel' (dense costs only, see get_multilevel_bfs). Defaults to 'north_west_corner'.
+        pricing (str, optional): 'dantzig', 'first_improving', 'block', 'candidate_list' or 'bland'. Defaults to 'dantzig'.
+        max_iterations (Optional[int], optional): Maximum number of pivots. Defaults to None.
+        time_limit (Optional[float], optional): Maximum number of seconds spent pivoting. Defaults to None.
+        stats (Optional[SolverStats], optional): Phase timers and counters to fill in. Defaults to None.
+        callback (Optional[Callable], optional): Called after every pivot as callback(iteration, objective, ev_position, leaving_position). Defaults to None.
+        engine (str, optional): 'network_simplex' or 'successive_shortest_path'. Defaults to 'network_simplex'.
+        presolve (bool, optional): Shrink the problem before solving it. Dense costs are then read whole. Defaults to False.
+        workers (Optional[int], optional): Worker processes for the regions of sparse routes, None for os.cpu_count(). Defaults to 1, in this process.
+
+        Raises:
+        Exception: When sparse routes cannot carry the supply to the demand, the engine is unknown, or the multilevel start gets sparse costs.
+
+        Returns:
+        SolverResult: The status, the solution (a matrix, or the flow on every route for sparse costs and on every used cell for memory-mapped costs) and the basis it came from.
+        """
+        if engine not in ['network_simplex', 'successive_shortest_path']:
+            raise Exception(f'Unknown engine: {engine}')
+        if presolve:
+            presolved = Presolve(supply, demand, costs, penalties)
+            result = None
+            if presolved.supply and presolved.demand:
+                result = self.transportation_simplex_method(
+                    presolved.supply, presolved.demand, presolved.costs, presolved.penalties, initial_method, pricing,
+                    max_iterations, time_limit, stats, callback, engine, workers=workers)
+            return presolved.postsolve(result)
+        balanced_supply, balanced_demand, balanced_costs = self.LOGIC_HANDLER.get_balanced_tp(
+            supply, demand, costs, penalties
+        )
+        if self.cache is not None:
+            key = self.cache.get_key(
+                balanced_supply, balanced_demand, balanced_costs, initial_method=initial_method, pricing=get_pricing_rule(pricing).get_key(),
+                shape=costs.shape if isinstance(costs, SparseCosts) else (len(costs), len(costs[0])), engine=engine)
+            result = self.cache.get(key)
+            if result is not None:
+                return result
+
+        if isinstance(costs, SparseCosts) and stats is None and callback is None:
+            components = costs.get_components()
+            if max(components[0].max(initial=0), components[1].max(initial=0)) > 0:
+                # batch builds on this module, so it is only imported once it is needed.
+                from .batch import solve_components
+                result = solve_components(supply, demand, costs, penalties, workers, components,
+                                          initial_method=initial_method, pricing=pricing, max_iterations=max_iterations,
+                                          time_limit=time_limit, engine=engine)
+                if self.cache is not None and result.status == SolverResult.OPTIMAL:
+                    self.cache.put(key, result)
+                return result
+
+        started = time.perf_counter()
+        if engine == 'successive_shortest_path':
+            shortest_path = SuccessiveShortestPath(balanced_costs, balanced_supply, balanced_demand)
+            shortest_path.solve(max_iterations, time_limit)
+            bfs = shortest_path.get_bfs()
+        elif is_assignment(balanced_supply, balanced_demand, balanced_costs):
+            bfs = get_assignment_bfs(balanced_costs)
+        elif initial_method == 'multilevel':
+            bfs = get_multilevel_bfs(balanced_supply, balanced_demand, balanced_costs)
+        else:
+            bfs = self.LOGIC_HANDLER.get_initial_solution(balanced_supply, balanced_demand, balanced_costs, initial_method)
+        if stats is not None:
+            stats.add_time('initial_solution', time.perf_counter() - started)
+        simplex = NetworkSimplex(balanced_costs, bfs, pricing, stats, callback)
+        if engine == 'successive_shortest_path':
+            simplex.iterations = shortest_path.iterations
+            if shortest_path.status != SolverResult.OPTIMAL:
+                simplex.status = shortest_path.status
+            else:
+                simplex.solve(None if max_iterations is None else max_iterations - simplex.iterations,
+                              None if time_limit is None else max(0, time_limit - (time.perf_counter() - started)))
+        else:
+            simplex.solve(max_iterations, time_limit)
+        result = self.get_result(simplex, costs, balanced_supply, balanced_demand)
+        if self.cache is not None and result.status == SolverResult.OPTIMAL:
+            self.cache.put(key, result)
+        return result
+
+    def resolve(self, previous_result: SolverResult, supply: List[int], demand: List[int], costs: List[List[int]] | SparseCosts, penalties: Optional[List[int]] = None, initial_method: str = 'north_west_corner', pricing: str = 'dantzig', max_iterations: Optional[int] = None, time_limit: Optional[float] = None) -> SolverResult:
+        """
+        Re-optimizes a changed problem starting from the basis of a previous result.
+
+        The flows of the previous basis are recomputed for the new quantities
+        and any negative flow is repaired with dual simplex pivots. When the
+        previous result was optimal, only the rows and columns whose potentials
+        moved and the cells whose costs changed are priced first, so an
+        unchanged optimal basis is confirmed without a full pricing pass.
+        Problems whose balanced shape changed, or whose repair does not finish
+        within rows + columns pivots, are solved from scratch.
+
+        Args:
+        previous_result (SolverResult): Result of an earlier solve of a similar problem.
+        supply (List[int]): List of new supply values.
+        demand (List[int]): List of new demand values.
+        costs (List[List[int]] | SparseCosts): New cost matrix or routes.
         penalties (Optional[List[int]], optional): List of penalties. Defaults to None.
+        initial_method (str, optional): Method used when the problem is solved from scratch. Defaults to 'north_west_corner'.
+        pricing (str, optional): 'dantzig', 'first_improving', 'block', 'candidate_list' or 'bland'. Defaults to 'dantzig'.
+        max_iterations (Optional[int], optional): Maximum number of pivots. Defaults to None.
+        time_limit (Optional[float], optional): Maximum number of seconds spent pivoting. Defaults to None.
+
+        Raises:
+        Exception: When sparse routes cannot carry the supply to the demand.
 
         Returns:
-        np.ndarray: The solution matrix.
+        SolverResult: The re-optimized result, with iterations counting the repair and simplex pivots.
         """
         balanced_supply, balanced_demand, balanced_costs = self.LOGIC_HANDLER.get_balanced_tp(
-            supply, demand, costs
+            supply, demand, costs, penalties
         )
+        shape = balanced_costs.shape if isinstance(balanced_costs, SparseCosts) else (
+            len(balanced_costs), len(balanced_costs[0]))
+        if previous_result.costs is None or previous_result.costs.shape != shape:
+            return self.transportation_simplex_method(
+                supply, demand, costs, penalties, initial_method, pricing, max_iterations, time_limit)
+
+        engine = NetworkSimplex(balanced_costs, previous_result.basis, pricing)
+        if not engine.repair(balanced_supply, balanced_demand):
+            return self.transportation_simplex_method(
+                supply, demand, costs, penalties, initial_method, pricing, max_iterations, time_limit)
+
+        changed = self.get_changed_cells(previous_result.costs, engine.costs)
+        if previous_result.status == SolverResult.OPTIMAL and changed is not None and not engine.has_entering_cell(
+                np.flatnonzero(engine.vs != previous_result.vs), np.flatnonzero(engine.ws != previous_result.ws), changed):
+            engine.status = SolverResult.OPTIMAL
+            engine.check_feasible()
+        else:
+            engine.solve(max_iterations, time_limit)
+        return self.get_result(engine, costs, balanced_supply, balanced_demand)
+
+    def get_changed_cells(self, previous_costs: np.ndarray | SparseCosts, costs: np.ndarray | SparseCosts) -> Optional[np.ndarray]:
+        """
+        Finds the cells whose cost changed between two balanced problems of the same shape.
+
+        Args:
+        previous_costs (np.ndarray | SparseCosts): Previous balanced costs.
+        costs (np.ndarray | SparseCosts): New balanced costs.
+
+        Returns:
+        Optional[np.ndarray]: Flat indices of the changed cells, or None when the routes themselves changed.
+        """
+        if isinstance(costs, SparseCosts):
+            if not isinstance(previous_costs, SparseCosts) or not np.array_equal(previous_costs.indptr, costs.indptr) or \
+                    not np.array_equal(previous_costs.indices, costs.indices):
+                return None
+            return np.flatnonzero(previous_costs.data != costs.data)
+        if isinstance(previous_costs, SparseCosts):
+            return None
+        return np.flatnonzero(np.asarray(previous_costs) != np.asarray(costs))
+
+    def get_result(self, engine: NetworkSimplex, costs: List[List[int]] | SparseCosts, balanced_supply: List[int], balanced_demand: List[int]) -> SolverResult:
+        """
+        Builds the result of a solved engine.
+
+        Args:
+        engine (NetworkSimplex): The solved engine.
+        costs (List[List[int]] | SparseCosts): Cost matrix or routes as given by the user.
+        balanced_supply (List[int]): Balanced supply values.
+        balanced_demand (List[int]): Balanced demand values.
+
+        Returns:
+        SolverResult: The status, the solution and the basis it came from.
+        """
+        rows, columns = costs.shape if isinstance(costs, (SparseCosts, np.ndarray)) else (len(costs), len(costs[0]))
+        cells = []
+        total_cost = penalty_cost = 0
+        unmet_demand = np.zeros(columns) if engine.rows > rows else None
+        unused_supply = np.zeros(rows) if engine.columns > columns else None
+        for (i, j), v in engine.basis:
+            if i == rows:
+                unmet_demand[j] += v
+                penalty_cost += engine.get_cost((i, j)).item() * v
+            elif j == columns:
+                unused_supply[i] += v
+            elif v and (not isinstance(costs, SparseCosts) or costs.find(i, j) >= 0):
+                cells.append((i, j, v))
+                total_cost += engine.get_cost((i, j)).item() * v
+
+        if isinstance(costs, SparseCosts):
+            flows = np.zeros(costs.nnz)
+            for i, j, v in cells:
+                flows[costs.find(i, j)] = v
+            solution = SparseCosts(costs.shape, costs.indptr, costs.indices, flows)
+        elif isinstance(costs, np.memmap):
+            solution = SparseCosts.from_coo(costs.shape, [i for i, _, _ in cells], [j for _, j, _ in cells],
+                                            np.array([v for _, _, v in cells], dtype=np.float64))
+        else:
+            solution: np.ndarray = np.zeros((rows, columns))
+            for i, j, v in cells:
+                solution[i][j] = v
 
-        def inner(bfs: List[Tuple[Tuple[int, int], int]]) -> List[Tuple[Tuple[int, int], int]]:
-            vs, ws = self.LOGIC_HANDLER.get_vs_and_ws(bfs, balanced_costs)
-            cs = self.LOGIC_HANDLER.get_cs(bfs, balanced_costs, vs, ws)
-            if self.LOGIC_HANDLER.can_be_improved(cs):
-                ev_position = self.LOGIC_HANDLER.get_entering_variable_position(
-                    ws)
-                loop = self.LOGIC_HANDLER.get_loop(
-                    [p for p, v in bfs], ev_position)
-                return inner(self.LOGIC_HANDLER.loop_pivoting(bfs, loop))
-            return bfs
-
-        basic_variables = inner(self.LOGIC_HANDLER.north_west_corner(
-            balanced_supply, balanced_demand))
-        solution: np.ndarray = np.zeros((len(costs), len(costs[0])))
-        for (i, j), v in basic_variables:
-            solution[i][j] = v
-
-        return solution
+        return SolverResult(engine.status, solution, engine.basis, total_cost, engine.iterations,
+                            balanced_supply, balanced_demand, engine.costs, engine.vs, engine.ws,
+                            penalty_cost, unmet_demand, unused_supply)
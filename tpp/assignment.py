@@ -0,0 +1,120 @@
+import numpy as np
+from .logics import SparseCosts
+
+
+def is_assignment(supply: list[int], demand: list[int], costs: list[list[int]] | np.ndarray | SparseCosts) -> bool:
+    """
+    Tells whether a balanced problem is an assignment problem.
+
+    Args:
+    supply (list[int]): Balanced supply values.
+    demand (list[int]): Balanced demand values.
+    costs (list[list[int]] | np.ndarray | SparseCosts): Balanced cost matrix or routes.
+
+    Returns:
+    bool: True for dense square costs with every supply and demand 1.
+    """
+    return (not isinstance(costs, SparseCosts) and len(supply) == len(demand) > 0 and
+            all(s == 1 for s in supply) and all(d == 1 for d in demand))
+
+
+def solve_assignment(costs: list[list[int]] | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Solves an assignment problem with the Hungarian method in O(n³).
+
+    Rows are added one at a time, each by a shortest augmenting path found
+    with Dijkstra over the reduced costs. Every step of the search relaxes
+    all columns in one vector operation, so the Python loop runs O(n) times
+    per row.
+
+    Args:
+    costs (list[list[int]] | np.ndarray): Square cost matrix, possibly a numpy.memmap.
+
+    Returns:
+    tuple[np.ndarray, np.ndarray, np.ndarray]: Column of every row, and row and column potentials with u[i] + v[j] <= costs[i][j], equal on the assigned cells.
+    """
+    costs = np.asarray(costs)
+    n = costs.shape[0]
+    # Index 0 is a virtual column that holds the row being added.
+    u = np.zeros(n + 1)
+    v = np.zeros(n + 1)
+    owners = np.zeros(n + 1, dtype=np.intp)
+    way = np.zeros(n + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        owners[0] = i
+        j0 = 0
+        distances = np.full(n + 1, np.inf)
+        used = np.zeros(n + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owners[j0]
+            candidates = costs[i0 - 1] - u[i0] - v[1:]
+            closer = ~used[1:] & (candidates < distances[1:])
+            distances[1:][closer] = candidates[closer]
+            way[1:][closer] = j0
+            open_distances = np.where(used[1:], np.inf, distances[1:])
+            j1 = int(open_distances.argmin()) + 1
+            delta = open_distances[j1 - 1]
+            u[owners[used]] += delta
+            v[used] -= delta
+            distances[~used] -= delta
+            j0 = j1
+            if owners[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owners[j0] = owners[j1]
+            j0 = j1
+    columns = np.empty(n, dtype=np.intp)
+    columns[owners[1:] - 1] = np.arange(n)
+    return columns, u[1:], v[1:]
+
+
+def get_assignment_bfs(costs: list[list[int]] | np.ndarray) -> list[tuple[tuple[int, int], int]]:
+    """
+    Solves an assignment problem and returns an optimal basis for it.
+
+    The n assigned cells are joined into a spanning tree with n - 1
+    zero-flow cells, attached like Prim's algorithm: the column of least
+    slack to the tree comes next, and the potentials of the tree are shifted
+    by that slack so the new cell is tight. Every basic cell is then tight,
+    so the basis is dual feasible and the simplex engine has nothing to
+    pivot.
+
+    Args:
+    costs (list[list[int]] | np.ndarray): Square cost matrix, possibly a numpy.memmap.
+
+    Returns:
+    list[tuple[tuple[int, int], int]]: 2n - 1 cells, the assigned ones with flow 1.
+    """
+    costs = np.asarray(costs)
+    columns, u, v = solve_assignment(costs)
+    n = columns.size
+    owners = np.empty(n, dtype=np.intp)
+    owners[columns] = np.arange(n)
+    bfs = [((i, int(j)), 1) for i, j in enumerate(columns)]
+    reached_rows = np.zeros(n, dtype=bool)
+    reached_columns = np.zeros(n, dtype=bool)
+    slacks = np.full(n, np.inf)
+    nearest = np.zeros(n, dtype=np.intp)
+
+    def reach(i: int) -> None:
+        reached_rows[i] = True
+        reached_columns[columns[i]] = True
+        slacks[columns[i]] = np.inf
+        row_slacks = np.where(reached_columns, np.inf, costs[i] - u[i] - v)
+        closer = row_slacks < slacks
+        slacks[closer] = row_slacks[closer]
+        nearest[closer] = i
+
+    reach(0)
+    for _ in range(n - 1):
+        j = int(slacks.argmin())
+        delta = slacks[j]
+        if delta > 0:
+            u[reached_rows] += delta
+            v[reached_columns] -= delta
+            slacks[~reached_columns] -= delta
+        bfs.append(((int(nearest[j]), j), 0))
+        reach(int(owners[j]))
+    return sorted(bfs)
@@ -0,0 +1,241 @@
+import copy
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .app import Application
+from .logics import SparseCosts
+from .network_simplex import NetworkSimplex
+from .result import SolverResult
+
+
+def pack_problem(problem: tuple) -> tuple:
+    """
+    Packs a problem into NumPy arrays, which pickle as flat buffers.
+
+    Args:
+    problem (tuple): (supply, demand, costs) or (supply, demand, costs, penalties).
+
+    Returns:
+    tuple: Supply, demand, costs and penalties (None when not given) as arrays, sparse costs unchanged.
+    """
+    supply, demand, costs, *rest = problem
+    penalties = rest[0] if rest else None
+    return (np.asarray(supply), np.asarray(demand),
+            costs if isinstance(costs, SparseCosts) else np.asarray(costs),
+            None if penalties is None else np.asarray(penalties))
+
+
+def get_cells(packed: tuple) -> int:
+    """
+    Returns the size of a packed problem in cells, used to balance the chunks.
+
+    Args:
+    packed (tuple): A packed problem.
+
+    Returns:
+    int: Number of cost cells or routes.
+    """
+    costs = packed[2]
+    return costs.nnz if isinstance(costs, SparseCosts) else costs.size
+
+
+def get_chunks(packed_problems: List[tuple], chunk_cells: int) -> List[List[int]]:
+    """
+    Groups consecutive problems into chunks of at most chunk_cells cells.
+
+    A chunk is closed before the next problem would take it over the limit,
+    so problems larger than the limit end up alone in their chunk, and tiny
+    ones share a chunk so a single dispatch carries many of them.
+
+    Args:
+    packed_problems (List[tuple]): Packed problems.
+    chunk_cells (int): Cells a chunk may hold, unless it holds a single problem.
+
+    Returns:
+    List[List[int]]: Indices of the problems in every chunk.
+    """
+    chunks = []
+    chunk = []
+    cells = 0
+    for index, packed in enumerate(packed_problems):
+        problem_cells = get_cells(packed)
+        if chunk and cells + problem_cells > chunk_cells:
+            chunks.append(chunk)
+            chunk = []
+            cells = 0
+        chunk.append(index)
+        cells += problem_cells
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def solve_chunk(chunk: List[Tuple[int, tuple]], options: dict) -> List[Tuple[int, SolverResult]]:
+    """
+    Solves a chunk of packed problems, in a worker process or in-process.
+
+    Args:
+    chunk (List[Tuple[int, tuple]]): Index and packed problem of every problem in the chunk.
+    options (dict): Keyword arguments for Application.transportation_simplex_method.
+
+    Returns:
+    List[Tuple[int, SolverResult]]: Index and result of every problem.
+    """
+    app = Application()
+    results = []
+    for index, (supply, demand, costs, penalties) in chunk:
+        # A pricing rule keeps state between pivots, so every problem gets its own copy.
+        results.append((index, app.transportation_simplex_method(
+            supply, demand, costs, penalties, **copy.deepcopy(options))))
+    return results
+
+
+def solve_many(problems: Iterable[tuple], workers: Optional[int] = None, ordered: bool = True, chunk_cells: int = 50000, initial_method: str = 'north_west_corner', pricing: str = 'dantzig', max_iterations: Optional[int] = None, time_limit: Optional[float] = None, engine: str = 'network_simplex', presolve: bool = False) -> Iterator[Tuple[int, SolverResult]]:
+    """
+    Solves many independent transportation problems on a process pool.
+
+    Problems are packed into NumPy arrays and grouped into chunks of about
+    chunk_cells cells, and every chunk is one task of a ProcessPoolExecutor.
+    An exception raised while solving a problem is raised again when its
+    result is reached.
+
+    Args:
+    problems (Iterable[tuple]): (supply, demand, costs) or (supply, demand, costs, penalties) tuples, costs dense or SparseCosts.
+    workers (Optional[int], optional): Number of worker processes, 1 solves in this process. Defaults to None, os.cpu_count().
+    ordered (bool, optional): Yield in submission order, otherwise as chunks complete. Defaults to True.
+    chunk_cells (int, optional): Cells per chunk at most, a larger problem is sent on its own and 1 sends every problem on its own. Defaults to 50000.
+    initial_method (str, optional): 'north_west_corner', 'least_cost', 'vogel_approximation' or 'multilevel'. Defaults to 'north_west_corner'.
+    pricing (str, optional): 'dantzig', 'first_improving', 'block', 'candidate_list' or 'bland'. Defaults to 'dantzig'.
+    max_iterations (Optional[int], optional): Maximum number of pivots per problem. Defaults to None.
+    time_limit (Optional[float], optional): Maximum number of seconds spent pivoting per problem. Defaults to None.
+    engine (str, optional): 'network_simplex' or 'successive_shortest_path'. Defaults to 'network_simplex'.
+    presolve (bool, optional): Shrink every problem before solving it, see Presolve. Defaults to False.
+
+    Returns:
+    Iterator[Tuple[int, SolverResult]]: Index of the problem in problems and its result.
+    """
+    options = {'initial_method': initial_method, 'pricing': pricing,
+               'max_iterations': max_iterations, 'time_limit': time_limit, 'engine': engine,
+               'presolve': presolve}
+    packed_problems = [pack_problem(problem) for problem in problems]
+    workers = os.cpu_count() if workers is None else workers
+    if workers > 1:
+        # Keep at least four chunks per worker so the pool stays balanced.
+        chunk_cells = max(1, min(chunk_cells, sum(map(get_cells, packed_problems)) // (4 * workers)))
+    chunks = [[(index, packed_problems[index]) for index in chunk]
+              for chunk in get_chunks(packed_problems, chunk_cells)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from solve_chunk(chunk, options)
+        return
+
+    executor = ProcessPoolExecutor(min(workers, len(chunks)))
+    try:
+        futures = [executor.submit(solve_chunk, chunk, options) for chunk in chunks]
+        for future in (futures if ordered else as_completed(futures)):
+            yield from future.result()
+    finally:
+        # Chunks not started yet are dropped when the caller stops early.
+        executor.shutdown(cancel_futures=True)
+
+
+def solve_components(supply: List[int], demand: List[int], costs: SparseCosts, penalties: Optional[List[int]] = None, workers: Optional[int] = None, components: Optional[Tuple[np.ndarray, np.ndarray]] = None, **options) -> SolverResult:
+    """
+    Solves a problem whose routes split into independent regions one region at a time, on a process pool.
+
+    Every connected component of the routes is balanced on its own and the
+    components are solved by solve_many. Balancing the whole problem only
+    adds a dummy row when supply is short, or a dummy column when it is left
+    over, so a component that is short while the whole problem has supply
+    left over (or the other way round) cannot be served. Rows or columns
+    without routes ship nothing: their supply is unused and their demand
+    unmet.
+
+    The bases of the components are stitched into a basis of the whole
+    balanced problem: their dummy rows or columns become the one of the
+    whole problem, and the network simplex engine links the remaining
+    trees with zero-flow cells and certifies the stitched basis, usually
+    without a pivot. The result therefore has the basis and potentials that
+    Application.resolve needs.
+
+    Args:
+    supply (List[int]): List of supply values.
+    demand (List[int]): List of demand values.
+    costs (SparseCosts): Routes.
+    penalties (Optional[List[int]], optional): List of penalties. Defaults to None.
+    workers (Optional[int], optional): Worker processes, see solve_many. Defaults to None.
+    components (Optional[Tuple[np.ndarray, np.ndarray]], optional): Component of every row and column, see SparseCosts.get_components. Defaults to None, computed here.
+    **options: Other keyword arguments of solve_many, except presolve, whose bases belong to the reduced problems.
+
+    Raises:
+    Exception: When a component cannot be balanced the way the whole problem is, or is infeasible, or presolve is asked for.
+
+    Returns:
+    SolverResult: The status of the worst component, the flow on every route, the costs and the dummy flows of the whole problem, and its basis.
+    """
+    if options.get('presolve'):
+        raise Exception('Components cannot be presolved')
+    balanced_supply, balanced_demand, balanced_costs = Application.LOGIC_HANDLER.get_balanced_tp(
+        supply, demand, costs, penalties)
+    supply = np.asarray(supply)
+    demand = np.asarray(demand)
+    penalties = None if penalties is None else np.asarray(penalties)
+    m, n = costs.shape
+    row_labels, column_labels = costs.get_components() if components is None else components
+    count = int(max(row_labels.max(initial=-1), column_labels.max(initial=-1))) + 1
+    surplus = np.sign(supply.sum() - demand.sum())
+
+    row_order = np.argsort(row_labels, kind='stable')
+    column_order = np.argsort(column_labels, kind='stable')
+    arc_order = np.argsort(row_labels[costs.arc_rows], kind='stable')
+    row_bounds = np.searchsorted(row_labels[row_order], np.arange(count + 1))
+    column_bounds = np.searchsorted(column_labels[column_order], np.arange(count + 1))
+    arc_bounds = np.searchsorted(row_labels[costs.arc_rows[arc_order]], np.arange(count + 1))
+    # Rank of every row and column inside its component, which keeps their order.
+    local = np.empty(m + n, dtype=np.intp)
+    local[row_order] = np.arange(m) - row_bounds[row_labels[row_order]]
+    local[m + column_order] = np.arange(n) - column_bounds[column_labels[column_order]]
+
+    bfs = []
+    problems = []
+    parts = []
+    for k in range(count):
+        rows = row_order[row_bounds[k]:row_bounds[k + 1]]
+        columns = column_order[column_bounds[k]:column_bounds[k + 1]]
+        difference = supply[rows].sum() - demand[columns].sum()
+        if difference and np.sign(difference) != surplus:
+            raise Exception(
+                f'Problem is infeasible: rows {rows.tolist()} and columns {columns.tolist()} only reach each other, '
+                f'with supply {supply[rows].sum()} and demand {demand[columns].sum()}')
+        if not rows.size or not columns.size:
+            if surplus > 0:
+                bfs.extend(((int(i), n), supply[i].item()) for i in rows)
+            if surplus < 0:
+                bfs.extend(((m, int(j)), demand[j].item()) for j in columns)
+            continue
+        arcs = arc_order[arc_bounds[k]:arc_bounds[k + 1]]
+        component_costs = SparseCosts.from_coo((rows.size, columns.size), local[costs.arc_rows[arcs]],
+                                                local[m + costs.indices[arcs]], costs.data[arcs])
+        problems.append((supply[rows], demand[columns], component_costs,
+                         None if penalties is None else penalties[columns]))
+        # The dummy row or column of a component maps to the one of the whole problem.
+        parts.append((np.append(rows, m), np.append(columns, n)))
+
+    status = SolverResult.OPTIMAL
+    iterations = 0
+    for index, result in solve_many(problems, workers=workers, **options):
+        rows, columns = parts[index]
+        bfs.extend(((int(rows[i]), int(columns[j])), v) for (i, j), v in result.basis)
+        iterations += result.iterations
+        if result.status != SolverResult.OPTIMAL:
+            status = result.status
+
+    engine = NetworkSimplex(balanced_costs, bfs, copy.deepcopy(options.get('pricing', 'dantzig')))
+    if status == SolverResult.OPTIMAL:
+        engine.solve()
+    else:
+        engine.status = status
+    engine.iterations += iterations
+    return Application().get_result(engine, costs, balanced_supply, balanced_demand)
@@ -0,0 +1,189 @@
+import hashlib
+import pickle
+import sqlite3
+import time
+import numpy as np
+from collections import OrderedDict
+from .logics import PaddedCosts, SparseCosts
+
+
+class SolutionCache:
+    """
+    Cache of solver results keyed on a hash of the balanced problem and the solver options.
+
+    Results live in an in-memory LRU of at most maxsize entries. With a path,
+    results also go to a sqlite file that keeps the max_disk_entries most
+    recently used ones and survives restarts; a disk hit is copied back into
+    memory. Results are returned as stored, not copied, so treat them as
+    read-only.
+
+    Attributes:
+    maxsize (int): Entries kept in memory.
+    path (str | None): sqlite file of the disk tier, None without one.
+    max_disk_entries (int): Entries kept on disk.
+    connection (sqlite3.Connection | None): Connection to the disk tier.
+    entries (OrderedDict): In-memory entries, least recently used first.
+    hits (int): Lookups answered from memory.
+    disk_hits (int): Lookups answered from disk.
+    misses (int): Lookups not answered.
+    BLOCK_CELLS (int): Cells of a dense cost matrix hashed at once.
+    """
+
+    BLOCK_CELLS: int = 1 << 20
+
+    def __init__(self, maxsize: int = 128, path: str = None, max_disk_entries: int = 10000) -> None:
+        self.maxsize = maxsize
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.connection = None
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, data BLOB, used REAL)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+            self.connection.commit()
+
+    @staticmethod
+    def get_key(supply: list[int], demand: list[int], costs: list[list[int]] | np.ndarray | PaddedCosts | SparseCosts, **options) -> str:
+        """
+        Hashes a balanced problem and the solver options.
+
+        Integer inputs are hashed as int64 and others as float64, so the key
+        does not depend on whether the values came as lists or arrays. Dense
+        arrays, memmaps included, are hashed in blocks of about BLOCK_CELLS
+        cells, and padded costs as their original matrix and dummy line, so the
+        cost matrix is never copied whole.
+
+        Args:
+        supply (list[int]): Balanced supply values.
+        demand (list[int]): Balanced demand values.
+        costs (list[list[int]] | np.ndarray | PaddedCosts | SparseCosts): Balanced cost matrix or routes.
+        **options: Solver options that change the result.
+
+        Returns:
+        str: Hex digest of the problem.
+        """
+        digest = hashlib.sha256()
+
+        def add(values) -> None:
+            if not isinstance(values, np.ndarray):
+                values = np.asarray(values)
+            dtype = np.int64 if values.dtype.kind in 'biu' else np.float64
+            digest.update(repr(values.shape).encode())
+            block_rows = max(1, SolutionCache.BLOCK_CELLS // max(1, values[0].size)) if values.ndim > 1 else len(values)
+            for start in range(0, len(values), max(1, block_rows)):
+                block = values[start:start + block_rows].astype(dtype, copy=False)
+                digest.update(np.ascontiguousarray(block).tobytes())
+
+        add(supply)
+        add(demand)
+        if isinstance(costs, SparseCosts):
+            digest.update(repr(costs.shape).encode())
+            add(costs.indptr)
+            add(costs.indices)
+            add(costs.data)
+        elif isinstance(costs, PaddedCosts):
+            digest.update(repr(costs.shape).encode())
+            add(costs.costs)
+            for extra in [costs.row, costs.column]:
+                digest.update(b'-' if extra is None else b'+')
+                if extra is not None:
+                    add(extra)
+        else:
+            add(costs)
+        digest.update(repr(sorted(options.items())).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """
+        Looks a result up, in memory first and then on disk.
+
+        Args:
+        key (str): Key from get_key.
+
+        Returns:
+        The stored result, or None on a miss.
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.connection is not None:
+            row = self.connection.execute('SELECT data FROM results WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self.connection.execute('UPDATE results SET used = ? WHERE key = ?', (time.time(), key))
+                self.connection.commit()
+                value = pickle.loads(row[0])
+                self.remember(key, value)
+                self.disk_hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value) -> None:
+        """
+        Stores a result in memory and, with a disk tier, on disk.
+
+        Args:
+        key (str): Key from get_key.
+        value: Result to store.
+        """
+        self.remember(key, value)
+        if self.connection is not None:
+            self.connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                                    (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time()))
+            self.connection.execute(
+                'DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY used DESC LIMIT ?)',
+                (self.max_disk_entries,))
+            self.connection.commit()
+
+    def remember(self, key: str, value) -> None:
+        """
+        Stores a result in memory, evicting the least recently used entry when full.
+
+        Args:
+        key (str): Key from get_key.
+        value: Result to store.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """
+        Returns the hit and miss counters.
+
+        Returns:
+        dict: hits, disk_hits, misses, hit_rate and the number of entries in memory.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+        }
+
+    def clear(self) -> None:
+        """
+        Drops every entry from both tiers and resets the counters.
+        """
+        self.entries.clear()
+        if self.connection is not None:
+            self.connection.execute('DELETE FROM results')
+            self.connection.commit()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def close(self) -> None:
+        """
+        Closes the disk tier.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
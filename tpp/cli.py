@@ -0,0 +1,347 @@
+import argparse
+import io
+import itertools
+import json
+import os
+import sys
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+from .app import Application
+from .batch import solve_many
+from .logics import SparseCosts
+from .result import SolverResult
+
+FORMATS: List[str] = ['json', 'csv', 'npy']
+PROBLEM_EXTENSIONS: List[str] = ['.json', '.npz']
+
+
+def get_whole(values: np.ndarray) -> np.ndarray:
+    """
+    Converts float values to int64 when they are all whole numbers.
+
+    Args:
+    values (np.ndarray): Values read from a file.
+
+    Returns:
+    np.ndarray: The values, as int64 when nothing is lost.
+    """
+    if values.dtype.kind == 'f' and np.all(np.isfinite(values)) and np.array_equal(values, np.trunc(values)):
+        return values.astype(np.int64)
+    return values
+
+
+def read_csv(path: str, chunk_rows: int = 10000) -> np.ndarray:
+    """
+    Reads a comma-separated file of numbers, chunk_rows lines at a time.
+
+    Every chunk is parsed by np.loadtxt, so values are never split and
+    converted one by one in Python. Chunks are read as int64 and fall back
+    to float64 when they hold fractions.
+
+    Args:
+    path (str): CSV file, one matrix row per line, or one line for a vector.
+    chunk_rows (int, optional): Lines parsed at once. Defaults to 10000.
+
+    Returns:
+    np.ndarray: A 2D array of the rows.
+    """
+    chunks = []
+    with open(path) as file:
+        while True:
+            lines = list(itertools.islice(file, chunk_rows))
+            if not lines:
+                break
+            lines = [line for line in lines if line.strip()]
+            if not lines:
+                continue
+            try:
+                chunks.append(np.loadtxt(lines, delimiter=',', dtype=np.int64, ndmin=2))
+            except ValueError:
+                chunks.append(np.loadtxt(lines, delimiter=',', dtype=np.float64, ndmin=2))
+    if not chunks:
+        raise Exception(f'{path} holds no values')
+    return np.concatenate(chunks)
+
+
+def read_array(path: str, chunk_rows: int = 10000) -> np.ndarray:
+    """
+    Reads a vector or matrix from a .csv, .json or .npy file.
+
+    Args:
+    path (str): File to read, its extension gives the format.
+    chunk_rows (int, optional): Lines parsed at once for CSV files. Defaults to 10000.
+
+    Raises:
+    Exception: When the extension is not supported.
+
+    Returns:
+    np.ndarray: The values.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return read_csv(path, chunk_rows)
+    if extension == '.json':
+        with open(path) as file:
+            return get_whole(np.asarray(json.load(file)))
+    if extension == '.npy':
+        # Mapped, so a large cost matrix is paged in by the solver as needed.
+        return np.load(path, mmap_mode='r')
+    raise Exception(f'Unsupported file {path}, expected .csv, .json or .npy')
+
+
+def read_vector(path: str, chunk_rows: int = 10000) -> np.ndarray:
+    """
+    Reads supply, demand or penalties, written as one row or one column.
+
+    Args:
+    path (str): File to read.
+    chunk_rows (int, optional): Lines parsed at once for CSV files. Defaults to 10000.
+
+    Raises:
+    Exception: When the file holds a matrix.
+
+    Returns:
+    np.ndarray: The values as a 1D array.
+    """
+    values = read_array(path, chunk_rows)
+    if values.ndim > 1 and min(values.shape) > 1:
+        raise Exception(f'{path} holds a matrix, expected a single row or column')
+    return values.ravel()
+
+
+def read_problem(path: str) -> tuple:
+    """
+    Reads a whole problem from a .json object or a .npz archive.
+
+    Both hold supply, demand and costs, and optionally penalties.
+
+    Args:
+    path (str): File to read.
+
+    Raises:
+    Exception: When the extension is not supported or a key is missing.
+
+    Returns:
+    tuple: (supply, demand, costs, penalties) as arrays, penalties None when not given.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path) as file:
+            data = json.load(file)
+    elif extension == '.npz':
+        data = np.load(path)
+    else:
+        raise Exception(f'Unsupported problem file {path}, expected .json or .npz')
+    for key in ['supply', 'demand', 'costs']:
+        if key not in data:
+            raise Exception(f'{path} has no {key}')
+    penalties = data['penalties'] if 'penalties' in data else None
+    return (get_whole(np.ravel(data['supply'])), get_whole(np.ravel(data['demand'])),
+            get_whole(np.asarray(data['costs'])), None if penalties is None else get_whole(np.ravel(penalties)))
+
+
+def get_problem_files(directory: str) -> List[str]:
+    """
+    Lists the problem files of a directory in name order.
+
+    Args:
+    directory (str): Directory to scan, not recursively.
+
+    Returns:
+    List[str]: Paths of its .json and .npz files.
+    """
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if os.path.splitext(name)[1].lower() in PROBLEM_EXTENSIONS]
+
+
+def get_solution(result: SolverResult) -> np.ndarray:
+    """
+    Returns the solution of a result as a matrix.
+
+    Args:
+    result (SolverResult): A result of a dense problem.
+
+    Returns:
+    np.ndarray: Shipments, int64 when they are all whole.
+    """
+    solution = result.solution
+    if isinstance(solution, SparseCosts):
+        solution = solution.to_dense()
+    return get_whole(np.asarray(solution))
+
+
+def get_document(result: SolverResult) -> dict:
+    """
+    Returns a result as JSON-ready values.
+
+    Args:
+    result (SolverResult): A dense result.
+
+    Returns:
+    dict: status, total_cost, iterations, the solution matrix and the dummy flows.
+    """
+    return {
+        'status': result.status,
+        'total_cost': get_whole(np.asarray(result.total_cost, dtype=np.float64)).item(),
+        'iterations': result.iterations,
+        'solution': get_solution(result).tolist(),
+        'penalty_cost': get_whole(np.asarray(result.penalty_cost, dtype=np.float64)).item(),
+        'unmet_demand': None if result.unmet_demand is None else get_whole(result.unmet_demand).tolist(),
+        'unused_supply': None if result.unused_supply is None else get_whole(result.unused_supply).tolist(),
+    }
+
+
+def write_result(result: SolverResult, output_format: str, file) -> None:
+    """
+    Writes a result to an open binary file.
+
+    JSON holds the status, costs, iteration count and dummy flows next to
+    the solution, CSV and NPY hold the solution matrix only.
+
+    Args:
+    result (SolverResult): A dense result.
+    output_format (str): One of FORMATS.
+    file: Binary file to write to.
+    """
+    if output_format == 'json':
+        file.write((json.dumps(get_document(result)) + '\n').encode())
+    elif output_format == 'csv':
+        text = io.StringIO()
+        solution = get_solution(result)
+        np.savetxt(text, solution, delimiter=',', fmt='%d' if solution.dtype.kind == 'i' else '%.18g')
+        file.write(text.getvalue().encode())
+    else:
+        np.save(file, get_solution(result))
+
+
+def save_result(result: SolverResult, output_format: str, path: Optional[str]) -> None:
+    """
+    Writes a result to a file, or to stdout without a path.
+
+    Args:
+    result (SolverResult): A dense result.
+    output_format (str): One of FORMATS.
+    path (Optional[str]): File to write, None for stdout.
+    """
+    if path is None:
+        write_result(result, output_format, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return
+    with open(path, 'wb') as file:
+        write_result(result, output_format, file)
+
+
+def iterate_problems(paths: List[str]) -> Iterator[tuple]:
+    """
+    Reads problem files one at a time.
+
+    Args:
+    paths (List[str]): Problem files.
+
+    Returns:
+    Iterator[tuple]: (supply, demand, costs, penalties) arrays of every file, as read.
+    """
+    for path in paths:
+        yield read_problem(path)
+
+
+def solve_directory(directory: str, output_format: str, output: Optional[str], workers: Optional[int], options: dict) -> List[Tuple[str, str]]:
+    """
+    Solves every problem file of a directory.
+
+    With an output directory every result goes to a file named after its
+    problem; without one, JSON results are written to stdout one per line
+    with the problem file name added.
+
+    Args:
+    directory (str): Directory of .json and .npz problem files.
+    output_format (str): One of FORMATS.
+    output (Optional[str]): Output directory, None for stdout.
+    workers (Optional[int]): Worker processes, see solve_many.
+    options (dict): Solver options for solve_many.
+
+    Returns:
+    List[Tuple[str, str]]: Problem file and status of every problem.
+    """
+    paths = get_problem_files(directory)
+    if output is not None:
+        os.makedirs(output, exist_ok=True)
+    statuses = []
+    for index, result in solve_many(iterate_problems(paths), workers=workers, **options):
+        name = os.path.basename(paths[index])
+        if output is None:
+            document = get_document(result)
+            document['instance'] = name
+            sys.stdout.write(json.dumps(document) + '\n')
+        else:
+            save_result(result, output_format, os.path.join(output, f'{os.path.splitext(name)[0]}.{output_format}'))
+        statuses.append((name, result.status))
+    sys.stdout.flush()
+    return statuses
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    """
+    Runs python -m tpp, interactively without arguments.
+
+    Args:
+    arguments (Optional[List[str]], optional): Command line arguments. Defaults to None, sys.argv.
+
+    Returns:
+    int: Exit status, 1 when a problem stopped before optimality.
+    """
+    arguments = sys.argv[1:] if arguments is None else arguments
+    if not arguments:
+        Application().run()
+        return 0
+
+    parser = argparse.ArgumentParser(prog='python -m tpp', description='Solves transportation problems.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    solve = commands.add_parser('solve', help='Solves problems read from files.')
+    source = solve.add_mutually_exclusive_group(required=True)
+    source.add_argument('--costs', help='Cost matrix as .csv, .json or .npy, one row per source.')
+    source.add_argument('--problem', help='Whole problem as a .json object or .npz archive with supply, demand, costs and optional penalties.')
+    source.add_argument('--directory', help='Solves every .json and .npz problem file of this directory.')
+    solve.add_argument('--supply', help='Supply values, with --costs.')
+    solve.add_argument('--demand', help='Demand values, with --costs.')
+    solve.add_argument('--penalties', help='Penalties for unmet demand, with --costs.')
+    solve.add_argument('--format', choices=FORMATS, default='json', help='Output format, csv and npy hold the solution only.')
+    solve.add_argument('--output', help='Output file, or directory with --directory. Defaults to stdout.')
+    solve.add_argument('--initial-method', default='north_west_corner',
+                       choices=['north_west_corner', 'least_cost', 'vogel_approximation', 'multilevel'])
+    solve.add_argument('--pricing', default='dantzig',
+                       choices=['dantzig', 'first_improving', 'block', 'candidate_list', 'bland'])
+    solve.add_argument('--engine', default='network_simplex', choices=['network_simplex', 'successive_shortest_path'],
+                       help='successive_shortest_path ships along shortest paths and hands the flows to the simplex engine.')
+    solve.add_argument('--presolve', action='store_true',
+                       help='Drops empty rows and columns, fixes forced shipments and merges identical rows and columns first.')
+    solve.add_argument('--max-iterations', type=int, help='Maximum number of pivots per problem.')
+    solve.add_argument('--time-limit', type=float, help='Maximum number of seconds spent pivoting per problem.')
+    solve.add_argument('--workers', type=int, help='Worker processes for --directory. Defaults to the CPU count.')
+    solve.add_argument('--chunk-rows', type=int, default=10000, help='CSV lines parsed at once.')
+    args = parser.parse_args(arguments)
+
+    options = {'initial_method': args.initial_method, 'pricing': args.pricing,
+               'max_iterations': args.max_iterations, 'time_limit': args.time_limit, 'engine': args.engine,
+               'presolve': args.presolve}
+    if args.directory is not None:
+        if args.output is None and args.format != 'json':
+            parser.error('--format csv and npy need an --output directory')
+        statuses = solve_directory(args.directory, args.format, args.output, args.workers, options)
+        return int(any(status != SolverResult.OPTIMAL for _, status in statuses))
+
+    if args.problem is not None:
+        supply, demand, costs, penalties = read_problem(args.problem)
+    else:
+        if args.supply is None or args.demand is None:
+            parser.error('--costs needs --supply and --demand')
+        costs = read_array(args.costs, args.chunk_rows)
+        supply = read_vector(args.supply, args.chunk_rows)
+        demand = read_vector(args.demand, args.chunk_rows)
+        penalties = None if args.penalties is None else read_vector(args.penalties, args.chunk_rows)
+    if costs.ndim != 2 or costs.shape != (len(supply), len(demand)):
+        raise Exception(f'Costs of shape {costs.shape} do not match {len(supply)} supplies and {len(demand)} demands')
+    result = Application().transportation_simplex_method(
+        supply.tolist(), demand.tolist(), costs, None if penalties is None else penalties.tolist(), **options)
+    save_result(result, args.format, args.output)
+    return int(result.status != SolverResult.OPTIMAL)
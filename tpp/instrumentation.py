@@ -0,0 +1,95 @@
+import json
+
+
+class SolverStats:
+    """
+    Timers and counters filled in by a solve.
+
+    Pass an instance to Application.transportation_simplex_method or to
+    NetworkSimplex to collect them; without one the engine skips all of this
+    bookkeeping. The potentials phase is the tree and potential build when
+    the engine starts; later potential updates happen inside pivots and are
+    part of the pivoting phase.
+
+    Attributes:
+    PHASES (list[str]): Names of the timed phases.
+    phases (dict[str, float]): Cumulative seconds per phase.
+    iterations (int): Pivots done.
+    degenerate_pivots (int): Pivots that moved no flow.
+    bland_pivots (int): Pivots chosen by the Bland fallback.
+    pricing_scans (int): Calls to the pricing rule.
+    priced_cells (int): Reduced costs computed by those calls.
+    loop_length_total (int): Sum of the loop lengths.
+    loop_length_max (int): Longest loop.
+    """
+
+    PHASES: list[str] = ['initial_solution', 'potentials', 'pricing', 'loop', 'pivoting']
+
+    def __init__(self) -> None:
+        self.phases = dict.fromkeys(self.PHASES, 0.0)
+        self.iterations = 0
+        self.degenerate_pivots = 0
+        self.bland_pivots = 0
+        self.pricing_scans = 0
+        self.priced_cells = 0
+        self.loop_length_total = 0
+        self.loop_length_max = 0
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """
+        Adds time to a phase.
+
+        Args:
+        phase (str): One of PHASES.
+        seconds (float): Seconds spent.
+        """
+        self.phases[phase] += seconds
+
+    def record_pivot(self, loop_length: int, theta: int, bland: bool) -> None:
+        """
+        Counts a pivot.
+
+        Args:
+        loop_length (int): Number of cells in the loop.
+        theta (int): Amount moved around the loop.
+        bland (bool): True when Bland's rule chose the pivot.
+        """
+        self.iterations += 1
+        self.degenerate_pivots += theta == 0
+        self.bland_pivots += bland
+        self.loop_length_total += loop_length
+        self.loop_length_max = max(self.loop_length_max, loop_length)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the timers and counters as plain values.
+
+        Returns:
+        dict: Phases, counters and the mean loop length.
+        """
+        return {
+            'phases': dict(self.phases),
+            'total_seconds': sum(self.phases.values()),
+            'iterations': self.iterations,
+            'degenerate_pivots': self.degenerate_pivots,
+            'bland_pivots': self.bland_pivots,
+            'pricing_scans': self.pricing_scans,
+            'priced_cells': self.priced_cells,
+            'loop_length_mean': self.loop_length_total / self.iterations if self.iterations else 0.0,
+            'loop_length_max': self.loop_length_max,
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Returns to_dict as JSON.
+
+        Args:
+        **kwargs: Passed to json.dumps.
+
+        Returns:
+        str: JSON document.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __repr__(self) -> str:
+        return f'SolverStats({self.to_dict()!r})'
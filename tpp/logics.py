@@ -1,20 +1,558 @@
+from array import array
+from collections import deque
+from typing import Iterable, Iterator
+import numpy as np
+
+
+class Basis:
+    """
+    Basic cells of a transportation problem stored in parallel arrays.
+
+    Slot k holds the cell (rows[k], columns[k]) with the value values[k], and
+    index maps every cell to its slot, so membership, value lookups and
+    swapping the leaving cell for the entering one are all O(1). Iterating
+    yields ((i, j), value) pairs, the same items as the list form.
+
+    After build_tree the basis also keeps the tree pointers used by
+    Logics.get_loop, over the row nodes 0 to rows - 1 and the column nodes
+    rows to rows + columns - 1. replace re-hangs the subtree cut off by the
+    leaving cell, while add and remove drop the pointers.
+
+    Attributes:
+    rows (array): Row of every slot.
+    columns (array): Column of every slot.
+    values (array): Value of every slot, integer unless a value is fractional.
+    index (dict[tuple[int, int], int]): Slot of every basic cell.
+    shape (tuple[int, int] | None): Number of rows and columns of the tree, None without tree pointers.
+    parent (list[int] | None): Parent of every node, -1 for a root.
+    depth (list[int] | None): Depth of every node.
+    adjacency (list[set[int]] | None): Tree neighbours of every node.
+    """
+
+    __slots__ = ('rows', 'columns', 'values', 'index', 'shape', 'parent', 'depth', 'adjacency')
+
+    def __init__(self, bfs: Iterable[tuple[tuple[int, int], int]] = (), typecode: str = None) -> None:
+        bfs = list(bfs)
+        if typecode is None:
+            typecode = 'q' if all(isinstance(v, (int, np.integer)) for p, v in bfs) else 'd'
+        self.rows = array('q')
+        self.columns = array('q')
+        self.values = array(typecode)
+        self.index = {}
+        self.shape = None
+        self.parent = None
+        self.depth = None
+        self.adjacency = None
+        for position, value in bfs:
+            self.add(position, value)
+
+    @staticmethod
+    def from_list(bfs: 'Basis | list[tuple[tuple[int, int], int]]') -> 'Basis':
+        """
+        Returns a Basis for either form of a basic feasible solution.
+
+        Args:
+            bfs (Basis | list[tuple[tuple[int, int], int]]): Basic feasible solution.
+
+        Returns:
+            Basis: bfs itself when it already is a Basis, otherwise a new Basis.
+        """
+        return bfs if isinstance(bfs, Basis) else Basis(bfs)
+
+    def to_list(self) -> list[tuple[tuple[int, int], int]]:
+        """
+        Returns the basis in the list form.
+
+        Returns:
+            list[tuple[tuple[int, int], int]]: Basic feasible solution in slot order.
+        """
+        return list(self)
+
+    def positions(self) -> list[tuple[int, int]]:
+        """
+        Returns the positions of the basic cells.
+
+        Returns:
+            list[tuple[int, int]]: Positions in slot order.
+        """
+        return list(zip(self.rows, self.columns))
+
+    def add(self, position: tuple[int, int], value: int) -> None:
+        """
+        Adds a basic cell in a new slot.
+
+        Args:
+            position (tuple[int, int]): Position of the cell.
+            value (int): Value of the cell.
+        """
+        self.shape = None
+        self.index[position] = len(self.rows)
+        self.rows.append(position[0])
+        self.columns.append(position[1])
+        self.values.append(value)
+
+    def remove(self, position: tuple[int, int]) -> None:
+        """
+        Removes a basic cell by moving the last slot into its place.
+
+        Args:
+            position (tuple[int, int]): Position of the cell.
+        """
+        self.shape = None
+        slot = self.index.pop(position)
+        last_row = self.rows.pop()
+        last_column = self.columns.pop()
+        last_value = self.values.pop()
+        if slot < len(self.rows):
+            self.rows[slot] = last_row
+            self.columns[slot] = last_column
+            self.values[slot] = last_value
+            self.index[(last_row, last_column)] = slot
+
+    def replace(self, leaving_position: tuple[int, int], ev_position: tuple[int, int], value: int) -> None:
+        """
+        Puts the entering cell into the slot of the leaving cell.
+
+        Args:
+            leaving_position (tuple[int, int]): Position of the leaving cell.
+            ev_position (tuple[int, int]): Position of the entering cell.
+            value (int): Value of the entering cell.
+        """
+        slot = self.index.pop(leaving_position)
+        self.rows[slot] = ev_position[0]
+        self.columns[slot] = ev_position[1]
+        self.values[slot] = value
+        self.index[ev_position] = slot
+        if self.shape is not None:
+            self.update_tree(leaving_position, ev_position)
+
+    def build_tree(self, rows: int, columns: int) -> None:
+        """
+        Builds the tree pointers of the basis, see Logics.get_tree_pointers.
+
+        Args:
+            rows (int): Number of rows (sources).
+            columns (int): Number of columns (destinations).
+        """
+        self.adjacency = [set() for _ in range(rows + columns)]
+        for i, j in zip(self.rows, self.columns):
+            self.adjacency[i].add(rows + j)
+            self.adjacency[rows + j].add(i)
+        self.parent, self.depth = Logics.get_tree_pointers(self.positions(), rows, columns)
+        self.shape = (rows, columns)
+
+    def update_tree(self, leaving_position: tuple[int, int], ev_position: tuple[int, int]) -> None:
+        """
+        Moves the tree pointers from the leaving cell to the entering cell.
+
+        The leaving cell cuts off a subtree holding one end of the entering
+        cell, found by walking that end up to the cut in O(loop length). The
+        subtree is then re-hung from that end in O(subtree size).
+
+        Args:
+            leaving_position (tuple[int, int]): Position of the leaving cell, on the loop of the entering cell.
+            ev_position (tuple[int, int]): Position of the entering cell.
+        """
+        rows = self.shape[0]
+        row_node, column_node = leaving_position[0], rows + leaving_position[1]
+        cut_node = row_node if self.parent[row_node] == column_node else column_node
+        self.adjacency[row_node].discard(column_node)
+        self.adjacency[column_node].discard(row_node)
+        node = ev_position[0]
+        while self.depth[node] > self.depth[cut_node]:
+            node = self.parent[node]
+        if node == cut_node:
+            hung_node, parent_node = ev_position[0], rows + ev_position[1]
+        else:
+            hung_node, parent_node = rows + ev_position[1], ev_position[0]
+        self.adjacency[hung_node].add(parent_node)
+        self.adjacency[parent_node].add(hung_node)
+        self.parent[hung_node] = parent_node
+        self.depth[hung_node] = self.depth[parent_node] + 1
+        stack = [hung_node]
+        while stack:
+            current = stack.pop()
+            for next_node in self.adjacency[current]:
+                if next_node != self.parent[current]:
+                    self.parent[next_node] = current
+                    self.depth[next_node] = self.depth[current] + 1
+                    stack.append(next_node)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[tuple[tuple[int, int], int]]:
+        return iter(zip(zip(self.rows, self.columns), self.values))
+
+    def __contains__(self, position: tuple[int, int]) -> bool:
+        return position in self.index
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        return self.values[self.index[position]]
+
+    def __setitem__(self, position: tuple[int, int], value: int) -> None:
+        self.values[self.index[position]] = value
+
+    def __repr__(self) -> str:
+        return f'Basis({self.to_list()!r})'
+
+
+class SparseCosts:
+    """
+    Costs of the routes (arcs) of a transportation problem in compressed sparse row form.
+
+    Only the listed routes are stored, every other cell is a missing route
+    that must not carry flow. The arcs of row i are the slots
+    indptr[i] to indptr[i + 1], sorted by column: arc k runs from row
+    arc_rows[k] to column indices[k] at cost data[k].
+
+    Attributes:
+    shape (tuple[int, int]): Number of rows and columns.
+    indptr (np.ndarray): First arc of every row, followed by the number of arcs.
+    indices (np.ndarray): Column of every arc.
+    data (np.ndarray): Cost of every arc.
+    arc_rows (np.ndarray): Row of every arc.
+    """
+
+    def __init__(self, shape: tuple[int, int], indptr: np.ndarray, indices: np.ndarray, data: np.ndarray) -> None:
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.data = np.asarray(data)
+        self.arc_rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @staticmethod
+    def from_coo(shape: tuple[int, int], arc_rows: Iterable[int], arc_columns: Iterable[int], arc_costs: Iterable[int]) -> 'SparseCosts':
+        """
+        Builds the costs from parallel lists of routes.
+
+        Args:
+            shape (tuple[int, int]): Number of rows and columns.
+            arc_rows (Iterable[int]): Row of every route.
+            arc_columns (Iterable[int]): Column of every route.
+            arc_costs (Iterable[int]): Cost of every route.
+
+        Raises:
+            Exception: When a route is outside the shape or listed twice.
+
+        Returns:
+            SparseCosts: Routes sorted by row and column.
+        """
+        arc_rows = np.asarray(arc_rows, dtype=np.intp)
+        arc_columns = np.asarray(arc_columns, dtype=np.intp)
+        arc_costs = np.asarray(arc_costs)
+        if arc_rows.size and (arc_rows.min() < 0 or arc_rows.max() >= shape[0] or
+                              arc_columns.min() < 0 or arc_columns.max() >= shape[1]):
+            raise Exception('Route outside the cost matrix')
+        order = np.lexsort((arc_columns, arc_rows))
+        arc_rows = arc_rows[order]
+        arc_columns = arc_columns[order]
+        duplicates = (arc_rows[1:] == arc_rows[:-1]) & (arc_columns[1:] == arc_columns[:-1])
+        if duplicates.any():
+            k = int(np.argmax(duplicates))
+            raise Exception(f'Route ({arc_rows[k]}, {arc_columns[k]}) listed twice')
+        indptr = np.zeros(shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(arc_rows, minlength=shape[0]), out=indptr[1:])
+        return SparseCosts(shape, indptr, arc_columns, arc_costs[order])
+
+    @staticmethod
+    def from_dense(costs: list[list[int]], missing: int = None) -> 'SparseCosts':
+        """
+        Builds the costs from a cost matrix.
+
+        Args:
+            costs (list[list[int]]): Cost matrix.
+            missing (int, optional): Cost that marks a missing route. Defaults to None, every cell is a route.
+
+        Returns:
+            SparseCosts: Routes of the cost matrix.
+        """
+        costs = np.asarray(costs)
+        present = np.ones(costs.shape, dtype=bool) if missing is None else costs != missing
+        arc_rows, arc_columns = np.nonzero(present)
+        return SparseCosts.from_coo(costs.shape, arc_rows, arc_columns, costs[present])
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.size)
+
+    def find(self, i: int, j: int) -> int:
+        """
+        Finds the arc of a cell with a binary search in its row.
+
+        Args:
+            i (int): Row of the cell.
+            j (int): Column of the cell.
+
+        Returns:
+            int: Index of the arc, -1 when the route is missing.
+        """
+        start = self.indptr[i]
+        stop = self.indptr[i + 1]
+        k = start + int(np.searchsorted(self.indices[start:stop], j))
+        return k if k < stop and self.indices[k] == j else -1
+
+    def get(self, i: int, j: int, default: int = None) -> int:
+        """
+        Returns the cost of a cell.
+
+        Args:
+            i (int): Row of the cell.
+            j (int): Column of the cell.
+            default (int, optional): Value returned for a missing route. Defaults to None.
+
+        Returns:
+            int: Cost of the route, or default when it is missing.
+        """
+        k = self.find(i, j)
+        return default if k < 0 else self.data[k]
+
+    def get_big_m(self) -> int:
+        """
+        Returns a cost for artificial routes that no optimal solution uses when a feasible one exists.
+
+        Any flow on an artificial route can be rerouted over at most
+        rows + columns real routes, so a cost above that many times the
+        largest real cost makes every artificial unit unprofitable.
+
+        Returns:
+            int: Cost of an artificial route.
+        """
+        largest = np.abs(self.data).max() if self.data.size else 0
+        return (self.shape[0] + self.shape[1]) * largest + 1
+
+    def with_row(self, row_costs: list[int]) -> 'SparseCosts':
+        """
+        Returns the costs with an extra row that has a route to every column.
+
+        Args:
+            row_costs (list[int]): Cost of every route of the new row.
+
+        Returns:
+            SparseCosts: Costs with one more row.
+        """
+        return SparseCosts((self.shape[0] + 1, self.shape[1]),
+                           np.append(self.indptr, self.nnz + self.shape[1]),
+                           np.concatenate([self.indices, np.arange(self.shape[1])]),
+                           np.concatenate([self.data, np.asarray(row_costs, dtype=self.data.dtype)]))
+
+    def with_column(self, column_costs: list[int]) -> 'SparseCosts':
+        """
+        Returns the costs with an extra column that has a route from every row.
+
+        Args:
+            column_costs (list[int]): Cost of every route of the new column.
+
+        Returns:
+            SparseCosts: Costs with one more column.
+        """
+        ends = self.indptr[1:]
+        return SparseCosts((self.shape[0], self.shape[1] + 1),
+                           self.indptr + np.arange(self.shape[0] + 1),
+                           np.insert(self.indices, ends, self.shape[1]),
+                           np.insert(self.data, ends, np.asarray(column_costs, dtype=self.data.dtype)))
+
+    def get_components(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the connected components of the graph of the routes.
+
+        Rows and columns are linked by their routes, and the components are
+        found by hooking every root onto the smaller of its route neighbours'
+        roots and compressing the paths until no route joins two components.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Component of every row and of every column, numbered by their first row, or column for those without rows.
+        """
+        m, n = self.shape
+        labels = np.arange(m + n)
+        heads = m + self.indices
+        while True:
+            row_labels = labels[self.arc_rows]
+            column_labels = labels[heads]
+            joined = row_labels != column_labels
+            if not joined.any():
+                break
+            np.minimum.at(labels, np.maximum(row_labels[joined], column_labels[joined]),
+                          np.minimum(row_labels[joined], column_labels[joined]))
+            while True:
+                compressed = labels[labels]
+                if np.array_equal(compressed, labels):
+                    break
+                labels = compressed
+        _, components = np.unique(labels, return_inverse=True)
+        return components[:m], components[m:]
+
+    def to_dense(self, fill: int = 0) -> np.ndarray:
+        """
+        Returns the cost matrix.
+
+        Args:
+            fill (int, optional): Cost written at missing routes. Defaults to 0.
+
+        Returns:
+            np.ndarray: Cost matrix.
+        """
+        costs = np.full(self.shape, fill, dtype=np.result_type(self.data, np.asarray(fill)))
+        costs[self.arc_rows, self.indices] = self.data
+        return costs
+
+    def __repr__(self) -> str:
+        return f'SparseCosts(shape={self.shape!r}, nnz={self.nnz!r})'
+
+
+class PaddedCosts:
+    """
+    Dense cost matrix with a dummy row or column added without copying the matrix.
+
+    Balancing a large or memory-mapped matrix this way adds O(m + n) memory.
+    Indexing reads only the requested cells, and supports the forms the
+    solver uses: single cells, whole rows, row slices, row or column lists
+    and paired or np.ix_ index arrays.
+
+    Attributes:
+    costs (np.ndarray): The original matrix, possibly a numpy.memmap.
+    row (np.ndarray | None): Costs of the dummy row, None without one.
+    column (np.ndarray | None): Costs of the dummy column, None without one.
+    shape (tuple[int, int]): Number of rows and columns, the dummy included.
+    dtype (np.dtype): Type of the costs.
+    """
+
+    def __init__(self, costs: np.ndarray, row: list[int] = None, column: list[int] = None) -> None:
+        self.costs = costs
+        self.dtype = np.result_type(costs.dtype, *[np.asarray(extra).dtype for extra in [row, column] if extra is not None])
+        self.row = None if row is None else np.asarray(row, dtype=self.dtype)
+        self.column = None if column is None else np.asarray(column, dtype=self.dtype)
+        self.shape = (costs.shape[0] + (row is not None), costs.shape[1] + (column is not None))
+
+    def get_rows(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns a block of rows as an array, reading the matrix rows in one slice.
+
+        Args:
+            start (int): First row of the block.
+            stop (int): Row after the last row of the block.
+
+        Returns:
+            np.ndarray: The block.
+        """
+        rows, columns = self.costs.shape
+        block = np.empty((max(0, stop - start), self.shape[1]), dtype=self.dtype)
+        inside = min(stop, rows)
+        if start < inside:
+            block[:inside - start, :columns] = self.costs[start:inside]
+        if self.column is not None:
+            block[:, columns] = self.column[start:stop]
+        if self.row is not None and start <= rows < stop:
+            block[rows - start] = self.row
+        return block
+
+    def subtract_rows(self, block: np.ndarray, start: int, stop: int) -> None:
+        """
+        Subtracts the costs of a block of rows from an array in place, without copying them first.
+
+        Args:
+            block (np.ndarray): Array of shape (stop - start, columns).
+            start (int): First row of the block.
+            stop (int): Row after the last row of the block.
+        """
+        rows, columns = self.costs.shape
+        inside = min(stop, rows)
+        if start < inside:
+            block[:inside - start, :columns] -= self.costs[start:inside]
+        if self.column is not None:
+            block[:, columns] -= self.column[start:stop]
+        if self.row is not None and start <= rows < stop:
+            block[rows - start] -= self.row
+
+    def get_indices(self, indices, axis: int) -> np.ndarray:
+        """
+        Returns the indices of a slice, an index or an index array along an axis, with negative ones counted from the end.
+
+        Args:
+            indices: Slice, index or index array.
+            axis (int): 0 for rows, 1 for columns.
+
+        Raises:
+            IndexError: When an index is out of range.
+
+        Returns:
+            np.ndarray: Indices between 0 and the size of the axis.
+        """
+        size = self.shape[axis]
+        if isinstance(indices, slice):
+            return np.arange(*indices.indices(size))
+        indices = np.asarray(indices)
+        if np.any((indices < -size) | (indices >= size)):
+            raise IndexError(f'index out of range for axis {axis} with size {size}')
+        return np.where(indices < 0, indices + size, indices)
+
+    def __getitem__(self, key):
+        rows, columns = key if isinstance(key, tuple) else (key, slice(None))
+        if isinstance(rows, (int, np.integer)) and isinstance(columns, (int, np.integer)):
+            rows, columns = int(self.get_indices(rows, 0)), int(self.get_indices(columns, 1))
+            if rows < self.costs.shape[0] and columns < self.costs.shape[1]:
+                return self.costs[rows, columns]
+            return self.row[columns] if rows == self.costs.shape[0] else self.column[rows]
+        if isinstance(rows, slice) and isinstance(columns, slice) and columns == slice(None):
+            start, stop, step = rows.indices(self.shape[0])
+            if step == 1:
+                return self.get_rows(start, stop)
+        outer = isinstance(rows, slice) or isinstance(columns, slice)
+        rows = self.get_indices(rows, 0)
+        columns = self.get_indices(columns, 1)
+        if outer and rows.ndim and columns.ndim:
+            rows, columns = rows[:, None], columns[None, :]
+        rows, columns = np.broadcast_arrays(rows, columns)
+        base_rows, base_columns = self.costs.shape
+        values = np.empty(rows.shape, dtype=self.dtype)
+        inside = (rows < base_rows) & (columns < base_columns)
+        values[inside] = self.costs[rows[inside], columns[inside]]
+        if self.row is not None:
+            dummy = rows == base_rows
+            values[dummy] = self.row[columns[dummy]]
+        if self.column is not None:
+            dummy = columns == base_columns
+            values[dummy] = self.column[rows[dummy]]
+        return values[()] if values.ndim == 0 else values
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __iter__(self):
+        for i in range(self.shape[0]):
+            yield self.get_rows(i, i + 1)[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        costs = self.get_rows(0, self.shape[0])
+        return costs if dtype is None else costs.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f'PaddedCosts(shape={self.shape!r}, dtype={self.dtype!r})'
+
+
 class Logics:
     @staticmethod
-    def get_balanced_tp(supply: list[int], demand: list[int], costs: list[list[int]], penalties: list[int] = None) -> tuple[list[int], list[int], list[list[int]]]:
+    def get_balanced_tp(supply: list[int], demand: list[int], costs: list[list[int]] | np.ndarray | SparseCosts, penalties: list[int] = None) -> tuple[list[int], list[int], list[list[int]] | np.ndarray | PaddedCosts | SparseCosts]:
         """
         Adjusts supply and demand to balance them if necessary and returns adjusted parameters.
 
+        The dummy row or column gets a route to every cell of the other side,
+        also when the costs are sparse. A cost matrix given as a list of lists
+        comes back as a new list of lists; an array is not copied: the dummy
+        is added virtually by PaddedCosts. The dummy row costs the penalties,
+        one per demand, and the dummy column costs nothing.
+
         Args:
             supply (list[int]): List of supply values.
             demand (list[int]): List of demand values.
-            costs (list[list[int]]): Cost matrix.
+            costs (list[list[int]] | np.ndarray | SparseCosts): Cost matrix or routes.
             penalties (list[int], optional): List of penalties. Defaults to None.
 
         Raises:
-            Exception: When supply is less than demand and penalties are not provided.
+            Exception: When supply is less than demand and penalties are not provided, or not one per demand.
 
         Returns:
-            tuple[list[int], list[int], list[list[int]]]: Adjusted supply, demand, and costs.
+            tuple[list[int], list[int], list[list[int]] | np.ndarray | PaddedCosts | SparseCosts]: Adjusted supply, demand, and costs.
         """
         total_supply = sum(supply)
         total_demand = sum(demand)
@@ -22,13 +560,21 @@ class Logics:
         if total_supply < total_demand:
             if penalties is None:
                 raise Exception('Supply less than demand, penalties required')
-            new_supply = supply + [total_demand - total_supply]
-            new_costs = costs + [penalties]
-            return new_supply, demand, new_costs
+            if len(penalties) != len(demand):
+                raise Exception('Supply less than demand, one penalty per demand required')
+            new_supply = list(supply) + [total_demand - total_supply]
+            if isinstance(costs, SparseCosts):
+                return new_supply, demand, costs.with_row(penalties)
+            if isinstance(costs, list):
+                return new_supply, demand, costs + [list(penalties)]
+            return new_supply, demand, PaddedCosts(np.asarray(costs), row=penalties)
         if total_supply > total_demand:
-            new_demand = demand + [total_supply - total_demand]
-            new_costs = costs + [[0 for _ in demand]]
-            return supply, new_demand, new_costs
+            new_demand = list(demand) + [total_supply - total_demand]
+            if isinstance(costs, SparseCosts):
+                return supply, new_demand, costs.with_column([0] * len(supply))
+            if isinstance(costs, list):
+                return supply, new_demand, [list(row) + [0] for row in costs]
+            return supply, new_demand, PaddedCosts(np.asarray(costs), column=[0] * len(supply))
         return supply, demand, costs
 
     @staticmethod
@@ -62,44 +608,373 @@ class Logics:
         return bfs
 
     @staticmethod
-    def get_vs_and_ws(bfs: list[tuple[tuple[int], int]], costs: list[list[int]]) -> tuple[list[int], list[int]]:
+    def least_cost(supply: list[int], demand: list[int], costs: list[list[int]] | SparseCosts) -> list[tuple[tuple[int], int]]:
+        """
+        Finds the initial basic feasible solution using the Least Cost method.
+
+        Cells are visited once in increasing cost order. Every allocation
+        retires exactly one row or column (both only on the last one), so the
+        result always has len(supply) + len(demand) - 1 cells, some of them
+        zero when the problem is degenerate. With sparse costs only the routes
+        are visited, and whatever the routes cannot take is placed on missing
+        routes with the North-West Corner method over the lines still open.
+
+        Args:
+            supply (list[int]): List of supply values.
+            demand (list[int]): List of demand values.
+            costs (list[list[int]] | SparseCosts): Cost matrix or routes.
+
+        Returns:
+            list[tuple[tuple[int], int]]: Initial basic feasible solution.
+        """
+        supply_copy = supply.copy()
+        demand_copy = demand.copy()
+        row_done = [False] * len(supply)
+        column_done = [False] * len(demand)
+        rows_left = len(supply)
+        bfs = []
+        if isinstance(costs, SparseCosts):
+            order = np.argsort(costs.data, kind='stable')
+            cells = zip(costs.arc_rows[order].tolist(), costs.indices[order].tolist())
+        else:
+            cells = (divmod(int(index), len(demand))
+                     for index in np.argsort(np.asarray(costs), axis=None, kind='stable'))
+        for i, j in cells:
+            if row_done[i] or column_done[j]:
+                continue
+            v = min(supply_copy[i], demand_copy[j])
+            supply_copy[i] -= v
+            demand_copy[j] -= v
+            bfs.append(((i, j), v))
+            if len(bfs) == len(supply) + len(demand) - 1:
+                break
+            if supply_copy[i] == 0 and rows_left > 1:
+                row_done[i] = True
+                rows_left -= 1
+            else:
+                column_done[j] = True
+        if len(bfs) < len(supply) + len(demand) - 1:
+            bfs += Logics.complete_on_missing_routes(
+                supply_copy, demand_copy, row_done, column_done)
+        return bfs
+
+    @staticmethod
+    def complete_on_missing_routes(supply: list[int], demand: list[int], row_done: list[bool], column_done: list[bool]) -> list[tuple[tuple[int], int]]:
+        """
+        Places the remaining supply and demand of the open lines with the North-West Corner method.
+
+        Used by the starting methods when the routes of a sparse problem run
+        out. The cells found are usually missing routes, which the engine
+        treats as artificial routes with a prohibitive cost.
+
+        Args:
+            supply (list[int]): Remaining supply values.
+            demand (list[int]): Remaining demand values.
+            row_done (list[bool]): True for every retired row.
+            column_done (list[bool]): True for every retired column.
+
+        Returns:
+            list[tuple[tuple[int], int]]: One cell fewer than the open lines.
+        """
+        open_rows = [i for i, done in enumerate(row_done) if not done]
+        open_columns = [j for j, done in enumerate(column_done) if not done]
+        return [((open_rows[i], open_columns[j]), v) for (i, j), v in Logics.north_west_corner(
+            [supply[i] for i in open_rows], [demand[j] for j in open_columns])]
+
+    @staticmethod
+    def vogel_approximation(supply: list[int], demand: list[int], costs: list[list[int]] | SparseCosts) -> list[tuple[tuple[int], int]]:
+        """
+        Finds the initial basic feasible solution using Vogel's Approximation Method.
+
+        The penalty of a row or column is the gap between its two cheapest open
+        cells, found with a NumPy partial sort. After an allocation only the
+        lines whose two cheapest cells included the retired line are partially
+        sorted again. A line with a single open cell gets an infinite penalty.
+        Sparse costs are handled by sparse_vogel_approximation.
+
+        Args:
+            supply (list[int]): List of supply values.
+            demand (list[int]): List of demand values.
+            costs (list[list[int]] | SparseCosts): Cost matrix or routes.
+
+        Returns:
+            list[tuple[tuple[int], int]]: Initial basic feasible solution.
+        """
+        if isinstance(costs, SparseCosts):
+            return Logics.sparse_vogel_approximation(supply, demand, costs)
+        rows = len(supply)
+        columns = len(demand)
+        open_costs = np.full((rows + 1, columns + 1), np.inf)
+        open_costs[:rows, :columns] = costs
+
+        def get_penalties(lines: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            cheapest = np.argpartition(lines, 1, axis=1)[:, :2]
+            values = np.take_along_axis(lines, cheapest, axis=1)
+            return values[:, 1] - values[:, 0], cheapest[:, 0], cheapest[:, 1]
+
+        row_penalties, row_first, row_second = get_penalties(
+            open_costs[:rows])
+        column_penalties, column_first, column_second = get_penalties(
+            open_costs[:, :columns].T)
+
+        supply_copy = supply.copy()
+        demand_copy = demand.copy()
+        rows_left = rows
+        bfs = []
+        while True:
+            i = int(np.argmax(row_penalties))
+            j = int(np.argmax(column_penalties))
+            if row_penalties[i] >= column_penalties[j]:
+                j = int(row_first[i])
+            else:
+                i = int(column_first[j])
+            v = min(supply_copy[i], demand_copy[j])
+            supply_copy[i] -= v
+            demand_copy[j] -= v
+            bfs.append(((i, j), v))
+            if len(bfs) == rows + columns - 1:
+                break
+
+            if supply_copy[i] == 0 and rows_left > 1:
+                rows_left -= 1
+                open_costs[i, :columns] = np.inf
+                row_penalties[i] = -np.inf
+                stale = np.flatnonzero(((column_first == i) | (column_second == i)) & (column_penalties != -np.inf))
+                if stale.size:
+                    column_penalties[stale], column_first[stale], column_second[stale] = get_penalties(
+                        open_costs[:, stale].T)
+            else:
+                open_costs[:rows, j] = np.inf
+                column_penalties[j] = -np.inf
+                stale = np.flatnonzero(((row_first == j) | (row_second == j)) & (row_penalties != -np.inf))
+                if stale.size:
+                    row_penalties[stale], row_first[stale], row_second[stale] = get_penalties(
+                        open_costs[stale])
+        return bfs
+
+    @staticmethod
+    def sparse_vogel_approximation(supply: list[int], demand: list[int], costs: SparseCosts) -> list[tuple[tuple[int], int]]:
+        """
+        Finds the initial basic feasible solution using Vogel's Approximation Method on routes.
+
+        Every line keeps its routes sorted by cost and two cursors on its
+        cheapest and second cheapest open route. Lines only close, so the
+        cursors only move forward and all cursor moves together cost O(routes).
+        A missing route counts as the big-M cost of SparseCosts.get_big_m, so a
+        line with one open route gets a large penalty, and a line without open
+        routes is served last on a missing route.
+
+        Args:
+            supply (list[int]): List of supply values.
+            demand (list[int]): List of demand values.
+            costs (SparseCosts): Routes.
+
+        Returns:
+            list[tuple[tuple[int], int]]: Initial basic feasible solution.
+        """
+        rows, columns = costs.shape
+        big_m = costs.get_big_m()
+        row_order = np.lexsort((costs.data, costs.arc_rows))
+        column_order = np.lexsort((costs.data, costs.indices))
+        column_ptr = np.zeros(columns + 1, dtype=np.intp)
+        np.cumsum(np.bincount(costs.indices, minlength=columns), out=column_ptr[1:])
+        # Per side: routes of each line cheapest first, line bounds, the other
+        # end of every route, and which lines of the other side are closed.
+        sides = [
+            (costs.indices[row_order].tolist(), costs.data[row_order].tolist(), costs.indptr.tolist(), [False] * columns),
+            (costs.arc_rows[column_order].tolist(), costs.data[column_order].tolist(), column_ptr.tolist(), [False] * rows),
+        ]
+        row_done = sides[1][3]
+        column_done = sides[0][3]
+        cursors = [[[start, start] for start in side[2][:-1]] for side in sides]
+        penalties = [np.zeros(rows), np.zeros(columns)]
+        firsts = [np.full(rows, -1), np.full(columns, -1)]
+        seconds = [np.full(rows, -1), np.full(columns, -1)]
+
+        def update(side: int, line: int) -> None:
+            others, line_costs, bounds, other_done = sides[side]
+            cursor = cursors[side][line]
+            stop = bounds[line + 1]
+            while cursor[0] < stop and other_done[others[cursor[0]]]:
+                cursor[0] += 1
+            cursor[1] = max(cursor[1], cursor[0] + 1)
+            while cursor[1] < stop and other_done[others[cursor[1]]]:
+                cursor[1] += 1
+            first = line_costs[cursor[0]] if cursor[0] < stop else big_m
+            second = line_costs[cursor[1]] if cursor[1] < stop else big_m
+            penalties[side][line] = second - first
+            firsts[side][line] = others[cursor[0]] if cursor[0] < stop else -1
+            seconds[side][line] = others[cursor[1]] if cursor[1] < stop else -1
+
+        for line in range(rows):
+            update(0, line)
+        for line in range(columns):
+            update(1, line)
+
+        def get_cheapest(side: int, line: int) -> int:
+            if firsts[side][line] >= 0:
+                return int(firsts[side][line])
+            return sides[side][3].index(False)
+
+        supply_copy = supply.copy()
+        demand_copy = demand.copy()
+        rows_left = rows
+        bfs = []
+        while True:
+            i = int(np.argmax(penalties[0]))
+            j = int(np.argmax(penalties[1]))
+            if penalties[0][i] >= penalties[1][j]:
+                j = get_cheapest(0, i)
+            else:
+                i = get_cheapest(1, j)
+            v = min(supply_copy[i], demand_copy[j])
+            supply_copy[i] -= v
+            demand_copy[j] -= v
+            bfs.append(((i, j), v))
+            if len(bfs) == rows + columns - 1:
+                break
+
+            if supply_copy[i] == 0 and rows_left > 1:
+                rows_left -= 1
+                row_done[i] = True
+                penalties[0][i] = -np.inf
+                side, line = 1, i
+            else:
+                column_done[j] = True
+                penalties[1][j] = -np.inf
+                side, line = 0, j
+            stale = np.flatnonzero(((firsts[side] == line) | (seconds[side] == line)) & (penalties[side] != -np.inf))
+            for other_line in stale.tolist():
+                update(side, other_line)
+        return bfs
+
+    @staticmethod
+    def get_initial_solution(supply: list[int], demand: list[int], costs: list[list[int]] | SparseCosts, initial_method: str = 'north_west_corner') -> list[tuple[tuple[int], int]]:
+        """
+        Finds the initial basic feasible solution with the chosen method.
+
+        Args:
+            supply (list[int]): List of supply values.
+            demand (list[int]): List of demand values.
+            costs (list[list[int]] | SparseCosts): Cost matrix or routes.
+            initial_method (str, optional): 'north_west_corner', 'least_cost' or 'vogel_approximation'. Defaults to 'north_west_corner'.
+
+        Raises:
+            Exception: When the initial method is unknown.
+
+        Returns:
+            list[tuple[tuple[int], int]]: Initial basic feasible solution.
+        """
+        if initial_method == 'north_west_corner':
+            return Logics.north_west_corner(supply, demand)
+        if initial_method == 'least_cost':
+            return Logics.least_cost(supply, demand, costs)
+        if initial_method == 'vogel_approximation':
+            return Logics.vogel_approximation(supply, demand, costs)
+        raise Exception(f'Unknown initial method: {initial_method}')
+
+    @staticmethod
+    def get_basis_tree(bfs: Basis | list[tuple[tuple[int], int]], rows: int, columns: int) -> tuple[list[list[int]], list[list[int]]]:
+        """
+        Builds the adjacency lists of the basis spanning tree.
+
+        Args:
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
+            rows (int): Number of rows (sources).
+            columns (int): Number of columns (destinations).
+
+        Returns:
+            tuple[list[list[int]], list[list[int]]]: Columns adjacent to each row and rows adjacent to each column.
+        """
+        row_adjacency = [[] for _ in range(rows)]
+        column_adjacency = [[] for _ in range(columns)]
+        for (i, j), _ in bfs:
+            row_adjacency[i].append(j)
+            column_adjacency[j].append(i)
+        return row_adjacency, column_adjacency
+
+    @staticmethod
+    def get_vs_and_ws(bfs: Basis | list[tuple[tuple[int], int]], costs: list[list[int]]) -> tuple[list[int], list[int]]:
         """
         Calculates the values of v and w in the Modified Distribution method.
 
+        The potentials are propagated with a single breadth-first traversal of
+        the basis tree, so the work is linear in the number of rows and columns.
+        Every component of a degenerate (disconnected) basis is rooted at its
+        first row with v = 0, and columns without basic cells get w = 0.
+
         Args:
-            bfs (list[tuple[tuple[int], int]]): Basic feasible solution.
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
             costs (list[list[int]]): Cost matrix.
 
         Returns:
             tuple[list[int], list[int]]: Values of v and w.
         """
+        row_adjacency, column_adjacency = Logics.get_basis_tree(
+            bfs, len(costs), len(costs[0]))
         vs = [None] * len(costs)
         ws = [None] * len(costs[0])
-        vs[0] = 0
-        bfs_copy = bfs.copy()
-        while len(bfs_copy) > 0:
-            for index, bv in enumerate(bfs_copy):
-                i, j = bv[0]
-                if vs[i] is None and ws[j] is None:
-                    continue
-
-                cost = costs[i][j]
-                if vs[i] is None:
-                    vs[i] = cost - ws[j]
-                else:
-                    ws[j] = cost - vs[i]
-                bfs_copy.pop(index)
-                break
+        for root in range(len(costs)):
+            if vs[root] is not None:
+                continue
+            vs[root] = 0
+            queue = deque([root])
+            while queue:
+                i = queue.popleft()
+                for j in row_adjacency[i]:
+                    if ws[j] is not None:
+                        continue
+                    ws[j] = costs[i][j] - vs[i]
+                    for k in column_adjacency[j]:
+                        if vs[k] is None:
+                            vs[k] = costs[k][j] - ws[j]
+                            queue.append(k)
+
+        return vs, [0 if w is None else w for w in ws]
+
+    @staticmethod
+    def get_basis_mask(bfs: Basis | list[tuple[tuple[int], int]], rows: int, columns: int) -> np.ndarray:
+        """
+        Marks the basic cells of a basic feasible solution.
 
-        return vs, ws
+        Args:
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
+            rows (int): Number of rows (sources).
+            columns (int): Number of columns (destinations).
+
+        Returns:
+            np.ndarray: Boolean matrix that is True at basic cells.
+        """
+        basis = Basis.from_list(bfs)
+        basis_mask = np.zeros((rows, columns), dtype=bool)
+        basis_mask[np.asarray(basis.rows), np.asarray(basis.columns)] = True
+        return basis_mask
+
+    @staticmethod
+    def get_reduced_costs(basis_mask: np.ndarray, costs: np.ndarray, vs: list[int], ws: list[int]) -> np.ndarray:
+        """
+        Calculates v + w - cost for every cell in one vectorized pass.
+
+        Args:
+            basis_mask (np.ndarray): Boolean matrix that is True at basic cells.
+            costs (np.ndarray): Cost matrix.
+            vs (list[int]): List of v values.
+            ws (list[int]): List of w values.
+
+        Returns:
+            np.ndarray: Reduced costs, zero at basic cells.
+        """
+        reduced_costs = np.add.outer(np.asarray(vs), np.asarray(ws)) - costs
+        reduced_costs[basis_mask] = 0
+        return reduced_costs
 
     @staticmethod
-    def get_cs(bfs: list[tuple[tuple[int], int]], costs: list[list[int]], vs: list[int], ws: list[int]) -> list[tuple[tuple[int], int]]:
+    def get_cs(bfs: Basis | list[tuple[tuple[int], int]], costs: list[list[int]], vs: list[int], ws: list[int]) -> list[tuple[tuple[int], int]]:
         """
         Calculates the costs of non-basic variables in the Modified Distribution method.
 
         Args:
-            bfs (list[tuple[tuple[int], int]]): Basic feasible solution.
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
             costs (list[list[int]]): Cost matrix.
             vs (list[int]): List of v values.
             ws (list[int]): List of w values.
@@ -107,45 +982,83 @@ class Logics:
         Returns:
             list[tuple[tuple[int], int]]: Costs of non-basic variables.
         """
-        cs = []
-        for i, row in enumerate(costs):
-            for j, cost in enumerate(row):
-                non_basic = all([p[0] != i or p[1] != j for p, v in bfs])
-                if non_basic:
-                    cs.append(((i, j), vs[i] + ws[j] - cost))
-
-        return cs
+        costs_array = np.asarray(costs)
+        basis_mask = Logics.get_basis_mask(bfs, *costs_array.shape)
+        reduced_costs = Logics.get_reduced_costs(
+            basis_mask, costs_array, vs, ws)
+        return [((int(i), int(j)), reduced_costs[i, j].item()) for i, j in np.argwhere(~basis_mask)]
 
     @staticmethod
-    def can_be_improved(cs: list[tuple[tuple[int], int]]) -> bool:
+    def can_be_improved(cs: np.ndarray | list[tuple[tuple[int], int]]) -> bool:
         """
         Checks if any cost of non-basic variables can be improved.
 
         Args:
-            cs (list[tuple[tuple[int], int]]): Costs of non-basic variables.
+            cs (np.ndarray | list[tuple[tuple[int], int]]): Reduced cost matrix or costs of non-basic variables.
 
         Returns:
             bool: True if any cost can be improved, False otherwise.
         """
+        if isinstance(cs, np.ndarray):
+            return bool((cs > 0).any())
         for p, v in cs:
             if v > 0:
                 return True
         return False
 
     @staticmethod
-    def get_entering_variable_position(cs: list[tuple[tuple[int], int]]) -> tuple[int, int]:
+    def get_entering_variable_position(cs: np.ndarray | list[tuple[tuple[int], int]]) -> tuple[int, int]:
         """
         Finds the entering variable position with the highest cost.
 
         Args:
-            cs (list[tuple[tuple[int], int]]): Costs of non-basic variables.
+            cs (np.ndarray | list[tuple[tuple[int], int]]): Reduced cost matrix or costs of non-basic variables.
 
         Returns:
             tuple[int, int]: Entering variable position.
         """
-        cs_copy = cs.copy()
-        cs_copy.sort(key=lambda w: w[1])
-        return cs_copy[-1][0]
+        if isinstance(cs, np.ndarray):
+            i, j = np.unravel_index(np.argmax(cs), cs.shape)
+            return int(i), int(j)
+        return max(cs, key=lambda w: w[1])[0]
+
+    @staticmethod
+    def get_tree_pointers(bv_positions: Basis | list[tuple[int, int]], rows: int, columns: int) -> tuple[list[int], list[int]]:
+        """
+        Roots the basis spanning tree and returns parent and depth pointers.
+
+        Rows are nodes 0 to rows - 1 and columns are nodes rows to rows + columns - 1.
+        Every component of a degenerate basis gets its own root with parent -1.
+
+        Args:
+            bv_positions (Basis | list[tuple[int, int]]): Basis or positions of basic variables.
+            rows (int): Number of rows (sources).
+            columns (int): Number of columns (destinations).
+
+        Returns:
+            tuple[list[int], list[int]]: Parent and depth of every node.
+        """
+        if isinstance(bv_positions, Basis):
+            bv_positions = bv_positions.positions()
+        adjacency = [[] for _ in range(rows + columns)]
+        for i, j in bv_positions:
+            adjacency[i].append(rows + j)
+            adjacency[rows + j].append(i)
+        parent = [-1] * (rows + columns)
+        depth = [None] * (rows + columns)
+        for root in range(rows + columns):
+            if depth[root] is not None:
+                continue
+            depth[root] = 0
+            queue = deque([root])
+            while queue:
+                node = queue.popleft()
+                for next_node in adjacency[node]:
+                    if depth[next_node] is None:
+                        parent[next_node] = node
+                        depth[next_node] = depth[node] + 1
+                        queue.append(next_node)
+        return parent, depth
 
     @staticmethod
     def get_possible_next_nodes(loop: list[tuple[int, int]], not_visited: list[tuple[int, int]]) -> list[tuple[int, int]]:
@@ -171,33 +1084,87 @@ class Logics:
                 return nodes_in_column
             return nodes_in_row
 
-    def get_loop(self, bv_positions: list[tuple[int, int]], ev_position: tuple[int, int]) -> list[tuple[int, int]]:
+    def get_loop(self, bv_positions: Basis | list[tuple[int, int]], ev_position: tuple[int, int], shape: tuple[int, int] = None) -> list[tuple[int, int]] | None:
         """
         Finds a loop containing the entering variable position.
 
+        Both ends of the entering cell are walked up the basis tree to their
+        common ancestor, so the work is proportional to the loop length. A
+        Basis keeps its tree pointers between calls (see Basis.build_tree)
+        and loop_pivoting updates them, while a list of positions is rooted
+        again on every call.
+
         Args:
-            bv_positions (list[tuple[int, int]]): Positions of basic variables.
+            bv_positions (Basis | list[tuple[int, int]]): Basis or positions of basic variables.
             ev_position (tuple[int, int]): Entering variable position.
+            shape (tuple[int, int], optional): Number of rows and columns. Defaults to None, the pointers of a Basis or else the largest positions.
 
         Returns:
-            list[tuple[int, int]]: Loop containing the entering variable position.
+            list[tuple[int, int]] | None: Loop containing the entering variable position, None when the basis does not connect its ends.
         """
-        def inner(loop: list[tuple[int, int]]) -> list[tuple[int, int]]:
-            if len(loop) > 3:
-                can_be_closed = len(
-                    self.get_possible_next_nodes(loop, [ev_position])) == 1
-                if can_be_closed:
-                    return loop
+        if isinstance(bv_positions, Basis) and ev_position not in bv_positions:
+            if bv_positions.shape is None or shape not in (None, bv_positions.shape):
+                if shape is None:
+                    shape = (max(bv_positions.rows, default=-1) + 1, max(bv_positions.columns, default=-1) + 1)
+                bv_positions.build_tree(max(shape[0], ev_position[0] + 1), max(shape[1], ev_position[1] + 1))
+            rows = bv_positions.shape[0]
+            parent, depth = bv_positions.parent, bv_positions.depth
+        else:
+            if isinstance(bv_positions, Basis):
+                bv_positions = bv_positions.positions()
+            tree_positions = [p for p in bv_positions if p != ev_position]
+            if shape is None:
+                shape = (max(p[0] for p in tree_positions + [ev_position]) + 1,
+                         max(p[1] for p in tree_positions + [ev_position]) + 1)
+            rows = shape[0]
+            parent, depth = self.get_tree_pointers(tree_positions, *shape)
+
+        def get_cell(node: int, parent_node: int) -> tuple[int, int]:
+            if node < rows:
+                return node, parent_node - rows
+            return parent_node, node - rows
+
+        row_node = ev_position[0]
+        column_node = rows + ev_position[1]
+        row_path = []
+        column_path = []
+        while row_node != column_node:
+            if depth[row_node] >= depth[column_node]:
+                if parent[row_node] == -1:
+                    return None
+                row_path.append(get_cell(row_node, parent[row_node]))
+                row_node = parent[row_node]
+            else:
+                if parent[column_node] == -1:
+                    return None
+                column_path.append(get_cell(column_node, parent[column_node]))
+                column_node = parent[column_node]
 
-            not_visited = list(set(bv_positions) - set(loop))
-            possible_next_nodes = self.get_possible_next_nodes(
-                loop, not_visited)
-            for next_node in possible_next_nodes:
-                new_loop = inner(loop + [next_node])
-                if new_loop:
-                    return new_loop
+        return [ev_position] + row_path + column_path[::-1]
+
+    @staticmethod
+    def loop_pivoting(bfs: Basis | list[tuple[tuple[int], int]], loop: list[tuple[int, int]]) -> Basis | list[tuple[tuple[int], int]]:
+        """
+        Moves flow around the loop and swaps the leaving variable for the entering one.
+
+        A Basis is updated in place in O(len(loop)), plus the re-hung subtree
+        when it keeps tree pointers; the list form is copied.
+
+        Args:
+            bfs (Basis | list[tuple[tuple[int], int]]): Basic feasible solution.
+            loop (list[tuple[int, int]]): Loop starting at the entering variable position.
+
+        Returns:
+            Basis | list[tuple[tuple[int], int]]: Basic feasible solution after the pivot, in the same form as bfs.
+        """
+        basis = Basis.from_list(bfs)
+        leaving_position = min(loop[1::2], key=basis.__getitem__)
+        leaving_value = basis[leaving_position]
+        for index, p in enumerate(loop[1:], 1):
+            basis[p] += leaving_value if index % 2 == 0 else -leaving_value
+        basis.replace(leaving_position, loop[0], leaving_value)
 
-        return inner([ev_position])
+        return basis if isinstance(bfs, Basis) else basis.to_list()
 
     @staticmethod
     def get_total_cost(costs: list[list[int]], solution: list[list[int]]) -> int:
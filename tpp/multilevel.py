@@ -0,0 +1,151 @@
+import numpy as np
+from typing import Iterator
+from .logics import Logics, PaddedCosts, SparseCosts
+from .network_simplex import NetworkSimplex
+
+# Fine columns merged into one super-node per level.
+COARSENING: int = 10
+# Problems with at most this many columns are started with Vogel's method.
+COARSEST_COLUMNS: int = 200
+# Dimensions the cost vectors are projected to before clustering.
+PROJECTED_ROWS: int = 16
+# Cells read or compared at once.
+BLOCK_CELLS: int = 1 << 20
+
+
+def get_row_blocks(costs: np.ndarray | PaddedCosts) -> Iterator[tuple[int, int, np.ndarray]]:
+    """
+    Reads a cost matrix in blocks of rows of about BLOCK_CELLS cells, so clustering and coarsening hold one block at a time.
+
+    Args:
+    costs (np.ndarray | PaddedCosts): Cost matrix, possibly a numpy.memmap.
+
+    Returns:
+    Iterator[tuple[int, int, np.ndarray]]: First row, row after the last row and costs of every block.
+    """
+    rows, columns = costs.shape
+    block_rows = max(1, BLOCK_CELLS // max(1, columns))
+    for start in range(0, rows, block_rows):
+        stop = min(start + block_rows, rows)
+        yield start, stop, costs.get_rows(start, stop) if isinstance(costs, PaddedCosts) else np.asarray(costs[start:stop])
+
+
+def cluster_columns(costs: np.ndarray | PaddedCosts, clusters: int, iterations: int = 5, seed: int = 0) -> np.ndarray:
+    """
+    Groups the columns with similar cost vectors by k-means.
+
+    Cost vectors longer than PROJECTED_ROWS are first projected to
+    PROJECTED_ROWS random directions, which keeps their distances roughly
+    and makes every iteration O(columns * clusters * PROJECTED_ROWS).
+
+    Args:
+    costs (np.ndarray | PaddedCosts): Cost matrix, one cost vector per column.
+    clusters (int): Number of clusters wanted.
+    iterations (int, optional): Lloyd iterations. Defaults to 5.
+    seed (int, optional): Seed of the projection and the first centers. Defaults to 0.
+
+    Returns:
+    np.ndarray: Cluster of every column, numbered from 0 without gaps.
+    """
+    rng = np.random.default_rng(seed)
+    rows, columns = costs.shape
+    if rows > PROJECTED_ROWS:
+        projection = rng.standard_normal((rows, PROJECTED_ROWS))
+        points = np.zeros((columns, PROJECTED_ROWS))
+        for start, stop, block in get_row_blocks(costs):
+            points += block.T @ projection[start:stop]
+    else:
+        points = np.vstack([block for _, _, block in get_row_blocks(costs)]).T.astype(np.float64)
+    centers = points[rng.choice(columns, clusters, replace=False)]
+    labels = np.zeros(columns, dtype=np.intp)
+    block_columns = max(1, BLOCK_CELLS // clusters)
+    for _ in range(iterations):
+        center_norms = (centers ** 2).sum(axis=1)
+        for start in range(0, columns, block_columns):
+            block = points[start:start + block_columns]
+            labels[start:start + block_columns] = (center_norms - 2 * block @ centers.T).argmin(axis=1)
+        counts = np.bincount(labels, minlength=clusters)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, points)
+        used = counts > 0
+        centers[used] = sums[used] / counts[used, None]
+    return np.unique(labels, return_inverse=True)[1].ravel()
+
+
+def get_multilevel_bfs(supply: list[int], demand: list[int], costs: list[list[int]] | np.ndarray | PaddedCosts) -> list[tuple[tuple[int, int], int]]:
+    """
+    Finds an initial basic feasible solution guided by the solution of a coarser problem.
+
+    The columns are clustered by their cost vectors into super-nodes of
+    about COARSENING columns, each with the total demand of its columns and
+    their demand-weighted mean costs. The coarse problem is started the same
+    way, recursively, and solved by the network simplex engine. Its row
+    potentials price every source for the whole problem, so the coarse
+    solution is expanded through them: Vogel's method runs on the costs
+    reduced by those potentials (and by the cheapest reduced cost of every
+    column), which steers it to the cells the coarse optimum finds cheap.
+    Costs without similar columns give the coarse problem little to share,
+    so plain Vogel's method runs too and the cheaper start is kept.
+
+    Only clustering and coarsening read the costs in blocks. The reduced costs
+    are a dense float matrix of the whole problem, and Vogel's method works on
+    its own dense copy of the matrix it is given, so the guided start holds
+    two full copies at once.
+
+    Args:
+    supply (list[int]): Balanced supply values.
+    demand (list[int]): Balanced demand values.
+    costs (list[list[int]] | np.ndarray | PaddedCosts): Balanced cost matrix, possibly a numpy.memmap.
+
+    Raises:
+    Exception: When the costs are sparse.
+
+    Returns:
+    list[tuple[tuple[int, int], int]]: Initial basic feasible solution.
+    """
+    if isinstance(costs, SparseCosts):
+        raise Exception('The multilevel start needs a dense cost matrix')
+    if not isinstance(costs, PaddedCosts):
+        costs = np.asarray(costs)
+    rows, columns = costs.shape
+    if columns <= COARSEST_COLUMNS:
+        return Logics.vogel_approximation(supply, demand, costs)
+
+    labels = cluster_columns(costs, -(-columns // COARSENING))
+    clusters = int(labels.max()) + 1
+    fine_demand = np.asarray(demand)
+    order = np.argsort(labels, kind='stable')
+    starts = np.searchsorted(labels[order], np.arange(clusters + 1))[:-1]
+    coarse_demand = np.add.reduceat(fine_demand[order], starts)
+    weights = np.where(coarse_demand[labels] > 0, fine_demand, 1).astype(np.float64)[order]
+    coarse_costs = np.empty((rows, clusters))
+    for start, stop, block in get_row_blocks(costs):
+        coarse_costs[start:stop] = np.add.reduceat(block[:, order] * weights, starts, axis=1)
+    coarse_costs /= np.add.reduceat(weights, starts)
+
+    coarse = NetworkSimplex(coarse_costs, get_multilevel_bfs(supply, coarse_demand.tolist(), coarse_costs))
+    coarse.solve()
+
+    reduced_costs = np.empty((rows, columns))
+    for start, stop, block in get_row_blocks(costs):
+        np.subtract(block, coarse.vs[start:stop, None], out=reduced_costs[start:stop])
+    reduced_costs -= reduced_costs.min(axis=0)
+    guided = Logics.vogel_approximation(supply, demand, reduced_costs)
+    del reduced_costs
+    plain = Logics.vogel_approximation(supply, demand, costs)
+    return min(guided, plain, key=lambda bfs: get_start_cost(costs, bfs))
+
+
+def get_start_cost(costs: np.ndarray | PaddedCosts, bfs: list[tuple[tuple[int, int], int]]) -> float:
+    """
+    Returns the cost of a basic feasible solution, reading only its cells.
+
+    Args:
+    costs (np.ndarray | PaddedCosts): Cost matrix.
+    bfs (list[tuple[tuple[int, int], int]]): Basic feasible solution.
+
+    Returns:
+    float: Total cost of the flows.
+    """
+    positions = np.array([position for position, _ in bfs], dtype=np.intp).reshape(-1, 2)
+    return float(np.dot(costs[positions[:, 0], positions[:, 1]], [v for _, v in bfs]))
@@ -0,0 +1,615 @@
+import time
+import numpy as np
+from typing import Callable
+from .instrumentation import SolverStats
+from .logics import Basis, Logics, PaddedCosts, SparseCosts
+from .pricing import BlandPricing, PricingRule, get_pricing_rule
+from .result import SolverResult
+
+
+class NetworkSimplex:
+    """
+    Network simplex engine for balanced transportation problems.
+
+    The basis is kept as a spanning tree over the row nodes 0 to m - 1 and the
+    column nodes m to m + n - 1, rooted at row 0. Every node stores its parent,
+    its depth and its tree neighbours, and the potentials live in two arrays.
+    A pivot only re-hangs the subtree cut off by the leaving cell, and only the
+    potentials inside that subtree are shifted.
+
+    Ties for the leaving cell are broken with Cunningham's rule (the last
+    blocking cell met when the loop is traversed from its apex in the direction
+    of the entering cell). This keeps a strongly feasible tree strongly
+    feasible, so degenerate pivots cannot cycle once the tree is strongly
+    feasible. Starting trees are not always strongly feasible, so solve also
+    falls back to Bland's rule after a run of degenerate pivots.
+
+    With SparseCosts only the routes are priced, so pricing works on arrays
+    of one entry per route. Basic cells on missing routes are artificial
+    routes with the cost big_m: they can leave the basis but never re-enter,
+    and solve raises an exception when an optimal basis still ships over one.
+    Pricing rules address cells by a flat index, row-major over the matrix
+    for dense costs and the route index for sparse costs; see row_start,
+    get_position, price_rows and price_cells.
+
+    Attributes:
+    costs (np.ndarray | SparseCosts): Balanced cost matrix or routes.
+    rows (int): Number of rows (sources).
+    columns (int): Number of columns (destinations).
+    big_m (int | None): Cost of artificial routes, None for dense costs.
+    basis (Basis): Flow on every basic cell.
+    basis_mask (np.ndarray | None): Boolean matrix that is True at basic cells, one flag per route for sparse costs. None for memory-mapped costs, whose blocks take their basic cells from the basis instead.
+    parent (list[int]): Parent of every node, -1 for the root.
+    depth (list[int]): Depth of every node.
+    adjacency (list[set[int]]): Tree neighbours of every node.
+    vs (np.ndarray): Row potentials.
+    ws (np.ndarray): Column potentials.
+    pricing (PricingRule): Rule that chooses the entering cells.
+    iterations (int): Number of pivots done so far.
+    status (str | None): SolverResult status of the last solve, None before solving.
+    stats (SolverStats | None): Timers and counters, None to skip them.
+    callback (Callable | None): Called after every pivot of solve as callback(iteration, objective, ev_position, leaving_position).
+    """
+
+    LOGIC_HANDLER: Logics = Logics()
+
+    def __init__(self, costs: np.ndarray | list[list[int]] | SparseCosts, bfs: Basis | list[tuple[tuple[int, int], int]], pricing: str | PricingRule = 'dantzig', stats: SolverStats = None, callback: Callable = None) -> None:
+        """
+        Builds the basis tree from a basic feasible solution.
+
+        Args:
+        costs (np.ndarray | list[list[int]] | PaddedCosts | SparseCosts): Balanced cost matrix or routes, possibly a numpy.memmap.
+        bfs (Basis | list[tuple[tuple[int, int], int]]): Initial basic feasible solution, copied into the engine.
+        pricing (str | PricingRule, optional): Pricing rule or its name, see get_pricing_rule. Defaults to 'dantzig'.
+        stats (SolverStats, optional): Timers and counters to fill in, the tree build counts as the potentials phase. Defaults to None.
+        callback (Callable, optional): Called after every pivot of solve with the iteration, the objective and the entering and leaving cells. Defaults to None.
+
+        Raises:
+        Exception: When the basic feasible solution contains a loop with positive flow.
+        """
+        if isinstance(costs, SparseCosts):
+            self.costs = costs
+            self.big_m = costs.get_big_m()
+            self.basis_mask = np.zeros(costs.nnz, dtype=bool)
+            dtype = np.result_type(costs.data, np.asarray(self.big_m))
+        else:
+            self.costs = costs if isinstance(costs, PaddedCosts) else np.asarray(costs)
+            self.big_m = None
+            # A mask as large as a memory-mapped matrix would defeat the mapping.
+            mapped = isinstance(costs.costs if isinstance(costs, PaddedCosts) else costs, np.memmap)
+            self.basis_mask = None if mapped else np.zeros(self.costs.shape, dtype=bool)
+            dtype = self.costs.dtype
+        self.rows, self.columns = self.costs.shape
+        self.basis = Basis(bfs)
+        self.parent = [-1] * (self.rows + self.columns)
+        self.depth = [0] * (self.rows + self.columns)
+        self.adjacency = [set() for _ in range(self.rows + self.columns)]
+        self.vs = np.zeros(self.rows, dtype=dtype)
+        self.ws = np.zeros(self.columns, dtype=dtype)
+        self.pricing = get_pricing_rule(pricing)
+        self.iterations = 0
+        self.status = None
+        self.stats = stats
+        self.callback = callback
+        started = time.perf_counter()
+
+        for (i, j), v in self.basis:
+            self.adjacency[i].add(self.rows + j)
+            self.adjacency[self.rows + j].add(i)
+        self.build_tree()
+        if stats is not None:
+            stats.add_time('potentials', time.perf_counter() - started)
+
+    def get_cell(self, node: int) -> tuple[int, int]:
+        """
+        Returns the basic cell linking a node to its parent.
+
+        Args:
+        node (int): A non-root node.
+
+        Returns:
+        tuple[int, int]: Position of the tree cell above the node.
+        """
+        if node < self.rows:
+            return node, self.parent[node] - self.rows
+        return self.parent[node], node - self.rows
+
+    def build_tree(self) -> None:
+        """
+        Sets parents, depths and potentials for the whole tree.
+
+        Components that the initial solution leaves disconnected are linked to
+        the tree with zero-flow cells, and zero-flow cells that close a loop
+        are dropped, so the basis always has exactly m + n - 1 cells.
+
+        Raises:
+        Exception: When the basic feasible solution contains a loop with positive flow.
+        """
+        visited = [False] * (self.rows + self.columns)
+        visited[0] = True
+        for node in self.hang_subtree(0, -1, visited)[1:]:
+            self.set_potential(node)
+        for node in list(range(self.rows, self.rows + self.columns)) + list(range(self.rows)):
+            if visited[node]:
+                continue
+            parent_node = 0 if node >= self.rows else self.rows
+            self.adjacency[node].add(parent_node)
+            self.adjacency[parent_node].add(node)
+            self.basis.add(self.get_cell_between(node, parent_node), 0)
+            visited[node] = True
+            for subtree_node in self.hang_subtree(node, parent_node, visited):
+                self.set_potential(subtree_node)
+
+        for position, v in self.basis.to_list():
+            i, j = position
+            if self.parent[i] == self.rows + j or self.parent[self.rows + j] == i:
+                self.set_basic(position, True)
+                continue
+            if v != 0:
+                raise Exception('Basic feasible solution contains a loop')
+            self.basis.remove(position)
+            self.adjacency[i].discard(self.rows + j)
+            self.adjacency[self.rows + j].discard(i)
+
+    def get_cost(self, position: tuple[int, int]) -> int:
+        """
+        Returns the cost of a cell, big_m for a missing route.
+
+        Args:
+        position (tuple[int, int]): Position of the cell.
+
+        Returns:
+        int: Cost of the cell.
+        """
+        if self.big_m is None:
+            return self.costs[position]
+        return self.costs.get(*position, self.big_m)
+
+    def set_basic(self, position: tuple[int, int], basic: bool) -> None:
+        """
+        Marks a cell as basic or non-basic in basis_mask.
+
+        Args:
+        position (tuple[int, int]): Position of the cell.
+        basic (bool): True when the cell enters the basis.
+        """
+        if self.big_m is None:
+            if self.basis_mask is not None:
+                self.basis_mask[position] = basic
+            return
+        k = self.costs.find(*position)
+        if k >= 0:
+            self.basis_mask[k] = basic
+
+    def row_start(self, row: int) -> int:
+        """
+        Returns the flat index of the first cell of a row.
+
+        Args:
+        row (int): A row, or rows for the end of the last row.
+
+        Returns:
+        int: Flat index.
+        """
+        if self.big_m is None:
+            return row * self.columns
+        return int(self.costs.indptr[row])
+
+    def get_position(self, index: int) -> tuple[int, int]:
+        """
+        Returns the position of the cell with a flat index.
+
+        Args:
+        index (int): Flat index.
+
+        Returns:
+        tuple[int, int]: Position of the cell.
+        """
+        if self.big_m is None:
+            return divmod(int(index), self.columns)
+        return int(self.costs.arc_rows[index]), int(self.costs.indices[index])
+
+    def get_basic_indices(self) -> np.ndarray:
+        """
+        Returns the flat indices of the basic cells of a dense problem.
+
+        Returns:
+        np.ndarray: One flat index per basic cell.
+        """
+        return np.frombuffer(self.basis.rows, dtype=np.int64) * self.columns + np.frombuffer(self.basis.columns, dtype=np.int64)
+
+    def price_rows(self, start: int, stop: int) -> np.ndarray:
+        """
+        Calculates the reduced costs of the cells in a block of rows.
+
+        Args:
+        start (int): First row of the block.
+        stop (int): Row after the last row of the block.
+
+        Returns:
+        np.ndarray: Reduced costs in flat index order from row_start(start), zero at basic cells.
+        """
+        if self.stats is not None:
+            self.stats.priced_cells += self.row_start(stop) - self.row_start(start)
+        if self.big_m is not None:
+            return self.price_cells(np.arange(self.costs.indptr[start], self.costs.indptr[stop]))
+        cs = np.add.outer(self.vs[start:stop], self.ws)
+        if isinstance(self.costs, PaddedCosts):
+            # Subtract straight from the padded costs instead of copying a block of them.
+            self.costs.subtract_rows(cs, start, stop)
+        else:
+            cs -= self.costs[start:stop]
+        cs = cs.ravel()
+        if self.basis_mask is None:
+            basic = self.get_basic_indices()
+            basic = basic[(basic >= self.row_start(start)) & (basic < self.row_start(stop))]
+            cs[basic - self.row_start(start)] = 0
+        else:
+            cs[self.basis_mask[start:stop].ravel()] = 0
+        return cs
+
+    def price_cells(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Calculates the reduced costs of cells given by flat indices.
+
+        Args:
+        indices (np.ndarray): Flat indices.
+
+        Returns:
+        np.ndarray: Reduced costs, zero at basic cells.
+        """
+        if self.stats is not None:
+            self.stats.priced_cells += len(indices)
+        if self.big_m is None:
+            i, j = np.divmod(indices, self.columns)
+            cs = self.vs[i] + self.ws[j] - self.costs[i, j]
+            cs[np.isin(indices, self.get_basic_indices()) if self.basis_mask is None else self.basis_mask[i, j]] = 0
+            return cs
+        cs = self.vs[self.costs.arc_rows[indices]] + self.ws[self.costs.indices[indices]] - self.costs.data[indices]
+        cs[self.basis_mask[indices]] = 0
+        return cs
+
+    def get_cell_between(self, node: int, other_node: int) -> tuple[int, int]:
+        """
+        Returns the cell joining a row node and a column node.
+
+        Args:
+        node (int): A row or column node.
+        other_node (int): A node on the other side.
+
+        Returns:
+        tuple[int, int]: Position of the cell.
+        """
+        if node < self.rows:
+            return node, other_node - self.rows
+        return other_node, node - self.rows
+
+    def hang_subtree(self, node: int, parent_node: int, visited: list[bool] = None) -> list[int]:
+        """
+        Hangs the subtree reachable from a node below its parent.
+
+        Parents and depths are recomputed for the subtree only.
+
+        Args:
+        node (int): Root of the subtree.
+        parent_node (int): New parent of the root, -1 for the tree root.
+        visited (list[bool], optional): Nodes already placed in the tree. Defaults to None.
+
+        Returns:
+        list[int]: Nodes of the subtree, every parent listed before its children.
+        """
+        self.parent[node] = parent_node
+        self.depth[node] = 0 if parent_node == -1 else self.depth[parent_node] + 1
+        subtree = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            subtree.append(current)
+            for next_node in self.adjacency[current]:
+                if next_node == self.parent[current]:
+                    continue
+                if visited is not None:
+                    if visited[next_node]:
+                        continue
+                    visited[next_node] = True
+                self.parent[next_node] = current
+                self.depth[next_node] = self.depth[current] + 1
+                stack.append(next_node)
+        return subtree
+
+    def set_potential(self, node: int) -> None:
+        """
+        Sets the potential of a node from its parent so that u + w = cost on the tree cell.
+
+        Args:
+        node (int): A non-root node.
+        """
+        i, j = self.get_cell(node)
+        if node < self.rows:
+            self.vs[i] = self.get_cost((i, j)) - self.ws[j]
+        else:
+            self.ws[j] = self.get_cost((i, j)) - self.vs[i]
+
+    def get_loop(self, ev_position: tuple[int, int]) -> tuple[list[tuple[int, int]], list[int], list[int]]:
+        """
+        Finds the loop closed by the entering cell.
+
+        Args:
+        ev_position (tuple[int, int]): Entering variable position.
+
+        Returns:
+        tuple[list[tuple[int, int]], list[int], list[int]]: The loop in the usual
+        entering-first order, and the child nodes of the tree cells on the row
+        side and on the column side, each ordered from the entering cell up to the apex.
+        """
+        row_node = ev_position[0]
+        column_node = self.rows + ev_position[1]
+        row_path = []
+        column_path = []
+        while row_node != column_node:
+            if self.depth[row_node] >= self.depth[column_node]:
+                row_path.append(row_node)
+                row_node = self.parent[row_node]
+            else:
+                column_path.append(column_node)
+                column_node = self.parent[column_node]
+        loop = [ev_position] + [self.get_cell(node) for node in row_path] + \
+            [self.get_cell(node) for node in column_path[::-1]]
+        return loop, row_path, column_path
+
+    def pivot(self, ev_position: tuple[int, int], bland: bool = False) -> tuple[tuple[int, int], int]:
+        """
+        Brings a cell into the basis and updates flows, tree and potentials.
+
+        Args:
+        ev_position (tuple[int, int]): Entering variable position.
+        bland (bool, optional): Break leaving ties by the lowest position instead of Cunningham's rule. Defaults to False.
+
+        Returns:
+        tuple[tuple[int, int], int]: Leaving variable position and the amount moved around the loop.
+        """
+        i, j = ev_position
+        started = None if self.stats is None else time.perf_counter()
+        loop, row_path, column_path = self.get_loop(ev_position)
+        if started is not None:
+            looped = time.perf_counter()
+            self.stats.add_time('loop', looped - started)
+
+        # Traverse the loop from the apex in the direction of the entering cell:
+        # down the row side to row i, then up the column side from column j.
+        traversal = [(node, index % 2 == 0) for index, node in reversed(list(enumerate(row_path)))] + \
+            [(node, index % 2 == 0) for index, node in enumerate(column_path)]
+        theta = min(self.basis[self.get_cell(node)] for node, decreasing in traversal if decreasing)
+        blocking = [node for node, decreasing in traversal
+                    if decreasing and self.basis[self.get_cell(node)] == theta]
+        leaving_node = min(blocking, key=self.get_cell) if bland else blocking[-1]
+        leaving_position = self.get_cell(leaving_node)
+
+        for node, decreasing in traversal:
+            self.basis[self.get_cell(node)] += -theta if decreasing else theta
+        self.basis.replace(leaving_position, ev_position, theta)
+        self.set_basic(leaving_position, False)
+        self.set_basic(ev_position, True)
+
+        delta = self.vs[i] + self.ws[j] - self.get_cost(ev_position)
+        parent_node = self.parent[leaving_node]
+        self.adjacency[leaving_node].discard(parent_node)
+        self.adjacency[parent_node].discard(leaving_node)
+        self.adjacency[i].add(self.rows + j)
+        self.adjacency[self.rows + j].add(i)
+        if leaving_node in row_path:
+            subtree = np.array(self.hang_subtree(i, self.rows + j))
+        else:
+            subtree = np.array(self.hang_subtree(self.rows + j, i))
+            delta = -delta
+        self.vs[subtree[subtree < self.rows]] -= delta
+        self.ws[subtree[subtree >= self.rows] - self.rows] += delta
+
+        self.iterations += 1
+        if started is not None:
+            self.stats.add_time('pivoting', time.perf_counter() - looped)
+            self.stats.record_pivot(len(loop), theta, bland)
+        return leaving_position, theta
+
+    def set_flows(self, supply: list[int], demand: list[int]) -> None:
+        """
+        Recomputes the flow on every basic cell for new supply and demand values.
+
+        The flows of a spanning tree are fixed by the quantities: every tree
+        cell carries the net supply of the subtree below it. The result can be
+        negative when the quantities no longer fit the basis, see repair.
+
+        Args:
+        supply (list[int]): Balanced supply values.
+        demand (list[int]): Balanced demand values.
+        """
+        excess = list(supply) + [-d for d in demand]
+        flows = []
+        for node in reversed(self.hang_subtree(0, -1)[1:]):
+            parent_node = self.parent[node]
+            excess[parent_node] += excess[node]
+            flows.append((self.get_cell(node), excess[node] if node < self.rows else -excess[node]))
+        self.basis = Basis(flows)
+
+    def repair(self, supply: list[int], demand: list[int], max_pivots: int = None) -> bool:
+        """
+        Restores primal feasibility with dual simplex pivots.
+
+        The most negative basic cell leaves. Removing it cuts off a subtree
+        that either lacks or has too much supply, and the entering cell is the
+        cell crossing the cut in the needed direction whose reduced cost is
+        closest to zero, so an optimal basis stays dual feasible. Only the
+        potentials of the cut-off subtree change.
+
+        Args:
+        supply (list[int]): Balanced supply values.
+        demand (list[int]): Balanced demand values.
+        max_pivots (int, optional): Pivots allowed before giving up. Defaults to None, rows + columns.
+
+        Raises:
+        Exception: When no route crosses the cut, so the routes cannot carry supply to demand.
+
+        Returns:
+        bool: True when every basic cell is non-negative.
+        """
+        max_pivots = self.rows + self.columns if max_pivots is None else max_pivots
+        self.set_flows(supply, demand)
+        pivots = 0
+        while True:
+            leaving_position, value = min(self.basis, key=lambda item: item[1])
+            if value >= 0:
+                return True
+            if pivots == max_pivots:
+                return False
+            i, j = leaving_position
+            child = i if self.parent[i] == self.rows + j else self.rows + j
+            in_subtree = np.zeros(self.rows + self.columns, dtype=bool)
+            in_subtree[self.hang_subtree(child, self.parent[child])] = True
+            # A row child lacks supply, so flow must enter the subtree's columns;
+            # a column child has too much, so flow must leave its rows.
+            if child < self.rows:
+                entering_rows, entering_columns = ~in_subtree[:self.rows], in_subtree[self.rows:]
+            else:
+                entering_rows, entering_columns = in_subtree[:self.rows], ~in_subtree[self.rows:]
+            if self.big_m is None:
+                rows, columns = np.flatnonzero(entering_rows), np.flatnonzero(entering_columns)
+                cs = np.add.outer(self.vs[rows], self.ws[columns]) - self.costs[np.ix_(rows, columns)]
+                k, l = np.unravel_index(np.argmax(cs), cs.shape)
+                ev_position = int(rows[k]), int(columns[l])
+            else:
+                arcs = np.flatnonzero(entering_rows[self.costs.arc_rows] & entering_columns[self.costs.indices])
+                if not arcs.size:
+                    raise Exception(
+                        f'Problem is infeasible: no route links rows {np.flatnonzero(entering_rows).tolist()} '
+                        f'to columns {np.flatnonzero(entering_columns).tolist()}')
+                ev_position = self.get_position(arcs[np.argmax(self.price_cells(arcs))])
+
+            k, l = ev_position
+            delta = self.vs[k] + self.ws[l] - self.get_cost(ev_position)
+            self.adjacency[child].discard(self.parent[child])
+            self.adjacency[self.parent[child]].discard(child)
+            self.adjacency[k].add(self.rows + l)
+            self.adjacency[self.rows + l].add(k)
+            if child < self.rows:
+                self.hang_subtree(self.rows + l, k)
+            else:
+                self.hang_subtree(k, self.rows + l)
+                delta = -delta
+            self.vs[in_subtree[:self.rows]] += delta
+            self.ws[in_subtree[self.rows:]] -= delta
+            self.basis.replace(leaving_position, ev_position, 0)
+            self.set_basic(leaving_position, False)
+            self.set_basic(ev_position, True)
+            self.iterations += 1
+            pivots += 1
+            self.set_flows(supply, demand)
+
+    def has_entering_cell(self, rows: np.ndarray, columns: np.ndarray, indices: np.ndarray) -> bool:
+        """
+        Checks part of the cells for a positive reduced cost.
+
+        Used after a warm start, when only the cells in rows or columns whose
+        potentials moved, or whose costs changed, can have become attractive.
+
+        Args:
+        rows (np.ndarray): Rows priced in full.
+        columns (np.ndarray): Columns priced in full.
+        indices (np.ndarray): Flat indices of further cells to price.
+
+        Returns:
+        bool: True when one of these cells can enter the basis.
+        """
+        if self.big_m is None and self.basis_mask is None:
+            cells = np.concatenate([(np.asarray(rows)[:, None] * self.columns + np.arange(self.columns)).ravel(),
+                                    (np.arange(self.rows)[:, None] * self.columns + columns).ravel(), indices])
+            return bool((self.price_cells(cells.astype(np.intp)) > 0).any())
+        if self.big_m is None:
+            cs = self.vs[rows, None] + self.ws - self.costs[rows]
+            if (cs[~self.basis_mask[rows]] > 0).any():
+                return True
+            cs = self.vs[:, None] + self.ws[columns] - self.costs[:, columns]
+            if (cs[~self.basis_mask[:, columns]] > 0).any():
+                return True
+            return bool((self.price_cells(indices) > 0).any())
+        selected = np.isin(self.costs.arc_rows, rows) | np.isin(self.costs.indices, columns)
+        selected[indices] = True
+        return bool((self.price_cells(np.flatnonzero(selected)) > 0).any())
+
+    def solve(self, max_iterations: int = None, time_limit: float = None) -> list[tuple[tuple[int, int], int]]:
+        """
+        Pivots until no non-basic cell has a positive reduced cost or a limit is hit.
+
+        After rows + columns degenerate pivots in a row the engine switches to
+        Bland's rule until a pivot moves flow again. The outcome is stored in
+        status.
+
+        Args:
+        max_iterations (int, optional): Maximum number of pivots for this call. Defaults to None.
+        time_limit (float, optional): Maximum number of seconds for this call. Defaults to None.
+
+        Raises:
+        Exception: When the optimal basis ships over a missing route, so the routes cannot carry supply to demand.
+
+        Returns:
+        list[tuple[tuple[int, int], int]]: Best basic feasible solution found, optimal when status is OPTIMAL.
+        """
+        started = time.perf_counter()
+        last_iteration = None if max_iterations is None else self.iterations + max_iterations
+        bland_pricing = BlandPricing()
+        stalled = 0
+        if self.callback is not None:
+            objective = sum(self.get_cost(p) * v for p, v in self.basis if v)
+        while True:
+            if last_iteration is not None and self.iterations >= last_iteration:
+                self.status = SolverResult.ITERATION_LIMIT
+                break
+            if time_limit is not None and time.perf_counter() - started >= time_limit:
+                self.status = SolverResult.TIME_LIMIT
+                break
+            bland = stalled >= self.rows + self.columns
+            if self.stats is None:
+                ev_position = (bland_pricing if bland else self.pricing).select_entering(self)
+            else:
+                priced = time.perf_counter()
+                ev_position = (bland_pricing if bland else self.pricing).select_entering(self)
+                self.stats.add_time('pricing', time.perf_counter() - priced)
+                self.stats.pricing_scans += 1
+            if ev_position is None:
+                self.status = SolverResult.OPTIMAL
+                self.check_feasible()
+                break
+            if self.callback is not None:
+                reduced_cost = self.vs[ev_position[0]] + self.ws[ev_position[1]] - self.get_cost(ev_position)
+            leaving_position, theta = self.pivot(ev_position, bland)
+            stalled = stalled + 1 if theta == 0 else 0
+            if self.callback is not None:
+                objective -= theta * reduced_cost
+                self.callback(self.iterations, objective, ev_position, leaving_position)
+        return self.get_bfs()
+
+    def check_feasible(self) -> None:
+        """
+        Checks that no flow is left on artificial routes.
+
+        Raises:
+        Exception: When a basic cell on a missing route carries flow, naming the rows and columns involved.
+        """
+        if self.big_m is None:
+            return
+        artificial = [(position, v) for position, v in self.basis
+                      if v > 0 and self.costs.find(*position) < 0]
+        if artificial:
+            rows = sorted({i for (i, j), v in artificial})
+            columns = sorted({j for (i, j), v in artificial})
+            raise Exception(
+                f'Problem is infeasible: the routes cannot ship {sum(v for p, v in artificial)} units '
+                f'from rows {rows} to columns {columns}')
+
+    def get_bfs(self) -> list[tuple[tuple[int, int], int]]:
+        """
+        Returns the current basis in the list form used by Logics.
+
+        Returns:
+        list[tuple[tuple[int, int], int]]: Current basic feasible solution.
+        """
+        return sorted(self.basis)
@@ -0,0 +1,332 @@
+import numpy as np
+from .logics import Basis, Logics, SparseCosts
+from .result import SolverResult
+
+
+def split_flows(flows: list[tuple[int, int]], capacities: list[tuple[int, int]]) -> list[tuple[int, int, int]]:
+    """
+    Splits flows over parts in order, filling every part before the next.
+
+    Args:
+    flows (list[tuple[int, int]]): Key and amount of every flow.
+    capacities (list[tuple[int, int]]): Index and capacity of every part, together as much as the flows.
+
+    Returns:
+    list[tuple[int, int, int]]: Key, part and amount of every piece.
+    """
+    pieces = []
+    k = 0
+    left = capacities[0][1] if capacities else 0
+    for key, v in flows:
+        while v > 0 and k < len(capacities):
+            amount = min(v, left)
+            if amount > 0:
+                pieces.append((key, capacities[k][0], amount))
+            v -= amount
+            left -= amount
+            if left <= 0:
+                k += 1
+                left = capacities[k][1] if k < len(capacities) else 0
+    return pieces
+
+
+class Presolve:
+    """
+    Shrinks a transportation problem before it is balanced and solved.
+
+    Rows without supply and columns without demand are dropped. When supply
+    and demand are balanced, shipments that the routes force are fixed: a
+    row with a single route left ships all its supply over it, and a column
+    with a single route left receives all its demand over it. Rows with
+    identical costs are then merged into one row with their total supply,
+    and columns with identical costs (and penalties) into one column with
+    their total demand. postsolve splits the flows of a merged row or
+    column back over the rows or columns it came from, which is optimal
+    since their costs are the same.
+
+    Attributes:
+    shape (tuple[int, int]): Shape of the original problem.
+    original_supply (np.ndarray): Supply of the original problem.
+    original_demand (np.ndarray): Demand of the original problem.
+    original_costs (np.ndarray | SparseCosts): Costs of the original problem.
+    original_penalties (np.ndarray | None): Penalties of the original problem.
+    fixed (list[tuple[int, int, int]]): Row, column and amount of every forced shipment.
+    row_groups (list[np.ndarray]): Original rows of every reduced row.
+    column_groups (list[np.ndarray]): Original columns of every reduced column.
+    row_supply (np.ndarray): Supply of every original row left after the forced shipments.
+    column_demand (np.ndarray): Demand of every original column left after the forced shipments.
+    supply (list[int]): Supply of the reduced problem.
+    demand (list[int]): Demand of the reduced problem.
+    costs (np.ndarray | SparseCosts): Costs of the reduced problem.
+    penalties (list[int] | None): Penalties of the reduced problem.
+    """
+
+    LOGIC_HANDLER: Logics = Logics()
+
+    def __init__(self, supply: list[int], demand: list[int], costs: list[list[int]] | np.ndarray | SparseCosts, penalties: list[int] = None) -> None:
+        """
+        Reduces a problem.
+
+        Args:
+        supply (list[int]): List of supply values.
+        demand (list[int]): List of demand values.
+        costs (list[list[int]] | np.ndarray | SparseCosts): Cost matrix or routes. Dense costs are read whole, and the reduced matrix is a copy.
+        penalties (list[int], optional): List of penalties. Defaults to None.
+
+        Raises:
+        Exception: When supply is less than demand and penalties are not provided, or a forced shipment exceeds the demand it goes to.
+        """
+        self.LOGIC_HANDLER.get_balanced_tp(supply, demand, costs, penalties)
+        self.original_supply = np.asarray(supply)
+        self.original_demand = np.asarray(demand)
+        self.original_costs = costs if isinstance(costs, SparseCosts) else np.asarray(costs)
+        self.original_penalties = None if penalties is None else np.asarray(penalties)
+        self.shape = (self.original_supply.size, self.original_demand.size)
+        self.row_supply = self.original_supply.copy()
+        self.column_demand = self.original_demand.copy()
+        self.fixed = []
+        if self.original_supply.sum() == self.original_demand.sum():
+            self.fix_forced_shipments()
+        self.row_groups = self.get_row_groups()
+        self.column_groups = self.get_column_groups()
+
+        rows = np.array([group[0] for group in self.row_groups], dtype=np.intp)
+        columns = np.array([group[0] for group in self.column_groups], dtype=np.intp)
+        self.supply = [self.row_supply[group].sum().item() for group in self.row_groups]
+        self.demand = [self.column_demand[group].sum().item() for group in self.column_groups]
+        self.penalties = None if penalties is None else self.original_penalties[columns].tolist()
+        if isinstance(costs, SparseCosts):
+            row_map = np.full(self.shape[0], -1)
+            column_map = np.full(self.shape[1], -1)
+            row_map[rows] = np.arange(rows.size)
+            column_map[columns] = np.arange(columns.size)
+            kept = (row_map[costs.arc_rows] >= 0) & (column_map[costs.indices] >= 0)
+            self.costs = SparseCosts.from_coo((rows.size, columns.size), row_map[costs.arc_rows[kept]],
+                                              column_map[costs.indices[kept]], costs.data[kept])
+        else:
+            self.costs = self.original_costs[np.ix_(rows, columns)]
+
+    def get_live_arcs(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the routes between rows with supply left and columns with demand left.
+
+        Returns:
+        tuple[np.ndarray, np.ndarray]: Row and column of every such route.
+        """
+        rows = np.flatnonzero(self.row_supply > 0)
+        columns = np.flatnonzero(self.column_demand > 0)
+        if not isinstance(self.original_costs, SparseCosts):
+            return np.repeat(rows, columns.size), np.tile(columns, rows.size)
+        costs = self.original_costs
+        live = (self.row_supply[costs.arc_rows] > 0) & (self.column_demand[costs.indices] > 0)
+        return costs.arc_rows[live], costs.indices[live]
+
+    def fix_forced_shipments(self) -> None:
+        """
+        Fixes the shipments of rows and columns with a single route left, until none is left.
+
+        Raises:
+        Exception: When a forced shipment exceeds the demand or supply at the other end.
+        """
+        m, n = self.shape
+        while True:
+            if isinstance(self.original_costs, SparseCosts):
+                arc_rows, arc_columns = self.get_live_arcs()
+            elif min(np.count_nonzero(self.row_supply > 0), np.count_nonzero(self.column_demand > 0)) == 1:
+                arc_rows, arc_columns = self.get_live_arcs()
+            else:
+                return
+            row_counts = np.bincount(arc_rows, minlength=m)
+            column_counts = np.bincount(arc_columns, minlength=n)
+            changed = False
+            # Counts only drop as shipments are fixed, so a route counted as
+            # the only one of its row or column stays the only one.
+            forced_rows = row_counts[arc_rows] == 1
+            for i, j in zip(arc_rows[forced_rows].tolist(), arc_columns[forced_rows].tolist()):
+                if self.row_supply[i] > 0 and self.column_demand[j] > 0:
+                    self.fix(i, j, self.row_supply[i])
+                    changed = True
+            forced_columns = column_counts[arc_columns] == 1
+            for i, j in zip(arc_rows[forced_columns].tolist(), arc_columns[forced_columns].tolist()):
+                if self.row_supply[i] > 0 and self.column_demand[j] > 0:
+                    self.fix(i, j, self.column_demand[j])
+                    changed = True
+            if not changed:
+                return
+
+    def fix(self, i: int, j: int, v: int) -> None:
+        """
+        Records a forced shipment.
+
+        Args:
+        i (int): Row of the route.
+        j (int): Column of the route.
+        v (int): Amount shipped.
+
+        Raises:
+        Exception: When the amount exceeds the supply or demand left at either end.
+        """
+        if v > self.row_supply[i] or v > self.column_demand[j]:
+            raise Exception(
+                f'Problem is infeasible: route ({i}, {j}) is the only one left for {v} units, '
+                f'but row {i} has {self.row_supply[i]} and column {j} needs {self.column_demand[j]}')
+        self.fixed.append((i, j, v.item()))
+        self.row_supply[i] -= v
+        self.column_demand[j] -= v
+
+    def get_row_groups(self) -> list[np.ndarray]:
+        """
+        Groups the rows with supply left by their costs to the columns with demand left.
+
+        Returns:
+        list[np.ndarray]: Original rows of every group, groups in the order of their first row.
+        """
+        rows = np.flatnonzero(self.row_supply > 0)
+        columns = np.flatnonzero(self.column_demand > 0)
+        if not isinstance(self.original_costs, SparseCosts):
+            return self.get_groups(self.original_costs[np.ix_(rows, columns)], rows)
+        costs = self.original_costs
+        groups = {}
+        for i in rows.tolist():
+            start, stop = costs.indptr[i], costs.indptr[i + 1]
+            live = self.column_demand[costs.indices[start:stop]] > 0
+            key = costs.indices[start:stop][live].tobytes() + costs.data[start:stop][live].tobytes()
+            groups.setdefault(key, []).append(i)
+        return [np.array(group, dtype=np.intp) for group in groups.values()]
+
+    def get_column_groups(self) -> list[np.ndarray]:
+        """
+        Groups the columns with demand left by their costs from the row groups, and their penalties.
+
+        Returns:
+        list[np.ndarray]: Original columns of every group, groups in the order of their first column.
+        """
+        rows = np.array([group[0] for group in self.row_groups], dtype=np.intp)
+        columns = np.flatnonzero(self.column_demand > 0)
+        if not isinstance(self.original_costs, SparseCosts):
+            profiles = self.original_costs[np.ix_(rows, columns)].T
+            if self.original_penalties is not None:
+                profiles = np.column_stack([profiles, self.original_penalties[columns]])
+            return self.get_groups(profiles, columns)
+        costs = self.original_costs
+        row_map = np.full(self.shape[0], -1)
+        row_map[rows] = np.arange(rows.size)
+        kept = (row_map[costs.arc_rows] >= 0) & (self.column_demand[costs.indices] > 0)
+        arc_rows = row_map[costs.arc_rows[kept]]
+        arc_columns = costs.indices[kept]
+        arc_costs = costs.data[kept]
+        order = np.lexsort((arc_rows, arc_columns))
+        bounds = np.searchsorted(arc_columns[order], np.arange(self.shape[1] + 1))
+        groups = {}
+        for j in columns.tolist():
+            arcs = order[bounds[j]:bounds[j + 1]]
+            key = arc_rows[arcs].tobytes() + arc_costs[arcs].tobytes()
+            if self.original_penalties is not None:
+                key += self.original_penalties[j:j + 1].tobytes()
+            groups.setdefault(key, []).append(j)
+        return [np.array(group, dtype=np.intp) for group in groups.values()]
+
+    @staticmethod
+    def get_groups(profiles: np.ndarray, indices: np.ndarray) -> list[np.ndarray]:
+        """
+        Groups indices whose profiles are equal.
+
+        Args:
+        profiles (np.ndarray): One row of values per index.
+        indices (np.ndarray): Index of every profile.
+
+        Returns:
+        list[np.ndarray]: Indices of every group, groups in the order of their first index.
+        """
+        if not indices.size:
+            return []
+        _, first, inverse = np.unique(profiles, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(indices[order], np.flatnonzero(np.diff(inverse[order])) + 1)
+        return [groups[k] for k in np.argsort(first, kind='stable')]
+
+    def postsolve(self, result: SolverResult | None) -> SolverResult:
+        """
+        Maps the result of the reduced problem back to the original problem.
+
+        The flows of a merged column are split over its columns in order,
+        then the flows of a merged row over its rows, and the forced
+        shipments are added. The basis, potentials and balanced problem of
+        the result stay those of the reduced problem.
+
+        Args:
+        result (SolverResult | None): Result of the reduced problem, None when presolve left nothing to solve.
+
+        Returns:
+        SolverResult: The result with the solution, costs and dummy flows of the original problem.
+        """
+        m, n = self.shape
+        rows, columns = len(self.row_groups), len(self.column_groups)
+        cells = [] if result is None else [(i, j, v) for (i, j), v in result.basis if v]
+        by_column = {}
+        for i, j, v in cells:
+            by_column.setdefault(j, []).append((i, v))
+        pieces = []
+        for j, flows in by_column.items():
+            if j == columns:
+                pieces.extend((i, n, v) for i, v in flows)
+            else:
+                group = self.column_groups[j]
+                pieces.extend(split_flows(flows, list(zip(group.tolist(), self.column_demand[group].tolist()))))
+        by_row = {}
+        for i, j, v in pieces:
+            by_row.setdefault(i, []).append((j, v))
+        shipments = []
+        for i, flows in by_row.items():
+            if i == rows:
+                shipments.extend((m, j, v) for j, v in flows)
+            else:
+                group = self.row_groups[i]
+                shipments.extend((k, j, v) for j, k, v in
+                                 split_flows(flows, list(zip(group.tolist(), self.row_supply[group].tolist()))))
+        shipments.extend(self.fixed)
+
+        unmet_demand = np.zeros(n) if self.original_supply.sum() < self.original_demand.sum() else None
+        unused_supply = np.zeros(m) if self.original_supply.sum() > self.original_demand.sum() else None
+        if result is None:
+            if unmet_demand is not None:
+                unmet_demand += self.column_demand
+            if unused_supply is not None:
+                unused_supply += self.row_supply
+        real = []
+        total_cost = penalty_cost = 0
+        for i, j, v in shipments:
+            if i == m:
+                unmet_demand[j] += v
+                penalty_cost += self.original_penalties[j].item() * v
+            elif j == n:
+                unused_supply[i] += v
+            else:
+                real.append((i, j, v))
+                cost = self.original_costs.get(i, j) if isinstance(self.original_costs, SparseCosts) else \
+                    self.original_costs[i, j]
+                total_cost += cost.item() * v
+        if result is None and unmet_demand is not None:
+            penalty_cost = sum(p * d for p, d in zip(self.original_penalties.tolist(), self.column_demand.tolist()))
+
+        if isinstance(self.original_costs, SparseCosts):
+            flows = np.zeros(self.original_costs.nnz)
+            for i, j, v in real:
+                flows[self.original_costs.find(i, j)] += v
+            solution = SparseCosts(self.original_costs.shape, self.original_costs.indptr,
+                                   self.original_costs.indices, flows)
+        elif isinstance(self.original_costs, np.memmap):
+            solution = SparseCosts.from_coo((m, n), [i for i, _, _ in real], [j for _, j, _ in real],
+                                            np.array([v for _, _, v in real], dtype=np.float64))
+        else:
+            solution = np.zeros((m, n))
+            for i, j, v in real:
+                solution[i][j] += v
+
+        if result is None:
+            return SolverResult(SolverResult.OPTIMAL, solution, Basis(), total_cost, 0,
+                                penalty_cost=penalty_cost, unmet_demand=unmet_demand, unused_supply=unused_supply)
+        return SolverResult(result.status, solution, result.basis, total_cost, result.iterations,
+                            result.supply, result.demand, result.costs, result.vs, result.ws,
+                            penalty_cost, unmet_demand, unused_supply)
@@ -0,0 +1,246 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Iterator
+from .logics import Logics
+
+
+class PricingRule(ABC):
+    """
+    Base class for the rules that choose the entering cell of a pivot.
+
+    A rule prices cells through the engine and returns a non-basic cell with
+    a positive reduced cost (v + w - cost), or None when no such cell exists
+    and the basis is optimal. Cells are addressed by the engine's flat index,
+    so the same rule runs on dense costs and on sparse routes. Rules may keep
+    state between pivots, so every engine needs its own instance. Rules that
+    scan every cell do so in blocks of about BLOCK_CELLS cells, so a scan
+    never holds more than one block of reduced costs.
+
+    Attributes:
+    BLOCK_CELLS (int): Cells priced at once by a full scan.
+    PARAMETERS (tuple[str, ...]): Constructor arguments that change the pivots, see get_key.
+    """
+
+    LOGIC_HANDLER: Logics = Logics()
+    BLOCK_CELLS: int = 1 << 20
+    PARAMETERS: tuple[str, ...] = ()
+
+    def get_key(self) -> str:
+        """
+        Describes the rule by its class and parameters, leaving out the state kept between pivots.
+
+        Returns:
+        str: Equal for rules that choose the same pivots, for example 'BlockPricing(block_size=10)'.
+        """
+        parameters = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.PARAMETERS)
+        return f'{type(self).__name__}({parameters})'
+
+    @abstractmethod
+    def select_entering(self, engine) -> tuple[int, int] | None:
+        """
+        Chooses the entering variable position.
+
+        Args:
+        engine (NetworkSimplex): The engine being solved.
+
+        Returns:
+        tuple[int, int] | None: Entering variable position, or None when the basis is optimal.
+        """
+
+    def price_rows(self, engine, start: int, stop: int) -> np.ndarray:
+        """
+        Calculates the reduced costs of a block of rows.
+
+        Args:
+        engine (NetworkSimplex): The engine being solved.
+        start (int): First row of the block.
+        stop (int): Row after the last row of the block.
+
+        Returns:
+        np.ndarray: Flat reduced costs of the block, zero at basic cells.
+        """
+        return engine.price_rows(start, stop)
+
+    def get_blocks(self, engine) -> Iterator[tuple[int, int]]:
+        """
+        Splits the rows into blocks of about BLOCK_CELLS cells for a full scan.
+
+        Args:
+        engine (NetworkSimplex): The engine being solved.
+
+        Returns:
+        Iterator[tuple[int, int]]: First row and row after the last row of every block.
+        """
+        cells = max(1, engine.row_start(engine.rows))
+        block_rows = max(1, self.BLOCK_CELLS * engine.rows // cells)
+        for start in range(0, engine.rows, block_rows):
+            yield start, min(start + block_rows, engine.rows)
+
+
+class DantzigPricing(PricingRule):
+    """
+    Prices every cell and picks the largest violation.
+    """
+
+    def select_entering(self, engine) -> tuple[int, int] | None:
+        best_index, best = None, 0
+        for start, stop in self.get_blocks(engine):
+            cs = self.price_rows(engine, start, stop)
+            if not cs.size:
+                continue
+            k = np.argmax(cs)
+            if cs[k] > best:
+                best_index, best = engine.row_start(start) + int(k), cs[k]
+        return None if best_index is None else engine.get_position(best_index)
+
+
+class BlockPricing(PricingRule):
+    """
+    Prices a rotating window of rows and picks the largest violation in the
+    first window that has one.
+
+    Attributes:
+    block_size (int | None): Rows per window, about the square root of the row count when None.
+    next_block (int): Window where the next scan starts.
+    """
+
+    PARAMETERS: tuple[str, ...] = ('block_size',)
+
+    def __init__(self, block_size: int = None) -> None:
+        self.block_size = block_size
+        self.next_block = 0
+
+    def get_block_size(self, engine) -> int:
+        """
+        Returns the number of rows in a window.
+
+        Args:
+        engine (NetworkSimplex): The engine being solved.
+
+        Returns:
+        int: Rows per window.
+        """
+        if self.block_size is not None:
+            return max(1, min(self.block_size, engine.rows))
+        return max(1, int(np.sqrt(engine.rows)))
+
+    def select_entering(self, engine) -> tuple[int, int] | None:
+        block_size = self.get_block_size(engine)
+        blocks = -(-engine.rows // block_size)
+        for offset in range(blocks):
+            block = (self.next_block + offset) % blocks
+            start = block * block_size
+            cs = self.price_rows(engine, start, min(start + block_size, engine.rows))
+            if self.LOGIC_HANDLER.can_be_improved(cs):
+                self.next_block = (block + 1) % blocks
+                return engine.get_position(engine.row_start(start) + self.pick(cs))
+        return None
+
+    def pick(self, cs: np.ndarray) -> int:
+        """
+        Picks the entering cell inside a window that has a violation.
+
+        Args:
+        cs (np.ndarray): Flat reduced costs of the window.
+
+        Returns:
+        int: Index of the entering cell inside the window.
+        """
+        return int(np.argmax(cs))
+
+
+class FirstImprovingPricing(BlockPricing):
+    """
+    Scans rotating windows of rows and picks the first violating cell in row-major order.
+    """
+
+    def pick(self, cs: np.ndarray) -> int:
+        return int(np.argmax(cs > 0))
+
+
+class BlandPricing(PricingRule):
+    """
+    Picks the violating cell with the lowest row-major index.
+
+    Used together with the lowest-index leaving rule as the anti-cycling
+    fallback of NetworkSimplex.solve.
+    """
+
+    def select_entering(self, engine) -> tuple[int, int] | None:
+        for start, stop in self.get_blocks(engine):
+            cs = self.price_rows(engine, start, stop)
+            if self.LOGIC_HANDLER.can_be_improved(cs):
+                return engine.get_position(engine.row_start(start) + int(np.argmax(cs > 0)))
+        return None
+
+
+class CandidateListPricing(PricingRule):
+    """
+    Keeps the best cells of the last full scan and re-prices only those.
+
+    A full scan refills the list with the size most violating cells. Between
+    full scans only the listed cells are priced; cells that stopped violating
+    are dropped, and the list is refilled once it runs empty.
+
+    Attributes:
+    size (int): Number of cells kept from a full scan.
+    candidates (np.ndarray): Flat indices of the listed cells.
+    """
+
+    PARAMETERS: tuple[str, ...] = ('size',)
+
+    def __init__(self, size: int = 50) -> None:
+        self.size = size
+        self.candidates = np.empty(0, dtype=np.intp)
+
+    def select_entering(self, engine) -> tuple[int, int] | None:
+        if self.candidates.size:
+            cs = engine.price_cells(self.candidates)
+            violating = cs > 0
+            self.candidates = self.candidates[violating]
+            if self.candidates.size:
+                return engine.get_position(self.candidates[np.argmax(cs[violating])])
+
+        candidates = np.empty(0, dtype=np.intp)
+        candidate_cs = np.empty(0)
+        for start, stop in self.get_blocks(engine):
+            cs = self.price_rows(engine, start, stop)
+            violating = np.flatnonzero(cs > 0)
+            candidates = np.concatenate([candidates, engine.row_start(start) + violating])
+            candidate_cs = np.concatenate([candidate_cs, cs[violating]])
+            if candidates.size > self.size:
+                kept = np.argpartition(candidate_cs, -self.size)[-self.size:]
+                candidates, candidate_cs = candidates[kept], candidate_cs[kept]
+        if not candidates.size:
+            return None
+        self.candidates = candidates
+        return engine.get_position(candidates[np.argmax(candidate_cs)])
+
+
+PRICING_RULES: dict[str, type[PricingRule]] = {
+    'dantzig': DantzigPricing,
+    'first_improving': FirstImprovingPricing,
+    'block': BlockPricing,
+    'candidate_list': CandidateListPricing,
+    'bland': BlandPricing,
+}
+
+
+def get_pricing_rule(pricing: str | PricingRule) -> PricingRule:
+    """
+    Returns a fresh pricing rule for a name, or the rule itself.
+
+    Args:
+    pricing (str | PricingRule): 'dantzig', 'first_improving', 'block', 'candidate_list', 'bland' or a rule instance.
+
+    Raises:
+    Exception: When the pricing rule name is unknown.
+
+    Returns:
+    PricingRule: The pricing rule.
+    """
+    if isinstance(pricing, PricingRule):
+        return pricing
+    if pricing not in PRICING_RULES:
+        raise Exception(f'Unknown pricing rule: {pricing}')
+    return PRICING_RULES[pricing]()
@@ -0,0 +1,54 @@
+import numpy as np
+from .logics import Basis, SparseCosts
+
+
+class SolverResult:
+    """
+    A class to represent the outcome of a transportation problem solve.
+
+    The solution is always the best basis found so far. It is optimal only
+    when the status is OPTIMAL; a solve stopped by a limit still returns a
+    feasible solution. Flows on the dummy row or column added to balance the
+    problem are not part of the solution or total_cost; they are reported as
+    unmet_demand and unused_supply, and the penalties paid as penalty_cost.
+
+    Attributes:
+    OPTIMAL (str): No entering cell is left, the solution is optimal.
+    ITERATION_LIMIT (str): The solve stopped at max_iterations pivots.
+    TIME_LIMIT (str): The solve stopped at time_limit seconds.
+    status (str): One of OPTIMAL, ITERATION_LIMIT or TIME_LIMIT.
+    solution (np.ndarray | SparseCosts): The solution matrix, or the flow on every route (in data) for sparse costs.
+    basis (Basis): The final basic feasible solution of the balanced problem.
+    total_cost (int): Total cost of the shipments in the solution.
+    iterations (int): Number of pivots done.
+    supply (list[int] | None): Balanced supply values the basis was solved for.
+    demand (list[int] | None): Balanced demand values the basis was solved for.
+    costs (np.ndarray | SparseCosts | None): Balanced costs the basis was solved for.
+    vs (np.ndarray | None): Row potentials of the basis.
+    ws (np.ndarray | None): Column potentials of the basis.
+    penalty_cost (int): Penalties paid for unmet demand.
+    unmet_demand (np.ndarray | None): Demand of every column left unmet, None when supply covers demand.
+    unused_supply (np.ndarray | None): Supply of every row left unshipped, None when demand takes all supply.
+    """
+
+    OPTIMAL: str = 'optimal'
+    ITERATION_LIMIT: str = 'iteration_limit'
+    TIME_LIMIT: str = 'time_limit'
+
+    def __init__(self, status: str, solution: np.ndarray | SparseCosts, basis: Basis, total_cost: int, iterations: int, supply: list[int] = None, demand: list[int] = None, costs: np.ndarray | SparseCosts = None, vs: np.ndarray = None, ws: np.ndarray = None, penalty_cost: int = 0, unmet_demand: np.ndarray = None, unused_supply: np.ndarray = None) -> None:
+        self.status = status
+        self.solution = solution
+        self.basis = basis
+        self.total_cost = total_cost
+        self.iterations = iterations
+        self.supply = supply
+        self.demand = demand
+        self.costs = costs
+        self.vs = vs
+        self.ws = ws
+        self.penalty_cost = penalty_cost
+        self.unmet_demand = unmet_demand
+        self.unused_supply = unused_supply
+
+    def __repr__(self) -> str:
+        return f'SolverResult(status={self.status!r}, total_cost={self.total_cost!r}, iterations={self.iterations!r})'
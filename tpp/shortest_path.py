@@ -0,0 +1,451 @@
+import time
+import numpy as np
+from .logics import Logics, PaddedCosts, SparseCosts
+from .pricing import PricingRule
+from .result import SolverResult
+
+
+class SuccessiveShortestPath:
+    """
+    Successive shortest path engine for balanced transportation problems.
+
+    Every iteration runs Dijkstra from the rows with supply left over the
+    residual network: a forward arc for every cell and a backward arc for
+    every cell with flow. The reduced costs stay non-negative thanks to the
+    row and column potentials, which are raised by the distances after every
+    search. Only rows are taken off the queue: taking a row relaxes all its
+    columns at once and then the backward arcs of the columns that got
+    closer, so a search is at most one vector step per row. It stops as soon
+    as a column with demand left is nearer than any row left, and as much
+    flow as the path allows is shipped along it. Problems with more rows
+    than columns are solved transposed, so the queue is the shorter side.
+
+    The flows are turned into a basis by get_bfs: loops of positive flow are
+    cancelled and the forest left is joined into a spanning tree, preferring
+    cells with a zero reduced cost. The potentials certify the flows, so a
+    NetworkSimplex started from that basis is optimal after at most a few
+    degenerate pivots.
+
+    Attributes:
+    costs (np.ndarray | PaddedCosts | SparseCosts): Balanced cost matrix or routes, transposed when transposed is set.
+    transposed (bool): True when the rows of the engine are the columns of the problem.
+    rows (int): Number of rows of the engine.
+    columns (int): Number of columns of the engine.
+    excess (np.ndarray): Supply not shipped yet of every row.
+    deficit (np.ndarray): Demand not received yet of every column.
+    flows (dict[tuple[int, int], int]): Flow on every cell that carries some.
+    slots (dict[tuple[int, int], int]): Slot of every cell of flows in cell_rows, cell_columns and cell_costs.
+    cell_rows (np.ndarray): Row of every slot.
+    cell_columns (np.ndarray): Column of every slot.
+    cell_costs (np.ndarray): Cost of every slot.
+    row_potentials (np.ndarray): Potential of every row.
+    column_potentials (np.ndarray): Potential of every column.
+    iterations (int): Number of augmentations done so far.
+    status (str | None): SolverResult status of the last solve, None before solving.
+    """
+
+    LOGIC_HANDLER: Logics = Logics()
+
+    def __init__(self, costs: np.ndarray | list[list[int]] | PaddedCosts | SparseCosts, supply: list[int], demand: list[int]) -> None:
+        """
+        Sets up an empty flow and potentials that make every forward arc non-negative.
+
+        Args:
+        costs (np.ndarray | list[list[int]] | PaddedCosts | SparseCosts): Balanced cost matrix or routes, possibly a numpy.memmap.
+        supply (list[int]): Balanced supply values.
+        demand (list[int]): Balanced demand values.
+        """
+        costs = costs if isinstance(costs, (PaddedCosts, SparseCosts)) else np.asarray(costs)
+        self.transposed = costs.shape[0] > costs.shape[1]
+        if not self.transposed:
+            self.costs = costs
+        elif isinstance(costs, SparseCosts):
+            self.costs = SparseCosts.from_coo(costs.shape[::-1], costs.indices, costs.arc_rows, costs.data)
+        elif isinstance(costs, PaddedCosts):
+            self.costs = PaddedCosts(costs.costs.T, row=costs.column, column=costs.row)
+        else:
+            self.costs = costs.T
+        if self.transposed:
+            supply, demand = demand, supply
+        self.rows, self.columns = self.costs.shape
+        dtype = np.result_type(np.asarray(supply), np.asarray(demand))
+        self.excess = np.array(supply, dtype=dtype)
+        self.deficit = np.array(demand, dtype=dtype)
+        self.flows = {}
+        self.slots = {}
+        self.cell_rows = np.zeros(self.rows + self.columns, dtype=np.intp)
+        self.cell_columns = np.zeros(self.rows + self.columns, dtype=np.intp)
+        self.cell_costs = np.zeros(self.rows + self.columns)
+        self.row_potentials = np.zeros(self.rows)
+        self.column_potentials = np.full(self.columns, np.inf)
+        if isinstance(self.costs, SparseCosts):
+            np.minimum.at(self.column_potentials, self.costs.indices, self.costs.data)
+            self.column_potentials[np.isinf(self.column_potentials)] = 0
+        else:
+            for start, stop in self.get_blocks():
+                np.minimum(self.column_potentials, self.costs[start:stop].min(axis=0), out=self.column_potentials)
+        self.iterations = 0
+        self.status = None
+
+    def get_blocks(self) -> list[tuple[int, int]]:
+        """
+        Splits the rows into blocks of about PricingRule.BLOCK_CELLS cells.
+
+        Returns:
+        list[tuple[int, int]]: First row and the row after the last of every block.
+        """
+        block_rows = max(1, PricingRule.BLOCK_CELLS // max(1, self.columns))
+        return [(start, min(start + block_rows, self.rows)) for start in range(0, self.rows, block_rows)]
+
+    def get_arcs(self, i: int) -> tuple[np.ndarray | None, np.ndarray]:
+        """
+        Returns the forward arcs of a row.
+
+        Args:
+        i (int): A row.
+
+        Returns:
+        tuple[np.ndarray | None, np.ndarray]: Columns of the routes, None for every column of dense costs, and their costs.
+        """
+        if isinstance(self.costs, SparseCosts):
+            start, stop = self.costs.indptr[i], self.costs.indptr[i + 1]
+            return self.costs.indices[start:stop], self.costs.data[start:stop]
+        if isinstance(self.costs, PaddedCosts):
+            return None, self.costs.get_rows(i, i + 1)[0]
+        return None, self.costs[i]
+
+    def get_cost(self, position: tuple[int, int]) -> int:
+        """
+        Returns the cost of a cell.
+
+        Args:
+        position (tuple[int, int]): Position of the cell.
+
+        Returns:
+        int: Cost of the cell.
+        """
+        if isinstance(self.costs, SparseCosts):
+            return self.costs.get(*position)
+        return self.costs[position]
+
+    def find_path(self, deadline: float = None) -> list[tuple[tuple[int, int], int]] | None:
+        """
+        Finds a shortest path from a row with supply left to a column with demand left and updates the potentials.
+
+        A row taken off the queue is settled, and so is the column it was
+        reached from: neither is relaxed again. With exact costs they could
+        not get closer anyway, and with float costs rounding could otherwise
+        make them point back into their own path.
+
+        Args:
+        deadline (float, optional): time.perf_counter() value at which the search gives up. Defaults to None.
+
+        Returns:
+        list[tuple[tuple[int, int], int]] | None: Cells of the path from the column back to the row, with +1 for forward and -1 for backward arcs. None when no column with demand left can be reached, and an empty list when the deadline passed first, in which case the potentials are left as they were.
+        """
+        row_distances = np.where(self.excess > 0, 0.0, np.inf)
+        column_distances = np.full(self.columns, np.inf)
+        open_rows = row_distances.copy()
+        open_targets = column_distances.copy()
+        row_parents = np.full(self.rows, -1)
+        column_parents = np.full(self.columns, -1)
+        settled_rows = np.zeros(self.rows, dtype=bool)
+        settled_columns = np.zeros(self.columns, dtype=bool)
+        targets = self.deficit > 0
+        cells = len(self.slots)
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return []
+            i = int(open_rows.argmin())
+            j = int(open_targets.argmin())
+            if open_targets[j] <= open_rows[i]:
+                if open_targets[j] == np.inf:
+                    return None
+                break
+            open_rows[i] = np.inf
+            settled_rows[i] = True
+            if row_parents[i] >= 0:
+                settled_columns[row_parents[i]] = True
+            arc_columns, arc_costs = self.get_arcs(i)
+            potentials = self.column_potentials if arc_columns is None else self.column_potentials[arc_columns]
+            candidates = row_distances[i] + self.row_potentials[i] + arc_costs - potentials
+            if arc_columns is None:
+                better = ((candidates < column_distances) & ~settled_columns).nonzero()[0]
+                candidates = candidates[better]
+            else:
+                better_arcs = (candidates < column_distances[arc_columns]) & ~settled_columns[arc_columns]
+                better = arc_columns[better_arcs]
+                candidates = candidates[better_arcs]
+            if not better.size:
+                continue
+            column_distances[better] = candidates
+            column_parents[better] = i
+            open_targets[better] = np.where(targets[better], candidates, np.inf)
+
+            # Backward arcs out of the columns that got closer, written largest
+            # first so the smallest candidate of a row is the one that stays.
+            improved = np.zeros(self.columns, dtype=bool)
+            improved[better] = True
+            arcs = improved[self.cell_columns[:cells]].nonzero()[0]
+            arc_rows = self.cell_rows[arcs]
+            arc_columns = self.cell_columns[arcs]
+            candidates = column_distances[arc_columns] + self.column_potentials[arc_columns] - \
+                self.cell_costs[arcs] - self.row_potentials[arc_rows]
+            order = (-candidates).argsort(kind='stable')
+            arc_rows, arc_columns, candidates = arc_rows[order], arc_columns[order], candidates[order]
+            closer = (candidates < row_distances[arc_rows]) & ~settled_rows[arc_rows]
+            arc_rows, arc_columns, candidates = arc_rows[closer], arc_columns[closer], candidates[closer]
+            row_distances[arc_rows] = candidates
+            open_rows[arc_rows] = candidates
+            row_parents[arc_rows] = arc_columns
+
+        # Capping at the target distance keeps every reduced cost non-negative.
+        target_distance = column_distances[j]
+        self.row_potentials += np.minimum(row_distances, target_distance)
+        self.column_potentials += np.minimum(column_distances, target_distance)
+        path = []
+        while True:
+            i = int(column_parents[j])
+            path.append(((i, j), 1))
+            j = int(row_parents[i])
+            if j < 0:
+                return path
+            path.append(((i, j), -1))
+
+    def set_flow(self, position: tuple[int, int], v: int) -> None:
+        """
+        Sets the flow on a cell, adding or freeing its slot.
+
+        Args:
+        position (tuple[int, int]): Position of the cell.
+        v (int): New flow.
+        """
+        if v:
+            if position not in self.slots:
+                slot = len(self.slots)
+                if slot == self.cell_rows.size:
+                    self.cell_rows = np.concatenate([self.cell_rows, np.zeros_like(self.cell_rows)])
+                    self.cell_columns = np.concatenate([self.cell_columns, np.zeros_like(self.cell_columns)])
+                    self.cell_costs = np.concatenate([self.cell_costs, np.zeros_like(self.cell_costs)])
+                self.slots[position] = slot
+                self.cell_rows[slot], self.cell_columns[slot] = position
+                self.cell_costs[slot] = self.get_cost(position)
+            self.flows[position] = v
+            return
+        del self.flows[position]
+        slot = self.slots.pop(position)
+        last = len(self.slots)
+        if slot != last:
+            moved = (int(self.cell_rows[last]), int(self.cell_columns[last]))
+            self.slots[moved] = slot
+            self.cell_rows[slot] = self.cell_rows[last]
+            self.cell_columns[slot] = self.cell_columns[last]
+            self.cell_costs[slot] = self.cell_costs[last]
+
+    def augment(self, path: list[tuple[tuple[int, int], int]]) -> None:
+        """
+        Ships as much flow as the path allows.
+
+        Args:
+        path (list[tuple[tuple[int, int], int]]): A path returned by find_path.
+        """
+        (i, _), _ = path[-1]
+        (_, j), _ = path[0]
+        theta = min(self.excess[i], self.deficit[j],
+                    *[self.flows[position] for position, sign in path if sign < 0])
+        self.excess[i] -= theta
+        self.deficit[j] -= theta
+        for position, sign in path:
+            self.set_flow(position, self.flows.get(position, 0) + sign * theta)
+
+    def solve(self, max_iterations: int = None, time_limit: float = None) -> str:
+        """
+        Augments along shortest paths until every supply is shipped or a limit is reached.
+
+        A solve stopped by a limit ships the supply left with the North-West
+        Corner method over the rows and columns still open, so get_bfs always
+        returns a feasible basis.
+
+        Args:
+        max_iterations (int, optional): Maximum number of augmentations. Defaults to None.
+        time_limit (float, optional): Maximum number of seconds spent augmenting, also checked inside every search. Defaults to None.
+
+        Raises:
+        Exception: When sparse routes cannot carry the supply to the demand.
+
+        Returns:
+        str: The SolverResult status.
+        """
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        last_iteration = None if max_iterations is None else self.iterations + max_iterations
+        self.status = SolverResult.OPTIMAL
+        while np.any(self.excess > 0):
+            if last_iteration is not None and self.iterations >= last_iteration:
+                self.status = SolverResult.ITERATION_LIMIT
+                break
+            path = self.find_path(deadline)
+            if path == []:
+                self.status = SolverResult.TIME_LIMIT
+                break
+            if path is None:
+                rows, columns = np.flatnonzero(self.excess > 0).tolist(), np.flatnonzero(self.deficit > 0).tolist()
+                if self.transposed:
+                    rows, columns = columns, rows
+                raise Exception(
+                    f'Problem is infeasible: the routes cannot ship {self.excess.sum()} units '
+                    f'from rows {rows} to columns {columns}')
+            self.augment(path)
+            self.iterations += 1
+
+        if self.status != SolverResult.OPTIMAL:
+            for position, v in self.LOGIC_HANDLER.north_west_corner(self.excess.tolist(), self.deficit.tolist()):
+                if v:
+                    self.set_flow(position, self.flows.get(position, 0) + v)
+            self.excess[:] = 0
+            self.deficit[:] = 0
+        return self.status
+
+    def get_bfs(self) -> list[tuple[tuple[int, int], int]]:
+        """
+        Returns the flows as a basic feasible solution.
+
+        Loops of cells with flow are cancelled by shipping around them in
+        the direction that does not raise the cost; at the optimum every such
+        loop costs nothing. The forest left is joined with cells whose
+        reduced cost is zero, and with any zero-flow cells when those are
+        not enough.
+
+        Returns:
+        list[tuple[tuple[int, int], int]]: rows + columns - 1 cells, as positions of the problem also when transposed.
+        """
+        nodes = self.rows + self.columns
+        adjacency = [dict() for _ in range(nodes)]
+        labels = np.arange(nodes)
+        members = [[node] for node in range(nodes)]
+
+        def merge(a: int, b: int) -> None:
+            a, b = labels[a], labels[b]
+            if len(members[a]) < len(members[b]):
+                a, b = b, a
+            labels[members[b]] = a
+            members[a].extend(members[b])
+            members[b] = []
+
+        def link(position: tuple[int, int], v: int) -> None:
+            i, j = position
+            adjacency[i][self.rows + j] = position
+            adjacency[self.rows + j][i] = position
+            bfs[position] = v
+            merge(i, self.rows + j)
+
+        bfs = {}
+        for position, v in sorted(self.flows.items()):
+            i, j = position
+            if labels[i] != labels[self.rows + j]:
+                link(position, v)
+                continue
+            path = self.get_tree_path(adjacency, i, self.rows + j)
+            # The new cell and the path alternate: the path starts and ends with a decrease.
+            loop = [(position, 1)] + [(cell, -1 if k % 2 == 0 else 1) for k, cell in enumerate(path)]
+            if sum(sign * self.get_cost(cell) for cell, sign in loop) > 0:
+                loop = [(cell, -sign) for cell, sign in loop]
+            values = dict(bfs)
+            values[position] = v
+            leaving, theta = min(((cell, values[cell]) for cell, sign in loop if sign < 0), key=lambda item: item[1])
+            for cell, sign in loop:
+                values[cell] += sign * theta
+            for cell, _ in loop[1:]:
+                bfs[cell] = values[cell]
+            if leaving == position:
+                continue
+            leaving_row, leaving_column = leaving
+            del adjacency[leaving_row][self.rows + leaving_column]
+            del adjacency[self.rows + leaving_column][leaving_row]
+            del bfs[leaving]
+            adjacency[i][self.rows + j] = position
+            adjacency[self.rows + j][i] = position
+            bfs[position] = values[position]
+
+        if len(bfs) < nodes - 1:
+            self.add_tight_cells(labels, members, link)
+        for node in [node for node in range(self.rows, nodes) if labels[node] != labels[0]] + \
+                [node for node in range(self.rows) if labels[node] != labels[0]]:
+            if labels[node] == labels[0]:
+                continue
+            if node >= self.rows:
+                link((0, node - self.rows), 0)
+            else:
+                link((node, next(j for j in range(self.columns) if labels[self.rows + j] == labels[0])), 0)
+        if self.transposed:
+            return sorted(((j, i), v) for (i, j), v in bfs.items())
+        return sorted(bfs.items())
+
+    def get_tree_path(self, adjacency: list[dict], start: int, end: int) -> list[tuple[int, int]]:
+        """
+        Finds the cells of the forest path between two nodes of the same tree.
+
+        Args:
+        adjacency (list[dict]): Neighbours of every node and the cell to them.
+        start (int): First node.
+        end (int): Last node.
+
+        Returns:
+        list[tuple[int, int]]: Cells of the path from start to end.
+        """
+        parents = {start: None}
+        queue = [start]
+        for node in queue:
+            if node == end:
+                break
+            for neighbour in adjacency[node]:
+                if neighbour not in parents:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+        path = []
+        node = end
+        while parents[node] is not None:
+            path.append(adjacency[node][parents[node]])
+            node = parents[node]
+        return path[::-1]
+
+    def add_tight_cells(self, labels: np.ndarray, members: list[list[int]], link) -> None:
+        """
+        Joins the trees of the forest with cells whose reduced cost is zero.
+
+        Rows are read in blocks, and every row links to one tight column of
+        every other tree it touches.
+
+        Args:
+        labels (np.ndarray): Tree of every node.
+        members (list[list[int]]): Nodes of every tree.
+        link: Adds a zero-flow cell to the forest.
+        """
+        trees = sum(1 for nodes in members if nodes)
+        if isinstance(self.costs, SparseCosts):
+            reduced_costs = self.costs.data + self.row_potentials[self.costs.arc_rows] - \
+                self.column_potentials[self.costs.indices]
+            tight = np.isclose(reduced_costs, 0)
+            blocks = [(self.costs.arc_rows[tight], self.costs.indices[tight])]
+        else:
+            blocks = ((start, stop) for start, stop in self.get_blocks())
+        for block in blocks:
+            if isinstance(self.costs, SparseCosts):
+                tight_rows, tight_columns = block
+            else:
+                start, stop = block
+                reduced_costs = self.costs[start:stop] + self.row_potentials[start:stop, None] - self.column_potentials
+                tight_rows, tight_columns = np.nonzero(np.isclose(reduced_costs, 0))
+                tight_rows += start
+            boundaries = np.flatnonzero(np.diff(tight_rows)) + 1
+            for row_columns in np.split(np.arange(tight_rows.size), boundaries):
+                if not row_columns.size:
+                    continue
+                i = int(tight_rows[row_columns[0]])
+                columns = tight_columns[row_columns]
+                _, first = np.unique(labels[self.rows + columns], return_index=True)
+                for k in first:
+                    if labels[self.rows + columns[k]] != labels[i]:
+                        link((i, int(columns[k])), 0)
+                        trees -= 1
+                if trees == 1:
+                    return
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from tpp.app import Application
+
+
+class TestApplication(unittest.TestCase):
+    def setUp(self):
+        self.app = Application()
+        self.supply = [7, 9, 18]
+        self.demand = [5, 8, 7, 14]
+        self.costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+
+    def test_transportation_simplex_method(self):
+        result = self.app.transportation_simplex_method(
+            self.supply, self.demand, self.costs)
+
+        self.assertEqual(result.status, 'optimal')
+        self.assertEqual(result.total_cost, 743)
+
+    def test_penalties(self):
+        result = self.app.transportation_simplex_method(
+            self.supply, [5, 8, 7, 20], self.costs, [100, 100, 100, 1])
+
+        self.assertEqual(result.total_cost, 743)
+        self.assertEqual(result.penalty_cost, 6)
+        self.assertEqual(result.unmet_demand.tolist(), [0, 0, 0, 6])
+        self.assertEqual(result.solution.shape, (3, 4))
+
+    def test_surplus_supply(self):
+        result = self.app.transportation_simplex_method(
+            [7, 9, 24], self.demand, self.costs)
+
+        self.assertEqual(result.unused_supply.sum(), 6)
+        self.assertIsNone(result.unmet_demand)
+        self.assertEqual(result.solution.sum(axis=0).tolist(), self.demand)
+
+    def test_resolve_unchanged(self):
+        result = self.app.transportation_simplex_method(
+            self.supply, self.demand, self.costs)
+
+        warm = self.app.resolve(result, self.supply, self.demand, self.costs)
+
+        self.assertEqual(warm.iterations, 0)
+        self.assertEqual(warm.total_cost, 743)
+
+    def test_resolve_changed(self):
+        rng = np.random.default_rng(4)
+        supply = rng.integers(1, 50, 30).tolist()
+        demand = supply[::-1]
+        costs = rng.integers(1, 100, (30, 30)).tolist()
+        result = self.app.transportation_simplex_method(supply, demand, costs)
+        supply[3] += 6
+        demand[8] += 6
+        costs[5][2] = 1
+
+        warm = self.app.resolve(result, supply, demand, costs)
+        cold = self.app.transportation_simplex_method(supply, demand, costs)
+
+        self.assertEqual(warm.status, 'optimal')
+        self.assertEqual(warm.total_cost, cold.total_cost)
+        self.assertLess(warm.iterations, cold.iterations / 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import itertools
+import unittest
+import numpy as np
+from tpp.app import Application
+from tpp.assignment import get_assignment_bfs, is_assignment, solve_assignment
+from tpp.logics import SparseCosts
+from tpp.network_simplex import NetworkSimplex
+
+
+class TestAssignment(unittest.TestCase):
+    def test_is_assignment(self):
+        self.assertTrue(is_assignment([1, 1], [1, 1], [[1, 2], [3, 4]]))
+        self.assertFalse(is_assignment([1, 2], [2, 1], [[1, 2], [3, 4]]))
+        self.assertFalse(is_assignment([1, 1], [1, 1], SparseCosts.from_dense([[1, 2], [3, 4]])))
+
+    def test_solve_assignment(self):
+        rng = np.random.default_rng(6)
+        for _ in range(5):
+            costs = rng.integers(0, 20, (6, 6))
+
+            columns, u, v = solve_assignment(costs)
+
+            best = min(sum(costs[i, j] for i, j in enumerate(permutation))
+                       for permutation in itertools.permutations(range(6)))
+            self.assertEqual(sorted(columns.tolist()), list(range(6)))
+            self.assertEqual(costs[np.arange(6), columns].sum(), best)
+            self.assertTrue(np.all(u[:, None] + v[None, :] <= costs))
+
+    def test_basis_needs_no_pivots(self):
+        costs = np.random.default_rng(7).integers(1, 50, (30, 30))
+
+        bfs = get_assignment_bfs(costs)
+        engine = NetworkSimplex(costs, bfs)
+        engine.solve()
+
+        self.assertEqual(len(bfs), 59)
+        self.assertEqual(engine.iterations, 0)
+
+    def test_application(self):
+        costs = [[9, 2, 7], [6, 4, 3], [5, 8, 1]]
+
+        result = Application().transportation_simplex_method([1, 1, 1], [1, 1, 1], costs)
+
+        self.assertEqual(result.status, 'optimal')
+        self.assertEqual(result.total_cost, 9)
+        self.assertEqual(result.solution.tolist(), [[0, 1, 0], [1, 0, 0], [0, 0, 1]])
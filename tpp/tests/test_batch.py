@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from tpp.app import Application
+from tpp.instrumentation import SolverStats
+from tpp.batch import get_chunks, pack_problem, solve_components, solve_many
+from tpp.logics import SparseCosts
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.problems = []
+        for _ in range(12):
+            rows, columns = rng.integers(2, 8, 2)
+            supply = rng.integers(1, 30, rows)
+            demand = rng.multinomial(supply.sum(), np.ones(columns) / columns)
+            self.problems.append((supply.tolist(), demand.tolist(), rng.integers(1, 50, (rows, columns)).tolist()))
+
+    def test_get_chunks(self):
+        packed_problems = [pack_problem(problem) for problem in [
+            ([1], [1], [[1]]), ([1], [1], [[1]]), ([1, 1], [2], [[1], [1]]), ([1], [1], [[1]])]]
+
+        self.assertEqual(get_chunks(packed_problems, 2), [[0, 1], [2], [3]])
+        self.assertEqual(get_chunks(packed_problems, 3), [[0, 1], [2, 3]])
+        self.assertEqual(get_chunks(packed_problems, 1), [[0], [1], [2], [3]])
+
+    def test_solve_many(self):
+        app = Application()
+        expected = [app.transportation_simplex_method(*problem).total_cost for problem in self.problems]
+
+        for workers, ordered in [(1, True), (2, True), (2, False)]:
+            results = list(solve_many(self.problems, workers=workers, ordered=ordered))
+            if ordered:
+                self.assertEqual([index for index, result in results], list(range(12)))
+            self.assertEqual([result.total_cost for index, result in sorted(results, key=lambda item: item[0])], expected)
+
+    def test_solve_components(self):
+        rng = np.random.default_rng(1)
+        costs = np.full((9, 8), -1)
+        for rows, columns in [(slice(0, 3), slice(0, 4)), (slice(3, 8), slice(4, 8))]:
+            costs[rows, columns] = rng.integers(1, 50, (costs[rows, columns].shape))
+        costs = SparseCosts.from_dense(costs, missing=-1)
+        supply = [5, 6, 7, 3, 4, 5, 6, 7, 0]
+        demand = [4, 4, 4, 6, 7, 7, 7, 7]
+        penalties = [100] * 8
+
+        result = solve_components(supply, demand, costs, penalties, workers=1)
+        # Stats keep the whole problem in one engine.
+        whole = Application().transportation_simplex_method(supply, demand, costs, penalties, stats=SolverStats())
+
+        self.assertEqual(result.status, 'optimal')
+        self.assertEqual(result.total_cost + result.penalty_cost, whole.total_cost + whole.penalty_cost)
+        self.assertEqual(result.unmet_demand.sum(), 3)
+        self.assertEqual(len(result.basis), 9 + 1 + 8 - 1)
+        np.testing.assert_array_equal(result.solution.to_dense().sum(axis=1), supply)
+        with self.assertRaises(Exception):
+            solve_components([5, 6, 7, 3, 4, 5, 6, 7, 10], demand, costs, workers=1)
+
+    def test_application_splits_components(self):
+        costs = SparseCosts.from_coo((4, 4), [0, 0, 1, 2, 3, 3], [0, 1, 1, 2, 2, 3], [4, 1, 2, 3, 5, 1])
+        app = Application()
+
+        result = app.transportation_simplex_method([5, 5, 4, 6], [4, 6, 5, 5], costs)
+        whole = app.transportation_simplex_method([5, 5, 4, 6], [4, 6, 5, 5], costs, stats=SolverStats())
+
+        self.assertEqual(result.status, 'optimal')
+        self.assertEqual(result.total_cost, whole.total_cost)
+        self.assertEqual(len(result.basis), 7)
+        self.assertEqual(result.supply, [5, 5, 4, 6])
+
+        changed = app.resolve(result, [5, 5, 5, 5], [4, 6, 5, 5], costs)
+        self.assertEqual(changed.total_cost, app.transportation_simplex_method(
+            [5, 5, 5, 5], [4, 6, 5, 5], costs, stats=SolverStats()).total_cost)
+        self.assertEqual(app.resolve(result, [5, 5, 4, 6], [4, 6, 5, 5], costs).iterations, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+import numpy as np
+from tpp.app import Application
+from tpp.cache import SolutionCache
+from tpp.logics import PaddedCosts
+from tpp.pricing import BlockPricing, DantzigPricing
+
+
+class TestSolutionCache(unittest.TestCase):
+    def test_get_key(self):
+        key = SolutionCache.get_key([1, 2], [3], [[1], [2]], pricing='dantzig')
+
+        self.assertEqual(key, SolutionCache.get_key(
+            np.array([1, 2]), np.array([3]), np.array([[1], [2]]), pricing='dantzig'))
+        self.assertNotEqual(key, SolutionCache.get_key([1, 2], [3], [[1], [2]], pricing='block'))
+        self.assertNotEqual(key, SolutionCache.get_key([1, 2], [3], [[1, 2]], pricing='dantzig'))
+
+    def test_get_key_blocks(self):
+        costs = np.arange(12).reshape(4, 3)
+        key = SolutionCache.get_key([1, 1, 1, 1], [2, 2, 0], costs)
+        with tempfile.TemporaryDirectory() as directory:
+            mapped = np.lib.format.open_memmap(os.path.join(directory, 'costs.npy'), mode='w+', dtype=np.int32, shape=costs.shape)
+            mapped[:] = costs
+            with unittest.mock.patch.object(SolutionCache, 'BLOCK_CELLS', 4):
+                self.assertEqual(key, SolutionCache.get_key([1, 1, 1, 1], [2, 2, 0], mapped))
+            del mapped
+
+        padded = PaddedCosts(costs, column=[0, 0, 0, 0])
+        padded_key = SolutionCache.get_key([1, 1, 1, 1], [2, 1, 1], padded)
+        self.assertEqual(padded_key, SolutionCache.get_key([1, 1, 1, 1], [2, 1, 1], PaddedCosts(costs.copy(), column=[0, 0, 0, 0])))
+        self.assertNotEqual(padded_key, SolutionCache.get_key([1, 1, 1, 1], [2, 1, 1], PaddedCosts(costs, column=[0, 0, 0, 1])))
+        self.assertNotEqual(padded_key, SolutionCache.get_key([1, 1, 1, 1], [2, 1, 1], PaddedCosts(costs, row=[0, 0, 0])))
+
+    def test_lru(self):
+        cache = SolutionCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get_stats()['hits'], 2)
+        self.assertEqual(cache.get_stats()['misses'], 1)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite')
+            cache = SolutionCache(maxsize=1, path=path, max_disk_entries=2)
+            for key in 'abc':
+                cache.put(key, key.upper())
+            cache.close()
+
+            cache = SolutionCache(path=path)
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 'B')
+            self.assertEqual(cache.get('b'), 'B')
+            self.assertEqual((cache.disk_hits, cache.hits), (1, 1))
+            cache.close()
+
+    def test_application(self):
+        app = Application(SolutionCache())
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+
+        result = app.transportation_simplex_method(supply, demand, costs)
+
+        self.assertIs(app.transportation_simplex_method(supply, demand, costs), result)
+        self.assertIsNot(app.transportation_simplex_method(supply, demand, costs, pricing='bland'), result)
+        self.assertEqual(app.cache.get_stats()['hits'], 1)
+
+    def test_pricing_rule_instances(self):
+        app = Application(SolutionCache())
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+
+        result = app.transportation_simplex_method(supply, demand, costs, pricing=BlockPricing(2))
+
+        self.assertIs(app.transportation_simplex_method(supply, demand, costs, pricing=BlockPricing(2)), result)
+        self.assertIsNot(app.transportation_simplex_method(supply, demand, costs, pricing=BlockPricing(3)), result)
+        self.assertIs(app.transportation_simplex_method(supply, demand, costs, pricing=DantzigPricing()),
+                      app.transportation_simplex_method(supply, demand, costs))
+
+
+if __name__ == '__main__':
+    unittest.main()
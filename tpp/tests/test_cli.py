@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from tpp.cli import main, read_csv, read_vector
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+        self.write('costs.csv', '19,30,50,10\n70,30,40,60\n\n40,8,70,20\n')
+        self.write('supply.csv', '7,9,18\n')
+        self.write('demand.csv', '5\n8\n7\n14\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write(self, name, text):
+        with open(self.path(name), 'w') as file:
+            file.write(text)
+
+    def test_read_csv(self):
+        np.testing.assert_array_equal(read_csv(self.path('costs.csv'), chunk_rows=2), self.costs)
+        np.testing.assert_array_equal(read_vector(self.path('demand.csv')), [5, 8, 7, 14])
+
+        self.write('fractions.csv', '1,2\n3.5,4\n')
+
+        self.assertEqual(read_csv(self.path('fractions.csv'), chunk_rows=1).dtype, np.float64)
+
+    def test_solve_files(self):
+        status = main(['solve', '--costs', self.path('costs.csv'), '--supply', self.path('supply.csv'),
+                       '--demand', self.path('demand.csv'), '--output', self.path('result.json')])
+
+        with open(self.path('result.json')) as file:
+            document = json.load(file)
+        self.assertEqual(status, 0)
+        self.assertEqual(document['total_cost'], 743)
+        self.assertEqual(np.sum(document['solution'], axis=0).tolist(), [5, 8, 7, 14])
+
+    def test_solve_directory(self):
+        os.mkdir(self.path('problems'))
+        with open(self.path('problems/a.json'), 'w') as file:
+            json.dump({'supply': [7, 9, 18], 'demand': [5, 8, 7, 14], 'costs': self.costs}, file)
+        np.savez(self.path('problems/b.npz'), supply=[1, 2], demand=[3], costs=[[1], [2]])
+
+        status = main(['solve', '--directory', self.path('problems'), '--format', 'npy',
+                       '--output', self.path('results'), '--workers', '1'])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(sorted(os.listdir(self.path('results'))), ['a.npy', 'b.npy'])
+        self.assertEqual((np.load(self.path('results/a.npy')) * self.costs).sum(), 743)
+
+
+if __name__ == '__main__':
+    unittest.main()
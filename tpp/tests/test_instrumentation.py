@@ -0,0 +1,50 @@
+import json
+import unittest
+import numpy as np
+from tpp.app import Application
+from tpp.instrumentation import SolverStats
+
+
+class TestSolverStats(unittest.TestCase):
+    def setUp(self):
+        self.app = Application()
+        rng = np.random.default_rng(2)
+        self.supply = rng.integers(1, 20, 12).tolist()
+        self.demand = self.supply[::-1]
+        self.costs = rng.integers(1, 50, (12, 12)).tolist()
+
+    def test_counters(self):
+        stats = SolverStats()
+        result = self.app.transportation_simplex_method(
+            self.supply, self.demand, self.costs, stats=stats)
+
+        self.assertEqual(stats.iterations, result.iterations)
+        self.assertEqual(stats.pricing_scans, result.iterations + 1)
+        self.assertGreater(stats.priced_cells, 0)
+        self.assertGreaterEqual(stats.loop_length_max, 4)
+        self.assertTrue(all(seconds >= 0 for seconds in stats.phases.values()))
+
+    def test_callback(self):
+        calls = []
+        result = self.app.transportation_simplex_method(
+            self.supply, self.demand, self.costs,
+            callback=lambda *args: calls.append(args))
+
+        self.assertEqual(len(calls), result.iterations)
+        self.assertEqual([call[0] for call in calls], list(range(1, result.iterations + 1)))
+        self.assertEqual(calls[-1][1], result.total_cost)
+        self.assertTrue(all(a[1] >= b[1] for a, b in zip(calls, calls[1:])))
+
+    def test_to_json(self):
+        stats = SolverStats()
+        self.app.transportation_simplex_method(
+            self.supply, self.demand, self.costs, pricing='bland', stats=stats)
+
+        data = json.loads(stats.to_json())
+
+        self.assertEqual(data, json.loads(json.dumps(stats.to_dict())))
+        self.assertEqual(set(data['phases']), set(SolverStats.PHASES))
+
+
+if __name__ == '__main__':
+    unittest.main()
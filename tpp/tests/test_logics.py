@@ -1,5 +1,6 @@
 import unittest
-from logics import Logics
+import numpy as np
+from logics import Basis, Logics, PaddedCosts, SparseCosts
 
 
 class TestLogics(unittest.TestCase):
@@ -7,14 +8,30 @@ class TestLogics(unittest.TestCase):
         supply = [20, 30]
         demand = [10, 20, 30]
         costs = [[1, 2, 3], [4, 5, 6]]
-        penalties = [7, 8]
+        penalties = [7, 8, 9]
 
         balanced_supply, balanced_demand, balanced_costs = Logics.get_balanced_tp(
             supply, demand, costs, penalties)
 
-        self.assertEqual(balanced_supply, [20, 30, 0])
+        self.assertEqual(balanced_supply, [20, 30, 10])
         self.assertEqual(balanced_demand, [10, 20, 30])
-        self.assertEqual(balanced_costs, [[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+        self.assertEqual(balanced_costs, [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        with self.assertRaises(Exception):
+            Logics.get_balanced_tp(supply, demand, costs, [7, 8])
+        self.assertEqual(Logics.get_balanced_tp([40, 30], demand, costs)[2], [[1, 2, 3, 0], [4, 5, 6, 0]])
+
+    def test_padded_costs_bounds(self):
+        costs = PaddedCosts(np.array([[1, 2, 3], [4, 5, 6]]), column=[0, 0])
+
+        self.assertEqual([row.tolist() for row in costs], [[1, 2, 3, 0], [4, 5, 6, 0]])
+        self.assertEqual(costs[-1, -1], 0)
+        np.testing.assert_array_equal(costs[[-1], [0]], [4])
+        with self.assertRaises(IndexError):
+            costs[[5], [7]]
+        with self.assertRaises(IndexError):
+            costs[5]
+        with self.assertRaises(IndexError):
+            costs[0, 4]
 
     def test_north_west_corner(self):
         supply = [20, 30]
@@ -37,6 +54,54 @@ class TestLogics(unittest.TestCase):
         self.assertEqual(vs, [0, 1])
         self.assertEqual(ws, [1, 0])
 
+    def test_least_cost(self):
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+
+        bfs = Logics.least_cost(supply, demand, costs)
+
+        self.assertEqual(len(bfs), 6)
+        self.assertEqual(sum(costs[i][j] * v for (i, j), v in bfs), 814)
+
+    def test_vogel_approximation(self):
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+
+        bfs = Logics.vogel_approximation(supply, demand, costs)
+
+        self.assertEqual(len(bfs), 6)
+        self.assertEqual(sum(costs[i][j] * v for (i, j), v in bfs), 779)
+
+    def test_vogel_approximation_degenerate(self):
+        supply = [10, 10, 0]
+        demand = [10, 10]
+        costs = [[1, 2], [3, 4], [5, 6]]
+
+        bfs = Logics.vogel_approximation(supply, demand, costs)
+        parent, depth = Logics.get_tree_pointers([p for p, v in bfs], 3, 2)
+
+        self.assertEqual(len(bfs), 4)
+        self.assertEqual(parent.count(-1), 1)
+
+    def test_get_basis_tree(self):
+        bfs = [((0, 0), 10), ((0, 1), 10), ((1, 1), 20)]
+
+        row_adjacency, column_adjacency = Logics.get_basis_tree(bfs, 2, 2)
+
+        self.assertEqual(row_adjacency, [[0, 1], [1]])
+        self.assertEqual(column_adjacency, [[0], [0, 1]])
+
+    def test_get_vs_and_ws_disconnected_basis(self):
+        bfs = [((0, 0), 10), ((1, 1), 20)]
+        costs = [[1, 2], [3, 4]]
+
+        vs, ws = Logics.get_vs_and_ws(bfs, costs)
+
+        self.assertEqual(vs, [0, 0])
+        self.assertEqual(ws, [1, 4])
+
     def test_get_cs(self):
         bfs = [((0, 0), 10), ((0, 1), 10), ((1, 0), 20), ((1, 1), 10)]
         costs = [[1, 2], [3, 4]]
@@ -47,6 +112,17 @@ class TestLogics(unittest.TestCase):
 
         self.assertEqual(len(cs), 0)
 
+    def test_get_reduced_costs(self):
+        bfs = [((0, 0), 10), ((0, 1), 10), ((1, 1), 20)]
+        costs = np.array([[1, 2], [3, 4]])
+        basis_mask = Logics.get_basis_mask(bfs, 2, 2)
+
+        cs = Logics.get_reduced_costs(basis_mask, costs, [0, 2], [1, 2])
+
+        self.assertEqual(cs.tolist(), [[0, 0], [0, 0]])
+        cs = Logics.get_reduced_costs(basis_mask, costs, [0, 3], [1, 2])
+        self.assertEqual(cs.tolist(), [[0, 0], [1, 0]])
+
     def test_can_be_improved(self):
         cs = [((0, 0), 1), ((1, 0), 0), ((1, 1), 1)]
 
@@ -59,6 +135,13 @@ class TestLogics(unittest.TestCase):
 
         self.assertEqual(ev_position, (0, 0))
 
+    def test_get_entering_variable_position_from_array(self):
+        cs = np.array([[0, 2, -1], [3, 0, 3]])
+
+        self.assertTrue(Logics.can_be_improved(cs))
+        self.assertEqual(Logics.get_entering_variable_position(cs), (1, 0))
+        self.assertFalse(Logics.can_be_improved(np.zeros((2, 3))))
+
     def test_get_possible_next_nodes(self):
         loop = [(0, 0), (0, 1)]
         not_visited = [(0, 2), (1, 0), (1, 1), (1, 2)]
@@ -75,6 +158,139 @@ class TestLogics(unittest.TestCase):
 
         self.assertEqual(len(loop), 4)
 
+    def test_get_tree_pointers(self):
+        bv_positions = [(0, 0), (1, 1), (2, 0), (2, 1)]
+
+        parent, depth = Logics.get_tree_pointers(bv_positions, 3, 2)
+
+        self.assertEqual(parent, [-1, 4, 3, 0, 2])
+        self.assertEqual(depth, [0, 4, 2, 1, 3])
+
+    def test_get_loop_order(self):
+        bv_positions = [(0, 0), (1, 1), (2, 0), (2, 1)]
+
+        loop = Logics().get_loop(bv_positions, (0, 1))
+
+        self.assertEqual(loop, [(0, 1), (0, 0), (2, 0), (2, 1)])
+        self.assertIsNone(Logics().get_loop([(0, 0), (1, 1)], (0, 1)))
+
+    def test_get_loop_keeps_tree_pointers(self):
+        rng = np.random.default_rng(3)
+        supply = rng.integers(1, 20, 6).tolist()
+        demand = rng.integers(1, 20, 5).tolist()
+        demand[0] += sum(supply) - sum(demand)
+        basis = Basis(Logics.north_west_corner(supply, demand))
+        logics = Logics()
+
+        for ev_position in [(5, 0), (0, 4), (3, 1), (1, 3), (4, 4), (2, 0)]:
+            if ev_position in basis:
+                continue
+            loop = logics.get_loop(basis, ev_position, (6, 5))
+            Logics.loop_pivoting(basis, loop)
+            parent, depth = basis.parent, basis.depth
+            fresh = Basis(basis)
+            fresh.build_tree(6, 5)
+
+            self.assertEqual(basis.shape, (6, 5))
+            self.assertEqual(sorted(depth), sorted(fresh.depth))
+            self.assertEqual(basis.adjacency, fresh.adjacency)
+            for node, parent_node in enumerate(parent):
+                if parent_node != -1:
+                    self.assertIn(parent_node, fresh.adjacency[node])
+                    self.assertEqual(depth[node], depth[parent_node] + 1)
+
+    def test_get_loop_shape(self):
+        bv_positions = [(0, 0), (1, 1), (2, 0), (2, 1)]
+
+        self.assertEqual(Logics().get_loop(bv_positions, (0, 1), (4, 3)), [(0, 1), (0, 0), (2, 0), (2, 1)])
+        self.assertIsNone(Logics().get_loop(Basis([((0, 0), 1), ((1, 1), 1)]), (0, 1), (2, 2)))
+
+    def test_loop_pivoting(self):
+        bfs = [((0, 0), 10), ((1, 1), 20), ((2, 0), 5), ((2, 1), 15)]
+        loop = [(0, 1), (0, 0), (2, 0), (2, 1)]
+
+        new_bfs = Logics.loop_pivoting(bfs, loop)
+
+        self.assertEqual(sorted(new_bfs), [
+            ((0, 1), 10), ((1, 1), 20), ((2, 0), 15), ((2, 1), 5)])
+
+    def test_loop_pivoting_basis(self):
+        basis = Basis([((0, 0), 10), ((1, 1), 20), ((2, 0), 5), ((2, 1), 15)])
+        loop = [(0, 1), (0, 0), (2, 0), (2, 1)]
+
+        new_basis = Logics.loop_pivoting(basis, loop)
+
+        self.assertIs(new_basis, basis)
+        self.assertNotIn((0, 0), basis)
+        self.assertEqual(sorted(basis), [
+            ((0, 1), 10), ((1, 1), 20), ((2, 0), 15), ((2, 1), 5)])
+
+    def test_basis(self):
+        basis = Basis([((0, 0), 3), ((0, 1), 2), ((1, 1), 4)])
+
+        basis.remove((0, 0))
+        basis.add((1, 0), 1)
+        basis[(0, 1)] += 5
+
+        self.assertEqual(len(basis), 3)
+        self.assertIn((1, 0), basis)
+        self.assertNotIn((0, 0), basis)
+        self.assertEqual(basis[(0, 1)], 7)
+        self.assertEqual(sorted(basis.to_list()), [((0, 1), 7), ((1, 0), 1), ((1, 1), 4)])
+
+    def test_sparse_costs(self):
+        costs = SparseCosts.from_coo((2, 3), [1, 0, 1], [2, 1, 0], [5, 7, 9])
+
+        self.assertEqual(costs.indptr.tolist(), [0, 1, 3])
+        self.assertEqual(costs.get(1, 2), 5)
+        self.assertIsNone(costs.get(0, 0))
+        self.assertEqual(costs.find(1, 1), -1)
+        self.assertEqual(costs.to_dense(-1).tolist(), [[-1, 7, -1], [9, -1, 5]])
+        with self.assertRaises(Exception):
+            SparseCosts.from_coo((2, 3), [0, 0], [1, 1], [1, 2])
+
+    def test_get_components(self):
+        costs = SparseCosts.from_coo((5, 4), [0, 1, 1, 3, 4], [2, 2, 0, 1, 1], [1, 1, 1, 1, 1])
+
+        row_components, column_components = costs.get_components()
+
+        self.assertEqual(row_components.tolist(), [0, 0, 1, 2, 2])
+        self.assertEqual(column_components.tolist(), [0, 2, 0, 3])
+
+    def test_get_balanced_tp_sparse(self):
+        costs = SparseCosts.from_dense([[1, 0], [0, 4]], missing=0)
+
+        supply, demand, balanced_costs = Logics.get_balanced_tp(
+            [5, 5], [4, 3], costs)
+
+        self.assertEqual(demand, [4, 3, 3])
+        self.assertEqual(balanced_costs.to_dense(-1).tolist(), [
+            [1, -1, 0], [-1, 4, 0]])
+
+    def test_get_balanced_tp_padded(self):
+        costs = np.array([[1, 2], [3, 4]])
+
+        supply, demand, balanced_costs = Logics.get_balanced_tp(
+            [5, 5], [4, 3], costs)
+        dense = np.array([[1, 2, 0], [3, 4, 0]])
+
+        self.assertIsInstance(balanced_costs, PaddedCosts)
+        self.assertIs(balanced_costs.costs, costs)
+        self.assertEqual(demand, [4, 3, 3])
+        self.assertEqual(balanced_costs[1, 2], 0)
+        np.testing.assert_array_equal(balanced_costs[1:], dense[1:])
+        np.testing.assert_array_equal(balanced_costs[:, [2, 0]], dense[:, [2, 0]])
+        np.testing.assert_array_equal(balanced_costs[np.ix_([1], [0, 2])], dense[np.ix_([1], [0, 2])])
+        np.testing.assert_array_equal(balanced_costs[[0, 1], [2, 1]], dense[[0, 1], [2, 1]])
+        np.testing.assert_array_equal(np.asarray(PaddedCosts(costs, row=[7, 8])), [[1, 2], [3, 4], [7, 8]])
+
+    def test_least_cost_sparse(self):
+        costs = SparseCosts.from_coo((2, 2), [0, 1], [0, 0], [1, 2])
+
+        bfs = Logics.least_cost([5, 5], [6, 4], costs)
+
+        self.assertEqual(sorted(bfs), [((0, 0), 5), ((1, 0), 1), ((1, 1), 4)])
+
     def test_get_total_cost(self):
         costs = [[1, 2], [3, 4]]
         solution = [[1, 0], [0, 1]]
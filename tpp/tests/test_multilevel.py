@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+from tpp.app import Application
+from tpp.logics import Logics, PaddedCosts, SparseCosts
+from tpp.multilevel import cluster_columns, get_multilevel_bfs
+from tpp.network_simplex import NetworkSimplex
+
+
+class TestMultilevel(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.supply = rng.integers(1, 30, 20)
+        self.demand = rng.integers(1, 30, 600)
+        self.demand[0] += max(self.supply.sum() - self.demand.sum(), 0)
+        self.supply[0] += max(self.demand.sum() - self.supply.sum(), 0)
+        sources = rng.random((20, 2))
+        destinations = rng.random((600, 2))
+        self.costs = (np.linalg.norm(sources[:, None] - destinations[None], axis=2) * 1000).astype(int)
+
+    def test_cluster_columns(self):
+        costs = np.array([[1, 50, 2, 51], [9, 70, 8, 71]])
+
+        labels = cluster_columns(costs, 2)
+
+        self.assertEqual(labels[0], labels[2])
+        self.assertEqual(labels[1], labels[3])
+        self.assertNotEqual(labels[0], labels[1])
+
+    def test_basis_is_feasible_tree(self):
+        bfs = get_multilevel_bfs(self.supply.tolist(), self.demand.tolist(), self.costs)
+        solution = np.zeros(self.costs.shape)
+        for (i, j), v in bfs:
+            solution[i, j] += v
+
+        self.assertEqual(len(bfs), 20 + 600 - 1)
+        self.assertEqual(len({position for position, _ in bfs}), len(bfs))
+        self.assertEqual(solution.sum(axis=1).tolist(), self.supply.tolist())
+        self.assertEqual(solution.sum(axis=0).tolist(), self.demand.tolist())
+        NetworkSimplex(self.costs, bfs).solve()
+
+    def test_needs_fewer_pivots_than_vogel(self):
+        multilevel = NetworkSimplex(self.costs, get_multilevel_bfs(self.supply.tolist(), self.demand.tolist(), self.costs))
+        vogel = NetworkSimplex(self.costs, Logics.vogel_approximation(self.supply.tolist(), self.demand.tolist(), self.costs))
+        multilevel.solve()
+        vogel.solve()
+
+        self.assertLess(multilevel.iterations, vogel.iterations / 2)
+
+    def test_padded_costs(self):
+        supply = self.supply.tolist()
+        supply[0] += 10
+        padded = PaddedCosts(self.costs, column=[0] * 20)
+        dense = np.hstack([self.costs, np.zeros((20, 1), dtype=int)])
+
+        self.assertEqual(get_multilevel_bfs(supply, self.demand.tolist() + [10], padded),
+                         get_multilevel_bfs(supply, self.demand.tolist() + [10], dense))
+
+    def test_application(self):
+        app = Application()
+
+        multilevel = app.transportation_simplex_method(
+            self.supply.tolist(), self.demand.tolist(), self.costs, initial_method='multilevel')
+        least_cost = app.transportation_simplex_method(
+            self.supply.tolist(), self.demand.tolist(), self.costs, initial_method='least_cost')
+
+        self.assertEqual(multilevel.status, 'optimal')
+        self.assertEqual(multilevel.total_cost, least_cost.total_cost)
+
+    def test_sparse_costs(self):
+        costs = SparseCosts.from_dense([[1, 2], [3, 4]])
+
+        with self.assertRaises(Exception):
+            get_multilevel_bfs([1, 1], [1, 1], costs)
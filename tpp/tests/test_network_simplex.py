@@ -0,0 +1,151 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from tpp.app import Application
+from tpp.logics import Logics, SparseCosts
+from tpp.network_simplex import NetworkSimplex
+from tpp.result import SolverResult
+
+
+class TestNetworkSimplex(unittest.TestCase):
+    def test_solve(self):
+        supply = [158, 184, 179]
+        demand = [174, 204, 143]
+        costs = [[4, 8, 8], [16, 24, 16], [8, 16, 24]]
+
+        bfs = NetworkSimplex(
+            costs, Logics.north_west_corner(supply, demand)).solve()
+
+        self.assertEqual(len(bfs), 5)
+        self.assertEqual(sum(costs[i][j] * v for (i, j), v in bfs), 6008)
+
+    def test_potentials_after_pivots(self):
+        rng = np.random.default_rng(0)
+        supply = rng.integers(1, 50, 8).tolist()
+        demand = [sum(supply) // 6] * 6
+        demand[-1] += sum(supply) - sum(demand)
+        costs = rng.integers(1, 30, (8, 6))
+
+        engine = NetworkSimplex(costs, Logics.north_west_corner(supply, demand))
+        bfs = engine.solve()
+
+        self.assertGreater(engine.iterations, 0)
+        for (i, j), v in bfs:
+            self.assertEqual(engine.vs[i] + engine.ws[j], costs[i, j])
+        cs = Logics.get_reduced_costs(
+            engine.basis_mask, costs, engine.vs, engine.ws)
+        self.assertFalse(Logics.can_be_improved(cs))
+
+    def test_degenerate_basis(self):
+        costs = [[1, 2], [3, 4]]
+
+        bfs = NetworkSimplex(costs, [((0, 0), 5), ((1, 1), 5)]).solve()
+
+        self.assertEqual(bfs, [((0, 0), 5), ((0, 1), 0), ((1, 1), 5)])
+
+    def test_limits(self):
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+        bfs = Logics.north_west_corner(supply, demand)
+
+        engine = NetworkSimplex(costs, bfs)
+        engine.solve(max_iterations=1)
+        self.assertEqual(engine.status, SolverResult.ITERATION_LIMIT)
+        self.assertEqual(engine.iterations, 1)
+
+        engine = NetworkSimplex(costs, bfs)
+        self.assertEqual(engine.solve(time_limit=0), sorted(bfs))
+        self.assertEqual(engine.status, SolverResult.TIME_LIMIT)
+
+        engine.solve()
+        self.assertEqual(engine.status, SolverResult.OPTIMAL)
+
+    def test_degenerate_assignment(self):
+        rng = np.random.default_rng(2)
+        costs = rng.integers(1, 50, (30, 30))
+        ones = [1] * 30
+
+        dantzig = NetworkSimplex(costs, Logics.north_west_corner(ones, ones))
+        bland = NetworkSimplex(costs, Logics.north_west_corner(ones, ones), 'bland')
+        dantzig_bfs = dantzig.solve()
+        bland_bfs = bland.solve()
+
+        self.assertEqual(dantzig.status, SolverResult.OPTIMAL)
+        self.assertEqual(bland.status, SolverResult.OPTIMAL)
+        self.assertEqual(sum(costs[p] * v for p, v in dantzig_bfs),
+                         sum(costs[p] * v for p, v in bland_bfs))
+
+    def test_sparse_routes(self):
+        rng = np.random.default_rng(3)
+        costs = rng.integers(1, 50, (10, 12))
+        routes = rng.random((10, 12)) < 0.4
+        routes[np.arange(10), np.arange(10)] = True
+        routes[9, 10:] = True
+        supply = [6] * 10
+        demand = [5] * 12
+        sparse_costs = SparseCosts.from_dense(np.where(routes, costs, -1), missing=-1)
+        dense_costs = np.where(routes, costs, 10 ** 6)
+
+        for initial_method in ['north_west_corner', 'least_cost', 'vogel_approximation']:
+            engine = NetworkSimplex(sparse_costs, Logics.get_initial_solution(
+                supply, demand, sparse_costs, initial_method), 'block')
+            bfs = engine.solve()
+            self.assertEqual(engine.basis_mask.size, routes.sum())
+            self.assertTrue(all(routes[p] for p, v in bfs if v > 0))
+            self.assertEqual(sum(costs[p] * v for p, v in bfs if v > 0), sum(
+                dense_costs[p] * v for p, v in NetworkSimplex(dense_costs, Logics.north_west_corner(supply, demand)).solve()))
+
+    def test_sparse_infeasible(self):
+        costs = SparseCosts.from_coo((2, 2), [0, 0, 1], [0, 1, 1], [1, 2, 3])
+
+        engine = NetworkSimplex(costs, Logics.least_cost([5, 5], [8, 2], costs))
+
+        with self.assertRaisesRegex(Exception, 'infeasible'):
+            engine.solve()
+
+    def test_memmap_costs(self):
+        rng = np.random.default_rng(3)
+        costs = rng.integers(1, 100, (8, 6))
+        supply = [20] * 8
+        demand = [15] * 6
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'costs.npy')
+            np.save(path, costs)
+            mapped = np.load(path, mmap_mode='r')
+
+            result = Application().transportation_simplex_method(supply, demand, mapped)
+            expected = Application().transportation_simplex_method(
+                supply, demand + [70], np.hstack([costs, np.zeros((8, 1), dtype=int)]).tolist())
+            del mapped
+
+        self.assertEqual(result.total_cost, expected.total_cost)
+        self.assertEqual(result.solution.to_dense().sum(axis=0).tolist(), demand)
+
+    def test_repair(self):
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+        engine = NetworkSimplex(costs, Logics.north_west_corner(supply, demand))
+        bfs = engine.solve()
+
+        engine.set_flows(supply, demand)
+        self.assertEqual(engine.get_bfs(), bfs)
+
+        supply = [2, 9, 23]
+        iterations = engine.iterations
+        self.assertTrue(engine.repair(supply, demand))
+        self.assertEqual(engine.iterations, iterations + 1)
+        rows = [0] * 3
+        columns = [0] * 4
+        for (i, j), v in engine.basis:
+            self.assertGreaterEqual(v, 0)
+            self.assertEqual(engine.vs[i] + engine.ws[j], costs[i][j])
+            rows[i] += v
+            columns[j] += v
+        self.assertEqual((rows, columns), (supply, demand))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from tpp.app import Application
+from tpp.logics import SparseCosts
+from tpp.presolve import Presolve, split_flows
+
+
+class TestPresolve(unittest.TestCase):
+    def test_split_flows(self):
+        self.assertEqual(split_flows([('a', 3), ('b', 4)], [(0, 5), (1, 2)]),
+                         [('a', 0, 3), ('b', 0, 2), ('b', 1, 2)])
+
+    def test_merges_identical_rows(self):
+        costs = [[1, 2, 3], [1, 2, 3], [0, 0, 0], [1, 2, 3], [4, 4, 1]]
+
+        presolved = Presolve([1, 2, 0, 3, 4], [2, 3, 5], costs)
+
+        self.assertEqual([group.tolist() for group in presolved.row_groups], [[0, 1, 3], [4]])
+        self.assertEqual(presolved.supply, [6, 4])
+        self.assertEqual(presolved.costs.tolist(), [[1, 2, 3], [4, 4, 1]])
+
+    def test_merges_identical_columns(self):
+        costs = [[3, 1, 3], [5, 2, 5]]
+
+        presolved = Presolve([4, 6], [3, 5, 4], costs, [9, 9, 9])
+
+        self.assertEqual([group.tolist() for group in presolved.column_groups], [[0, 2], [1]])
+        self.assertEqual(presolved.demand, [7, 5])
+
+        presolved = Presolve([4, 6], [3, 5, 4], costs, [9, 9, 8])
+
+        self.assertEqual([group.tolist() for group in presolved.column_groups], [[0], [1], [2]])
+
+    def test_fixes_forced_shipments(self):
+        costs = SparseCosts.from_coo((4, 3), [0, 1, 1, 2, 2, 3, 3], [0, 0, 1, 1, 2, 1, 2], [5, 4, 2, 3, 1, 3, 1])
+
+        presolved = Presolve([5, 5, 5, 5], [5, 5, 10], costs)
+        result = Application().transportation_simplex_method([5, 5, 5, 5], [5, 5, 10], costs, presolve=True)
+
+        self.assertEqual(presolved.fixed, [(0, 0, 5), (1, 1, 5), (2, 2, 5), (3, 2, 5)])
+        self.assertEqual(presolved.supply, [])
+        self.assertEqual(result.total_cost, 45)
+        self.assertEqual(result.solution.data.tolist(), [5, 0, 5, 0, 5, 0, 5])
+
+    def test_matches_solve(self):
+        rng = np.random.default_rng(8)
+        app = Application()
+        costs = rng.integers(0, 20, (4, 7))[rng.integers(0, 4, 12)]
+        costs[:, 5] = costs[:, 2]
+        supply = rng.integers(0, 10, 12).tolist()
+        demand = rng.integers(0, 15, 7).tolist()
+        penalties = rng.integers(30, 40, 7).tolist()
+
+        result = app.transportation_simplex_method(supply, demand, costs, penalties, presolve=True)
+        reference = app.transportation_simplex_method(supply, demand, costs, penalties)
+
+        self.assertEqual(result.total_cost + result.penalty_cost, reference.total_cost + reference.penalty_cost)
+        received = result.solution.sum(axis=0) + (0 if result.unmet_demand is None else result.unmet_demand)
+        shipped = result.solution.sum(axis=1) + (0 if result.unused_supply is None else result.unused_supply)
+        self.assertEqual(received.tolist(), demand)
+        self.assertEqual(shipped.tolist(), supply)
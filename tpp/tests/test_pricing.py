@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from tpp.logics import Logics
+from tpp.network_simplex import NetworkSimplex
+from tpp.pricing import BlandPricing, BlockPricing, CandidateListPricing, DantzigPricing, PricingRule, get_pricing_rule
+
+
+class TestPricing(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.supply = rng.integers(1, 50, 12).tolist()
+        self.demand = [sum(self.supply) // 9] * 9
+        self.demand[-1] += sum(self.supply) - sum(self.demand)
+        self.costs = rng.integers(1, 100, (12, 9))
+
+    def solve(self, pricing):
+        bfs = NetworkSimplex(self.costs, Logics.north_west_corner(
+            self.supply, self.demand), pricing).solve()
+        return sum(self.costs[p] * v for p, v in bfs)
+
+    def test_rules_reach_same_optimum(self):
+        optimum = self.solve('dantzig')
+
+        for pricing in ['first_improving', 'block', 'candidate_list', BlockPricing(5), CandidateListPricing(3)]:
+            self.assertEqual(self.solve(pricing), optimum)
+
+    def test_rules_price_in_blocks(self):
+        optimum = self.solve('dantzig')
+
+        for rule in [DantzigPricing(), BlandPricing(), CandidateListPricing(3)]:
+            rule.BLOCK_CELLS = 20
+            self.assertEqual(self.solve(rule), optimum)
+
+    def test_dantzig_picks_largest_violation(self):
+        engine = NetworkSimplex(self.costs, Logics.north_west_corner(
+            self.supply, self.demand))
+        cs = Logics.get_reduced_costs(
+            engine.basis_mask, self.costs, engine.vs, engine.ws)
+
+        self.assertEqual(DantzigPricing().select_entering(engine),
+                         Logics.get_entering_variable_position(cs))
+
+    def test_get_pricing_rule(self):
+        rule = BlockPricing(2)
+
+        self.assertIs(get_pricing_rule(rule), rule)
+        self.assertIsInstance(get_pricing_rule('candidate_list'), CandidateListPricing)
+        with self.assertRaises(Exception):
+            get_pricing_rule('steepest_edge')
+
+    def test_rule_must_select_entering(self):
+        class IncompletePricing(PricingRule):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompletePricing()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+from tpp.app import Application
+from tpp.logics import SparseCosts
+from tpp.network_simplex import NetworkSimplex
+from tpp.result import SolverResult
+from tpp.shortest_path import SuccessiveShortestPath
+
+
+class TestSuccessiveShortestPath(unittest.TestCase):
+    def test_matches_simplex(self):
+        rng = np.random.default_rng(5)
+        app = Application()
+        for rows, columns in [(6, 9), (9, 6), (12, 12)]:
+            supply = rng.integers(1, 40, rows).tolist()
+            demand = rng.integers(1, 40, columns).tolist()
+            costs = rng.integers(0, 20, (rows, columns))
+            penalties = rng.integers(50, 60, columns).tolist()
+
+            simplex = app.transportation_simplex_method(supply, demand, costs, penalties)
+            shortest_path = app.transportation_simplex_method(
+                supply, demand, costs, penalties, engine='successive_shortest_path')
+
+            self.assertEqual(shortest_path.status, SolverResult.OPTIMAL)
+            self.assertEqual(shortest_path.total_cost + shortest_path.penalty_cost,
+                             simplex.total_cost + simplex.penalty_cost)
+            self.assertEqual(shortest_path.solution.shape, simplex.solution.shape)
+            self.assertEqual(len(shortest_path.basis), len(simplex.basis))
+
+    def test_basis_is_optimal(self):
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+
+        engine = SuccessiveShortestPath(costs, supply, demand)
+        engine.solve()
+        bfs = engine.get_bfs()
+
+        self.assertEqual(len(bfs), 6)
+        self.assertEqual(sum(costs[i][j] * v for (i, j), v in bfs), 743)
+        simplex = NetworkSimplex(costs, bfs)
+        simplex.solve()
+        self.assertEqual(simplex.iterations, 0)
+
+    def test_float_costs(self):
+        supply = [8, 6, 11]
+        demand = [9, 6, 4, 1, 5]
+        costs = [[5.9, 8.5, 1.5, 4.1, 9.1], [0.4, 8.2, 4.2, 8.3, 0.1], [3.7, 0.8, 6.5, 2.7, 7.0]]
+        app = Application()
+
+        result = app.transportation_simplex_method(supply, demand, costs, engine='successive_shortest_path')
+
+        self.assertEqual(result.status, SolverResult.OPTIMAL)
+        self.assertAlmostEqual(result.total_cost, app.transportation_simplex_method(supply, demand, costs).total_cost)
+
+    def test_time_limit_inside_search(self):
+        rng = np.random.default_rng(4)
+        supply = rng.integers(1, 50, 300).tolist()
+        demand = rng.multinomial(sum(supply), np.ones(300) / 300).tolist()
+
+        engine = SuccessiveShortestPath(rng.random((300, 300)), supply, demand)
+
+        self.assertEqual(engine.find_path(deadline=0), [])
+        self.assertEqual(engine.solve(time_limit=0), SolverResult.TIME_LIMIT)
+        self.assertEqual(engine.iterations, 0)
+
+    def test_limit_keeps_feasible(self):
+        supply = [7, 9, 18]
+        demand = [5, 8, 7, 14]
+        costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+
+        engine = SuccessiveShortestPath(costs, supply, demand)
+        self.assertEqual(engine.solve(max_iterations=1), SolverResult.ITERATION_LIMIT)
+        solution = np.zeros((3, 4))
+        for (i, j), v in engine.get_bfs():
+            solution[i, j] = v
+
+        self.assertEqual(solution.sum(axis=1).tolist(), supply)
+        self.assertEqual(solution.sum(axis=0).tolist(), demand)
+
+    def test_sparse_routes(self):
+        costs = SparseCosts.from_coo((3, 3), [0, 0, 1, 2, 2], [0, 1, 1, 1, 2], [4, 1, 2, 3, 1])
+
+        result = Application().transportation_simplex_method(
+            [5, 5, 5], [5, 5, 5], costs, engine='successive_shortest_path')
+
+        self.assertEqual(result.total_cost, 35)
+        with self.assertRaises(Exception):
+            SuccessiveShortestPath(costs, [5, 5, 5], [10, 5, 0]).solve()